@@ -30,6 +30,7 @@ DDDDOCR - 带带弟弟OCR通用验证码识别
     result = slide.slide_match(target, background)
 """
 
+import importlib
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -40,18 +41,38 @@ __author__ = "sml2h3"
 __email__ = "sml2h3@gmail.com"
 __url__ = "https://github.com/sml2h3/ddddocr"
 
-# 导入核心功能类
-from .compat.legacy import DdddOcr
-from .preprocessing.color_filter import ColorFilter
-
-# 导入工具函数（保持向后兼容）
-from .utils.image_io import base64_to_image, get_img_base64, png_rgba_black_preprocess
+# 异常类导入开销很小，直接导入
 from .utils.exceptions import DDDDOCRError, ModelLoadError, ImageProcessError, TypeError
 
-# 导入新的模块化组件（供高级用户使用）
-from .core import OCREngine, DetectionEngine, SlideEngine
-from .preprocessing import ImageProcessor
-from .models import ModelLoader, CharsetManager
+# 其余公共接口按需导入（PEP 562）：首次访问时才导入对应模块，
+# 避免 import ddddocr 时加载onnxruntime、OpenCV等重量级依赖
+_LAZY_ATTRIBUTES = {
+    # 主要类（向后兼容）
+    'DdddOcr': '.compat.legacy',
+    'ColorFilter': '.preprocessing.color_filter',
+
+    # 工具函数（向后兼容）
+    'base64_to_image': '.utils.image_io',
+    'get_img_base64': '.utils.image_io',
+    'png_rgba_black_preprocess': '.utils.image_io',
+
+    # 新的模块化组件（供高级用户使用）
+    'OCREngine': '.core',
+    'OCRPool': '.core',
+    'DetectionEngine': '.core',
+    'DetectClassifyPipeline': '.core',
+    'SlideEngine': '.core',
+    'ImageProcessor': '.preprocessing',
+    'ModelLoader': '.models',
+    'ModelRegistry': '.models',
+    'CharsetManager': '.models',
+    'CharsetRange': '.models',
+    'SessionConfig': '.models',
+    'get_model_registry': '.models',
+    'preload': '.models',
+    'collect_stages': '.utils.instrumentation',
+    'ResultCache': '.utils.result_cache',
+}
 
 # 公共接口
 __all__ = [
@@ -72,11 +93,20 @@ __all__ = [
 
     # 新的模块化组件
     'OCREngine',
+    'OCRPool',
     'DetectionEngine',
+    'DetectClassifyPipeline',
     'SlideEngine',
     'ImageProcessor',
     'ModelLoader',
+    'ModelRegistry',
     'CharsetManager',
+    'CharsetRange',
+    'SessionConfig',
+    'get_model_registry',
+    'preload',
+    'collect_stages',
+    'ResultCache',
 
     # 版本信息
     '__version__',
@@ -85,19 +115,17 @@ __all__ = [
     '__url__'
 ]
 
-# 设置ONNX运行时日志级别
-try:
-    import onnxruntime
 
-    onnxruntime.set_default_logger_severity(3)
-except ImportError:
-    pass
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # 缓存到模块命名空间，之后的访问不再经过__getattr__
+    globals()[name] = value
+    return value
 
-# 兼容性处理：确保PIL有ANTIALIAS属性
-try:
-    from PIL import Image
 
-    if not hasattr(Image, 'ANTIALIAS'):
-        setattr(Image, 'ANTIALIAS', Image.LANCZOS)
-except ImportError:
-    pass
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
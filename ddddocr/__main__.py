@@ -30,6 +30,21 @@ def main():
                             choices=["critical", "error", "warning", "info", "debug", "trace"],
                             help="日志级别 (默认: info)")
 
+    # 模型量化命令
+    quantize_parser = subparsers.add_parser("quantize", help="生成INT8动态量化的内置模型")
+    quantize_parser.add_argument("--models", nargs="+", default=["ocr_old", "ocr_beta", "det"],
+                                 choices=["ocr_old", "ocr_beta", "det"],
+                                 help="需要量化的模型 (默认: 全部)")
+    quantize_parser.add_argument("--force", action="store_true", help="量化模型已存在时重新生成")
+    quantize_parser.add_argument("--per-channel", action="store_true", help="按通道量化权重")
+    quantize_parser.add_argument("--weight-type", default="qint8", choices=["qint8", "quint8"],
+                                 help="权重量化类型 (默认: qint8)")
+
+    # 基准测试命令
+    bench_parser = subparsers.add_parser("bench", help="运行OCR、目标检测、滑块匹配基准测试")
+    from .benchmarks.suite import add_arguments
+    add_arguments(bench_parser)
+
     # 颜色过滤器信息命令
     color_parser = subparsers.add_parser("colors", help="显示可用的颜色过滤器预设")
 
@@ -43,6 +58,10 @@ def main():
 
     if args.command == "api":
         start_api_server(args)
+    elif args.command == "quantize":
+        quantize_models(args)
+    elif args.command == "bench":
+        run_benchmarks(args)
     elif args.command == "colors":
         show_color_presets()
     elif args.command == "version":
@@ -100,6 +119,38 @@ def start_api_server(args):
         sys.exit(1)
 
 
+def quantize_models(args):
+    """生成量化模型"""
+    try:
+        from .models.quantization import build_quantized_models
+
+        print("正在生成INT8量化模型...")
+        results = build_quantized_models(args.models, force=args.force,
+                                         per_channel=args.per_channel, weight_type=args.weight_type)
+        if not results:
+            print("未找到可量化的内置模型文件")
+            sys.exit(1)
+
+        for name, path in results.items():
+            print(f"  {name:8s} -> {path}")
+        print("完成，使用 DdddOcr(quantized=True) 加载量化模型")
+        print("精度与延迟对比: python -m ddddocr.benchmarks.quantization --samples <样本目录>")
+
+    except Exception as e:
+        print(f"模型量化失败: {e}")
+        sys.exit(1)
+
+
+def run_benchmarks(args):
+    """运行基准测试"""
+    try:
+        from .benchmarks.suite import run_from_args
+        run_from_args(args)
+    except Exception as e:
+        print(f"基准测试失败: {e}")
+        sys.exit(1)
+
+
 def show_color_presets():
     """显示颜色过滤器预设"""
     try:
@@ -185,6 +236,10 @@ DDDDOCR 使用示例
 6. 查看可用颜色:
    python -m ddddocr colors
 
+7. 生成并使用INT8量化模型:
+   python -m ddddocr quantize
+   ocr = ddddocr.DdddOcr(quantized=True)
+
 API服务使用示例:
 ===============
 
@@ -51,6 +51,12 @@ class MCPHandler:
                                 "image": {"type": "string", "description": "图片数据（base64编码）"},
                                 "png_fix": {"type": "boolean", "description": "是否修复PNG透明背景问题"},
                                 "probability": {"type": "boolean", "description": "是否返回概率信息"},
+                                "probability_mode": {
+                                    "type": "string",
+                                    "enum": ["compact", "full"],
+                                    "description": "概率输出模式，compact返回top-k候选与字符置信度，full返回完整概率矩阵"
+                                },
+                                "top_k": {"type": "integer", "minimum": 1, "description": "compact模式下每个时间步返回的候选数"},
                                 "color_filter_colors": {
                                     "type": "array",
                                     "items": {"type": "string"},
@@ -73,7 +79,11 @@ class MCPHandler:
                         "inputSchema": {
                             "type": "object",
                             "properties": {
-                                "image": {"type": "string", "description": "图片数据（base64编码）"}
+                                "image": {"type": "string", "description": "图片数据（base64编码）"},
+                                "input_size": {"type": "array", "items": {"type": "integer"},
+                                               "description": "模型输入尺寸 [高, 宽]"},
+                                "nms_thr": {"type": "number", "description": "NMS阈值"},
+                                "score_thr": {"type": "number", "description": "置信度阈值"}
                             },
                             "required": ["image"]
                         }
@@ -137,17 +147,17 @@ class MCPHandler:
                     # 解码base64图片
                     image_data = base64.b64decode(ocr_request.image)
 
-                    # 设置字符集范围
-                    if ocr_request.charset_range is not None:
-                        self.service.ocr_instance.set_ranges(ocr_request.charset_range)
-
                     # 执行OCR识别
-                    result = self.service.ocr_instance.classification(
+                    result = await self.service.ocr_instance.classification_async(
                         image_data,
                         png_fix=ocr_request.png_fix,
                         probability=ocr_request.probability,
                         color_filter_colors=ocr_request.color_filter_colors,
-                        color_filter_custom_ranges=ocr_request.color_filter_custom_ranges
+                        color_filter_custom_ranges=ocr_request.color_filter_custom_ranges,
+                        probability_mode=ocr_request.probability_mode,
+                        top_k=ocr_request.top_k,
+                        # 字符集范围只对本次请求生效，不会影响并发的其他请求
+                        charset_range=ocr_request.charset_range
                     )
 
                 elif method == "ddddocr_detection":
@@ -161,7 +171,12 @@ class MCPHandler:
                     image_data = base64.b64decode(det_request.image)
 
                     # 执行目标检测
-                    result = self.service.det_instance.detection(image_data)
+                    result = await self.service.det_instance.detection_async(
+                        image_data,
+                        input_size=det_request.input_size,
+                        nms_thr=det_request.nms_thr,
+                        score_thr=det_request.score_thr
+                    )
 
                 elif method == "ddddocr_slide_match":
                     from .models import SlideMatchRequest
@@ -175,7 +190,7 @@ class MCPHandler:
                     background_data = base64.b64decode(slide_request.background_image)
 
                     # 执行滑块匹配
-                    result = self.service.slide_instance.slide_match(
+                    result = await self.service.slide_instance.slide_match_async(
                         target_data, background_data, simple_target=slide_request.simple_target
                     )
 
@@ -8,6 +8,18 @@ from typing import List, Optional, Union, Dict, Any
 from pydantic import BaseModel, Field
 
 
+class SessionConfigRequest(BaseModel):
+    """onnxruntime会话配置模型"""
+    intra_op_num_threads: Optional[int] = Field(None, description="算子内并行线程数，0表示由onnxruntime决定")
+    inter_op_num_threads: Optional[int] = Field(None, description="算子间并行线程数，0表示由onnxruntime决定")
+    execution_mode: Optional[str] = Field(None, description="执行模式: 'sequential', 'parallel'")
+    graph_optimization_level: Optional[str] = Field(None,
+                                                    description="图优化级别: 'disabled', 'basic', 'extended', 'all'")
+    enable_cpu_mem_arena: Optional[bool] = Field(None, description="是否启用CPU内存池")
+    enable_mem_pattern: Optional[bool] = Field(None, description="是否启用内存复用模式")
+    optimized_model_cache_dir: Optional[str] = Field(None, description="优化后模型的缓存目录")
+
+
 class InitializeRequest(BaseModel):
     """初始化请求模型"""
     ocr: bool = Field(True, description="是否启用OCR功能")
@@ -18,6 +30,8 @@ class InitializeRequest(BaseModel):
     device_id: int = Field(0, description="GPU设备ID")
     import_onnx_path: str = Field("", description="自定义ONNX模型路径")
     charsets_path: str = Field("", description="自定义字符集路径")
+    session_config: Optional[SessionConfigRequest] = Field(None, description="onnxruntime会话配置")
+    quantized: bool = Field(False, description="是否使用INT8量化模型")
 
 
 class SwitchModelRequest(BaseModel):
@@ -25,6 +39,8 @@ class SwitchModelRequest(BaseModel):
     model_type: str = Field(..., description="模型类型: 'ocr', 'det', 'ocr_old', 'ocr_beta'")
     use_gpu: bool = Field(False, description="是否使用GPU")
     device_id: int = Field(0, description="GPU设备ID")
+    session_config: Optional[SessionConfigRequest] = Field(None, description="onnxruntime会话配置")
+    quantized: bool = Field(False, description="是否使用INT8量化模型")
 
 
 class ToggleFeatureRequest(BaseModel):
@@ -38,6 +54,8 @@ class OCRRequest(BaseModel):
     image: str = Field(..., description="图片数据（base64编码）")
     png_fix: bool = Field(False, description="是否修复PNG透明背景问题")
     probability: bool = Field(False, description="是否返回概率信息")
+    probability_mode: str = Field("compact", description="概率输出模式: 'compact'（top-k候选与字符置信度）或 'full'（完整概率矩阵）")
+    top_k: int = Field(5, ge=1, description="compact模式下每个时间步返回的候选数")
     color_filter_colors: Optional[List[str]] = Field(None, description="颜色过滤预设颜色列表")
     color_filter_custom_ranges: Optional[List[List[List[int]]]] = Field(None, description="自定义HSV颜色范围")
     charset_range: Optional[Union[int, str]] = Field(None, description="字符集范围限制")
@@ -46,6 +64,9 @@ class OCRRequest(BaseModel):
 class DetectionRequest(BaseModel):
     """目标检测请求模型"""
     image: str = Field(..., description="图片数据（base64编码）")
+    input_size: Optional[List[int]] = Field(None, description="模型输入尺寸 [高, 宽]，为空时使用服务的设置")
+    nms_thr: Optional[float] = Field(None, gt=0, le=1, description="NMS阈值，为空时使用服务的设置")
+    score_thr: Optional[float] = Field(None, ge=0, lt=1, description="置信度阈值，为空时使用服务的设置")
 
 
 class SlideMatchRequest(BaseModel):
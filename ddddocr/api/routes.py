@@ -91,17 +91,17 @@ def create_routes(app: FastAPI, service):
             except Exception:
                 raise HTTPException(status_code=400, detail="图片base64解码失败")
 
-            # 设置字符集范围
-            if request.charset_range is not None:
-                service.ocr_instance.set_ranges(request.charset_range)
-
-            # 执行OCR识别
-            result = service.ocr_instance.classification(
+            # 在实例的线程池中执行OCR识别，不阻塞事件循环
+            result = await service.ocr_instance.classification_async(
                 image_data,
                 png_fix=request.png_fix,
                 probability=request.probability,
                 color_filter_colors=request.color_filter_colors,
-                color_filter_custom_ranges=request.color_filter_custom_ranges
+                color_filter_custom_ranges=request.color_filter_custom_ranges,
+                probability_mode=request.probability_mode,
+                top_k=request.top_k,
+                # 字符集范围只对本次请求生效，不会影响并发的其他请求
+                charset_range=request.charset_range
             )
 
             if request.probability:
@@ -133,7 +133,12 @@ def create_routes(app: FastAPI, service):
                 raise HTTPException(status_code=400, detail="图片base64解码失败")
 
             # 执行目标检测
-            bboxes = service.det_instance.detection(image_data)
+            bboxes = await service.det_instance.detection_async(
+                image_data,
+                input_size=request.input_size,
+                nms_thr=request.nms_thr,
+                score_thr=request.score_thr
+            )
 
             response_data = DetectionResponse(bboxes=bboxes)
             return APIResponse(success=True, message="目标检测成功", data=response_data.dict())
@@ -158,7 +163,7 @@ def create_routes(app: FastAPI, service):
                 raise HTTPException(status_code=400, detail="图片base64解码失败")
 
             # 执行滑块匹配
-            result = service.slide_instance.slide_match(
+            result = await service.slide_instance.slide_match_async(
                 target_data, background_data, simple_target=request.simple_target
             )
 
@@ -14,6 +14,7 @@ from fastapi.responses import JSONResponse, HTMLResponse
 from .mcp import MCPHandler
 from .models import *
 from .routes import create_routes
+from ..utils.instrumentation import collect_stages
 
 
 class DDDDOCRService:
@@ -33,6 +34,8 @@ class DDDDOCRService:
             # 动态导入ddddocr以避免循环导入
             import ddddocr
 
+            session_config = self._build_session_config(config.session_config)
+
             # 清理现有实例
             self.ocr_instance = None
             self.det_instance = None
@@ -50,7 +53,9 @@ class DDDDOCRService:
                     device_id=config.device_id,
                     show_ad=False,
                     import_onnx_path=config.import_onnx_path,
-                    charsets_path=config.charsets_path
+                    charsets_path=config.charsets_path,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("ocr")
 
@@ -60,7 +65,9 @@ class DDDDOCRService:
                     det=True,
                     use_gpu=config.use_gpu,
                     device_id=config.device_id,
-                    show_ad=False
+                    show_ad=False,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("detection")
 
@@ -81,28 +88,38 @@ class DDDDOCRService:
         try:
             import ddddocr
 
+            session_config = self._build_session_config(config.session_config)
+
             if config.model_type == "ocr":
                 self.ocr_instance = ddddocr.DdddOcr(
                     ocr=True, det=False, old=False, beta=False,
-                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False
+                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("ocr")
             elif config.model_type == "ocr_old":
                 self.ocr_instance = ddddocr.DdddOcr(
                     ocr=True, det=False, old=True, beta=False,
-                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False
+                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("ocr")
             elif config.model_type == "ocr_beta":
                 self.ocr_instance = ddddocr.DdddOcr(
                     ocr=True, det=False, old=False, beta=True,
-                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False
+                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("ocr")
             elif config.model_type == "det":
                 self.det_instance = ddddocr.DdddOcr(
                     ocr=False, det=True,
-                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False
+                    use_gpu=config.use_gpu, device_id=config.device_id, show_ad=False,
+                    session_config=session_config,
+                    quantized=config.quantized
                 )
                 self.enabled_features.add("detection")
             else:
@@ -116,6 +133,15 @@ class DDDDOCRService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"模型切换失败: {str(e)}")
 
+    @staticmethod
+    def _build_session_config(config: Optional[SessionConfigRequest]):
+        """将请求中的会话配置转换为SessionConfig"""
+        if config is None:
+            return None
+
+        from ddddocr import SessionConfig
+        return SessionConfig.from_dict(config.dict())
+
     def toggle_feature(self, config: ToggleFeatureRequest) -> Dict[str, Any]:
         """开启/关闭功能"""
         if config.enabled:
@@ -184,6 +210,16 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # 记录每个请求中各引擎阶段的耗时，通过 Server-Timing 响应头返回
+    @app.middleware("http")
+    async def add_server_timing(request: Request, call_next):
+        with collect_stages() as stages:
+            response = await call_next(request)
+        timings = [f"{key};dur={value:.3f}" for key, value in stages.totals().items()]
+        if timings:
+            response.headers["Server-Timing"] = ", ".join(timings)
+        return response
+
     # 添加路由
     create_routes(app, service)
 
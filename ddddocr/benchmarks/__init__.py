@@ -0,0 +1,234 @@
+# coding=utf-8
+"""
+性能基准测试模块
+提供各功能模块的微基准测试，可通过 python -m ddddocr.benchmarks.<模块名> 运行
+
+numpy和PIL在生成图片时才导入，python -m ddddocr 解析 bench 子命令参数时不会加载它们。
+"""
+
+import io
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def time_call(func: Callable[[], object], repeat: int = 200, warmup: int = 10) -> Dict[str, float]:
+    """
+    多次调用函数并统计耗时
+
+    Args:
+        func: 无参可调用对象
+        repeat: 计时调用次数
+        warmup: 预热调用次数
+
+    Returns:
+        包含平均耗时和最小耗时（毫秒）的字典
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'min_ms': min(timings) * 1000
+    }
+
+
+def make_captcha_images(count: int, seed: int = 0) -> List[bytes]:
+    """
+    生成宽度不一的合成验证码图片
+
+    Args:
+        count: 图片数量
+        seed: 随机种子
+
+    Returns:
+        PNG编码的图片字节列表
+    """
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.RandomState(seed)
+    images = []
+    for _ in range(count):
+        width = int(rng.randint(80, 200))
+        height = int(rng.randint(30, 60))
+        array = (rng.rand(height, width, 3) * 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(array).save(buffer, format='PNG')
+        images.append(buffer.getvalue())
+    return images
+
+
+def make_click_images(count: int, width: int = 300, height: int = 150, seed: int = 0) -> List[bytes]:
+    """
+    生成点选验证码风格的合成图片：渐变背景上随机分布若干实心色块
+
+    Args:
+        count: 图片数量
+        width: 图片宽度
+        height: 图片高度
+        seed: 随机种子
+
+    Returns:
+        PNG编码的图片字节列表
+    """
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.RandomState(seed)
+    images = []
+    for _ in range(count):
+        gradient = np.linspace(0, 1, width, dtype=np.float32)[None, :, None]
+        base = rng.randint(0, 256, size=(1, 1, 3)).astype(np.float32)
+        array = (base * (0.5 + 0.5 * gradient) + rng.rand(height, width, 3) * 30).clip(0, 255).astype(np.uint8)
+        for _ in range(int(rng.randint(3, 6))):
+            size = int(rng.randint(20, 36))
+            x = int(rng.randint(0, width - size))
+            y = int(rng.randint(0, height - size))
+            array[y:y + size, x:x + size] = rng.randint(0, 256, size=3)
+        buffer = io.BytesIO()
+        Image.fromarray(array).save(buffer, format='PNG')
+        images.append(buffer.getvalue())
+    return images
+
+
+def make_slide_pairs(count: int, width: int = 280, height: int = 160, piece: int = 50,
+                     seed: int = 0) -> List[Tuple[bytes, bytes, int]]:
+    """
+    生成滑块验证码的合成样本：平滑的随机背景与从中截取的滑块
+
+    Args:
+        count: 样本数量
+        width: 背景宽度
+        height: 背景高度
+        piece: 滑块边长
+        seed: 随机种子
+
+    Returns:
+        (滑块PNG字节, 背景PNG字节, 滑块在背景中的x坐标) 列表
+    """
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.RandomState(seed)
+    pairs = []
+    for _ in range(count):
+        small = (rng.rand(height // 8, width // 8, 3) * 255).astype(np.uint8)
+        background = np.asarray(Image.fromarray(small).resize((width, height), Image.BICUBIC))
+        x = int(rng.randint(piece, width - piece))
+        y = int(rng.randint(0, height - piece))
+        target = background[y:y + piece, x:x + piece]
+
+        encoded = []
+        for array in (target, background):
+            buffer = io.BytesIO()
+            Image.fromarray(array).save(buffer, format='PNG')
+            encoded.append(buffer.getvalue())
+        pairs.append((encoded[0], encoded[1], x))
+    return pairs
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    计算百分位数（取最近的秩）
+
+    Args:
+        values: 数值列表
+        percent: 百分位，0-100
+
+    Returns:
+        百分位数
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_sample_images(sample_dir: str) -> List[Tuple[str, bytes]]:
+    """
+    读取样本目录中的图片
+
+    文件名中第一个下划线之前的部分作为标注，如 ``a1b2_0001.png`` 的标注为 ``a1b2``；
+    没有下划线时整个文件名（不含扩展名）作为标注。
+
+    Args:
+        sample_dir: 样本目录
+
+    Returns:
+        (标注, 图片字节) 列表
+    """
+    samples = []
+    for name in sorted(os.listdir(sample_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in ('.png', '.jpg', '.jpeg', '.bmp', '.gif'):
+            continue
+        with open(os.path.join(sample_dir, name), 'rb') as f:
+            samples.append((stem.split('_', 1)[0], f.read()))
+    return samples
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    获取当前进程的峰值常驻内存
+
+    Returns:
+        峰值RSS（MB），无法获取时返回None
+    """
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    except ImportError:
+        pass
+
+    if sys.platform == 'win32':
+        return _windows_peak_rss_mb()
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux下单位为KB，macOS下单位为字节
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+def _windows_peak_rss_mb() -> Optional[float]:
+    """通过GetProcessMemoryInfo获取Windows进程的峰值工作集"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(ProcessMemoryCounters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 1024 / 1024
+    except Exception:
+        return None
+
+
+__all__ = ['time_call', 'make_captcha_images', 'make_click_images', 'make_slide_pairs', 'percentile',
+           'load_sample_images', 'peak_rss_mb']
@@ -0,0 +1,63 @@
+# coding=utf-8
+"""
+批量OCR识别基准测试
+对比逐张调用classification与classification_batch的吞吐量
+
+运行方式：
+    python -m ddddocr.benchmarks.batch
+"""
+
+import json
+import time
+from typing import Any, Dict
+
+from . import make_captcha_images
+
+
+def run(count: int = 256, batch_sizes=(8, 32), beta: bool = False) -> Dict[str, Any]:
+    """
+    运行批量识别基准测试
+
+    Args:
+        count: 图片数量
+        batch_sizes: 测试的单次推理最大图像数
+        beta: 是否使用beta版模型
+
+    Returns:
+        基准测试结果
+    """
+    from ..compat.legacy import DdddOcr
+
+    ocr = DdddOcr(show_ad=False, beta=beta)
+    images = make_captcha_images(count)
+
+    # 预热
+    ocr.classification(images[0])
+    ocr.classification_batch(images[:8])
+
+    start = time.perf_counter()
+    loop_results = [ocr.classification(image) for image in images]
+    loop_seconds = time.perf_counter() - start
+
+    results = []
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        batch_results = ocr.classification_batch(images, max_batch_size=batch_size)
+        batch_seconds = time.perf_counter() - start
+        results.append({
+            'max_batch_size': batch_size,
+            'images_per_sec': count / batch_seconds,
+            'speedup': loop_seconds / batch_seconds,
+            'agreement': sum(a == b for a, b in zip(loop_results, batch_results)) / count
+        })
+
+    return {
+        'benchmark': 'classification_batch',
+        'images': count,
+        'loop_images_per_sec': count / loop_seconds,
+        'results': results
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2, ensure_ascii=False))
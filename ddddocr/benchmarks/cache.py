@@ -0,0 +1,92 @@
+# coding=utf-8
+"""
+结果缓存基准测试
+测量各种输入类型计算缓存键的耗时，以及缓存命中与未命中时 classification 的耗时
+
+运行方式：
+    python -m ddddocr.benchmarks.cache
+"""
+
+import argparse
+import io
+import json
+from typing import Any, Dict
+
+from . import make_captcha_images, time_call
+
+
+def _palette_pair():
+    """生成索引数据相同、调色板不同的两张P模式图片"""
+    from PIL import Image
+
+    first = Image.new('P', (64, 32))
+    first.putdata([(x // 8) % 4 for x in range(64)] * 32)
+    first.putpalette([0, 0, 0, 255, 255, 255, 255, 0, 0, 0, 0, 255] + [0] * 756)
+    second = first.copy()
+    second.putpalette([255, 255, 255, 0, 0, 0, 0, 255, 0, 255, 255, 0] + [0] * 756)
+    return first, second
+
+
+def run(count: int = 50, repeat: int = 20) -> Dict[str, Any]:
+    """
+    测量缓存键计算和缓存命中的耗时
+
+    Args:
+        count: 合成图片数量
+        repeat: 每项计时次数（每次处理全部图片）
+
+    Returns:
+        基准测试结果，耗时均为每张图片的平均值（毫秒）
+    """
+    import numpy as np
+    from PIL import Image
+
+    from ..compat.legacy import DdddOcr
+    from ..utils.result_cache import image_digest
+
+    # 调色板不同的P模式图片转换后的像素不同，缓存键必须不同
+    first, second = _palette_pair()
+    assert image_digest(first)[0] != image_digest(second)[0]
+    assert image_digest(first)[0] == image_digest(first.copy())[0]
+
+    encoded = make_captcha_images(count)
+    inputs = {
+        'bytes': encoded,
+        'pil': [Image.open(io.BytesIO(data)).convert('RGB') for data in encoded],
+        'ndarray': [np.asarray(Image.open(io.BytesIO(data)).convert('RGB')) for data in encoded],
+        'pil_palette': [Image.open(io.BytesIO(data)).convert('P') for data in encoded],
+    }
+    digest_ms = {}
+    for input_type, images in inputs.items():
+        timing = time_call(lambda: [image_digest(image) for image in images], repeat, 2)
+        digest_ms[input_type] = timing['mean_ms'] / count
+
+    uncached = DdddOcr(show_ad=False)
+    cached = DdddOcr(show_ad=False, cache_size=count)
+    miss = time_call(lambda: [uncached.classification(data) for data in encoded], max(1, repeat // 4), 1)
+    hit = time_call(lambda: [cached.classification(data) for data in encoded], repeat, 1)
+    stats = cached.get_cache_stats()
+    uncached.cleanup()
+    cached.cleanup()
+
+    return {
+        'benchmark': 'result_cache',
+        'images': count,
+        'digest_ms': digest_ms,
+        'uncached_classification_ms': miss['mean_ms'] / count,
+        'cached_classification_ms': hit['mean_ms'] / count,
+        'cache_stats': stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.cache",
+                                     description="结果缓存耗时测试")
+    parser.add_argument("--count", type=int, default=50, help="合成图片数量")
+    parser.add_argument("--repeat", type=int, default=20, help="每项计时次数")
+    args = parser.parse_args()
+    print(json.dumps(run(args.count, args.repeat), indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# coding=utf-8
+"""
+CTC解码微基准测试
+对比逐元素Python循环解码与向量化解码的耗时
+
+运行方式：
+    python -m ddddocr.benchmarks.ctc
+"""
+
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+from . import time_call
+from ..core.ctc_decoder import (constrained_argmax, ctc_greedy_decode, ctc_greedy_decode_batch,
+                                to_time_major_indices)
+
+
+def _loop_decode(output: np.ndarray, charset: List[str], valid_indices: List[int]) -> List[str]:
+    """逐时间步Python循环解码（重构前的实现，作为对照）"""
+    results = []
+    for b in range(output.shape[1]):
+        predicted_indices = np.argmax(output[:, b, :], axis=1)
+        decoded_indices = []
+        prev_idx = None
+        for idx in predicted_indices:
+            idx = int(idx)
+            if idx != prev_idx and idx != 0:
+                decoded_indices.append(idx)
+            prev_idx = idx
+
+        chars = []
+        for idx in decoded_indices:
+            if valid_indices and idx not in valid_indices:
+                continue
+            if 0 <= idx < len(charset):
+                chars.append(charset[idx])
+        results.append(''.join(chars))
+    return results
+
+
+def _loop_decode_indices(predicted_indices: np.ndarray) -> List[int]:
+    """逐元素去重和去blank（不含字符映射）"""
+    decoded_indices = []
+    prev_idx = None
+    for idx in predicted_indices:
+        idx = int(idx)
+        if idx != prev_idx and idx != 0:
+            decoded_indices.append(idx)
+        prev_idx = idx
+    return decoded_indices
+
+
+def _vectorized_decode(output: np.ndarray, charset_array: np.ndarray, valid_mask: np.ndarray) -> List[str]:
+    """向量化批量解码"""
+    decoded = ctc_greedy_decode_batch(np.argmax(output, axis=2), valid_mask, len(charset_array))
+    return [''.join(charset_array[indices]) for indices in decoded]
+
+
+def run(sequence_length: int = 60, num_classes: int = 8210, batch_sizes=(1, 8, 32),
+        repeat: int = 200) -> Dict[str, Any]:
+    """
+    运行CTC解码基准测试
+
+    Args:
+        sequence_length: 序列长度（时间步数）
+        num_classes: 类别数（字符集大小）
+        batch_sizes: 测试的批大小
+        repeat: 每项计时次数
+
+    Returns:
+        基准测试结果
+    """
+    rng = np.random.RandomState(0)
+    charset = [''] + [chr(0x4e00 + i) for i in range(num_classes - 1)]
+    charset_array = np.empty(num_classes, dtype=object)
+    charset_array[:] = charset
+
+    # 模拟数字范围限制：仅允许前11个类别
+    valid_indices = list(range(11))
+    valid_mask = np.zeros(num_classes, dtype=bool)
+    valid_mask[valid_indices] = True
+
+    results = []
+    for batch_size in batch_sizes:
+        # 构造偏向少数类别的输出，使解码结果中包含重复和blank
+        output = rng.randn(sequence_length, batch_size, num_classes).astype(np.float32)
+        output[:, :, :11] += 3.0
+
+        assert _loop_decode(output, charset, valid_indices) == \
+            _vectorized_decode(output, charset_array, valid_mask)
+
+        loop = time_call(lambda: _loop_decode(output, charset, valid_indices), repeat=repeat)
+        vectorized = time_call(lambda: _vectorized_decode(output, charset_array, valid_mask), repeat=repeat)
+
+        # 不含argmax的纯解码耗时
+        indices = to_time_major_indices(output)
+        decode_only_loop = time_call(
+            lambda: [_loop_decode_indices(indices[:, b]) for b in range(batch_size)], repeat=repeat)
+        decode_only_vectorized = time_call(
+            lambda: [ctc_greedy_decode(indices[:, b]) for b in range(batch_size)], repeat=repeat)
+
+        results.append({
+            'batch_size': batch_size,
+            'loop_ms': loop['mean_ms'],
+            'vectorized_ms': vectorized['mean_ms'],
+            'speedup': loop['mean_ms'] / vectorized['mean_ms'],
+            'decode_only_loop_ms': decode_only_loop['mean_ms'],
+            'decode_only_vectorized_ms': decode_only_vectorized['mean_ms'],
+        })
+
+    return {
+        'benchmark': 'ctc_decode',
+        'sequence_length': sequence_length,
+        'num_classes': num_classes,
+        'results': results
+    }
+
+
+def run_constrained(sequence_length: int = 60, num_classes: int = 8210, allowed: int = 11,
+                    repeat: int = 200) -> Dict[str, Any]:
+    """
+    对比全量argmax后过滤与字符集范围内约束argmax
+
+    Args:
+        sequence_length: 序列长度（时间步数）
+        num_classes: 类别数（字符集大小）
+        allowed: 字符集范围内的类别数（含blank）
+        repeat: 每项计时次数
+
+    Returns:
+        基准测试结果，recovered_steps为范围外最优类别被替换为范围内最优类别的时间步数
+    """
+    rng = np.random.RandomState(0)
+    logits = rng.randn(sequence_length, 1, num_classes).astype(np.float32)
+    valid_indices = np.arange(allowed)
+    valid_mask = np.zeros(num_classes, dtype=bool)
+    valid_mask[valid_indices] = True
+
+    full = time_call(lambda: np.argmax(logits, axis=-1), repeat=repeat)
+    sliced = time_call(lambda: constrained_argmax(logits, valid_mask, valid_indices), repeat=repeat)
+    masked = time_call(lambda: constrained_argmax(logits, valid_mask, valid_indices, slice_ratio=0.0),
+                       repeat=repeat)
+
+    unconstrained = np.argmax(logits, axis=-1)
+    return {
+        'benchmark': 'constrained_argmax',
+        'allowed_classes': allowed,
+        'full_argmax_ms': full['mean_ms'],
+        'sliced_argmax_ms': sliced['mean_ms'],
+        'masked_argmax_ms': masked['mean_ms'],
+        'recovered_steps': int((~valid_mask[unconstrained]).sum())
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps([run(), run_constrained()], indent=2, ensure_ascii=False))
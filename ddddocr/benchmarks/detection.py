@@ -0,0 +1,293 @@
+# coding=utf-8
+"""
+目标检测基准测试
+input模式对比PIL图像、numpy数组输入在重构前（编码为PNG后再用OpenCV解码）与直接转换两种路径下的耗时，
+图片为典型的300×150点选验证码尺寸；
+resolution模式测量不同模型输入尺寸下的单张检测延迟，以及相对默认尺寸（416×416）检测结果的召回率；
+batch模式测量不同批大小下批量检测的吞吐量，并与逐张检测对比
+
+运行方式：
+    python -m ddddocr.benchmarks.detection
+    python -m ddddocr.benchmarks.detection --count 100 --repeat 20
+    python -m ddddocr.benchmarks.detection --mode resolution --sizes 416,320,256 --images ./samples
+    python -m ddddocr.benchmarks.detection --mode batch --batch-sizes 1,4,8,16,32
+"""
+
+import argparse
+import io
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import make_click_images, time_call
+
+
+def _legacy_load(image) -> Any:
+    """重构前的输入路径：非字节输入先保存为内存中的PNG，再用OpenCV解码"""
+    import numpy as np
+    from PIL import Image
+
+    from ..utils.image_io import load_image_from_input
+    from ..utils.lazy_import import cv2
+
+    if not isinstance(image, Image.Image):
+        image = load_image_from_input(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return cv2.imdecode(np.frombuffer(buffer.getvalue(), np.uint8), cv2.IMREAD_COLOR)
+
+
+def check_exif_parity() -> Dict[str, bool]:
+    """
+    检查带EXIF方向标记（Orientation=6）的JPEG输入与重构前加载结果是否一致
+
+    重构前bytes输入直接用OpenCV解码（按EXIF方向旋转），其他编码输入经PIL加载（不旋转）。
+
+    Returns:
+        各输入类型的加载结果是否与重构前逐像素一致
+    """
+    import base64
+    import os
+    import tempfile
+
+    import numpy as np
+    from PIL import Image
+
+    from ..core.detection_engine import DetectionEngine
+    from ..utils.lazy_import import cv2
+
+    source = Image.open(io.BytesIO(make_click_images(1)[0])).convert('RGB')
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    source.save(buffer, format='JPEG', exif=exif, quality=95)
+    data = buffer.getvalue()
+
+    engine = DetectionEngine()
+    fd, path = tempfile.mkstemp(suffix='.jpg')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        legacy = _legacy_load(path)
+        parity = {
+            'bytes': np.array_equal(engine.load_image(data),
+                                    cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)),
+            'path': np.array_equal(engine.load_image(path), legacy),
+            'base64': np.array_equal(engine.load_image(base64.b64encode(data).decode()), legacy),
+            'memoryview': np.array_equal(engine.load_image(memoryview(data)), legacy),
+        }
+    finally:
+        os.remove(path)
+        engine.cleanup()
+    return parity
+
+
+def run(count: int = 50, repeat: int = 10, width: int = 300, height: int = 150) -> Dict[str, Any]:
+    """
+    测量各输入类型的加载耗时和完整检测耗时
+
+    Args:
+        count: 合成图片数量
+        repeat: 每项计时次数（每次处理全部图片）
+        width: 图片宽度
+        height: 图片高度
+
+    Returns:
+        基准测试结果，load为输入转换为BGR数组的耗时，detect为完整检测耗时（均为处理全部图片的耗时）
+    """
+    import numpy as np
+    from PIL import Image
+
+    from ..core.detection_engine import DetectionEngine
+
+    exif_parity = check_exif_parity()
+    assert all(exif_parity.values()), exif_parity
+
+    engine = DetectionEngine()
+    encoded = make_click_images(count, width, height)
+    inputs = {
+        'pil': [Image.open(io.BytesIO(data)).convert('RGB') for data in encoded],
+        'ndarray': [np.asarray(Image.open(io.BytesIO(data)).convert('RGB')) for data in encoded],
+    }
+
+    results: List[Dict[str, Any]] = []
+    for input_type, images in inputs.items():
+        legacy_load = time_call(lambda: [_legacy_load(image) for image in images], repeat, 2)
+        direct_load = time_call(lambda: [engine.load_image(image) for image in images], repeat, 2)
+        legacy_detect = time_call(lambda: [engine.detect_array(_legacy_load(image)) for image in images], repeat, 2)
+        direct_detect = time_call(lambda: [engine.predict(image) for image in images], repeat, 2)
+        same_boxes = all(engine.detect_array(_legacy_load(image)) == engine.predict(image) for image in images)
+        results.append({
+            'input': input_type,
+            'legacy_load_ms': legacy_load['mean_ms'],
+            'direct_load_ms': direct_load['mean_ms'],
+            'load_speedup': legacy_load['mean_ms'] / direct_load['mean_ms'],
+            'legacy_detect_ms': legacy_detect['mean_ms'],
+            'direct_detect_ms': direct_detect['mean_ms'],
+            'detect_saving_ms_per_image': (legacy_detect['mean_ms'] - direct_detect['mean_ms']) / count,
+            'same_boxes': same_boxes
+        })
+
+    engine.cleanup()
+    return {'benchmark': 'detection_input', 'images': count, 'size': [width, height],
+            'exif_parity': exif_parity, 'results': results}
+
+
+def _box_iou(a: Sequence[int], b: Sequence[int]) -> float:
+    """计算两个 [x1, y1, x2, y2] 边界框的IoU"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    inter = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def box_recall(reference: List[List[List[int]]], predicted: List[List[List[int]]],
+               iou_thr: float = 0.5) -> float:
+    """
+    计算检测结果相对参考结果的召回率
+
+    Args:
+        reference: 每张图片的参考边界框列表
+        predicted: 每张图片的检测边界框列表
+        iou_thr: 判定为同一目标的IoU阈值
+
+    Returns:
+        与某个检测框IoU不低于阈值的参考框占比，没有参考框时返回1.0
+    """
+    total = matched = 0
+    for ref_boxes, pred_boxes in zip(reference, predicted):
+        total += len(ref_boxes)
+        matched += sum(1 for ref in ref_boxes
+                       if any(ref == box or _box_iou(ref, box) >= iou_thr for box in pred_boxes))
+    return matched / total if total else 1.0
+
+
+def _load_samples(images_dir: Optional[str], count: int) -> List[bytes]:
+    """读取样本目录中的图片（按文件名排序，最多count张），未指定目录时生成合成点选图片"""
+    if not images_dir:
+        return make_click_images(count)
+    samples = []
+    for name in sorted(os.listdir(images_dir)):
+        if os.path.splitext(name)[1].lower() in ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'):
+            with open(os.path.join(images_dir, name), 'rb') as fp:
+                samples.append(fp.read())
+        if len(samples) >= count:
+            break
+    return samples
+
+
+def run_resolutions(sizes: Sequence[int] = (416, 320, 256), count: int = 50, repeat: int = 5,
+                    images_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    测量各输入尺寸下的检测延迟和召回率
+
+    召回率以默认输入尺寸（416×416）的检测结果为参考，按IoU≥0.5匹配。
+    模型输入尺寸固定时，不支持的尺寸记录错误信息后跳过。
+
+    Args:
+        sizes: 要测试的正方形输入边长
+        count: 样本数量
+        repeat: 每个尺寸的计时次数（每次处理全部图片）
+        images_dir: 样本图片目录，为None时使用合成点选图片
+
+    Returns:
+        基准测试结果，latency_ms为单张图片的平均检测耗时
+    """
+    from ..core.detection_engine import DEFAULT_INPUT_SIZE, DetectionEngine
+    from ..utils.exceptions import DDDDOCRError
+
+    engine = DetectionEngine()
+    images = [engine.decode_bytes(data) for data in _load_samples(images_dir, count)]
+    reference = [engine.detect_array(img, DEFAULT_INPUT_SIZE) for img in images]
+
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        input_size = (size, size)
+        try:
+            predicted = [engine.detect_array(img, input_size) for img in images]
+        except DDDDOCRError as e:
+            results.append({'input_size': list(input_size), 'error': str(e)})
+            continue
+        timing = time_call(lambda: [engine.detect_array(img, input_size) for img in images], repeat, 1)
+        results.append({
+            'input_size': list(input_size),
+            'latency_ms': timing['mean_ms'] / len(images),
+            'boxes': sum(len(boxes) for boxes in predicted),
+            'recall': box_recall(reference, predicted)
+        })
+
+    engine.cleanup()
+    return {
+        'benchmark': 'detection_resolution',
+        'images': len(images),
+        'samples': images_dir or 'synthetic',
+        'reference_size': list(DEFAULT_INPUT_SIZE),
+        'reference_boxes': sum(len(boxes) for boxes in reference),
+        'results': results
+    }
+
+
+def run_batch(batch_sizes: Sequence[int] = (1, 4, 8, 16, 32), count: int = 64,
+              repeat: int = 5) -> Dict[str, Any]:
+    """
+    测量不同批大小下批量检测的吞吐量
+
+    Args:
+        batch_sizes: 要测试的批大小（单次推理的最大图像数）
+        count: 合成图片数量
+        repeat: 每项计时次数（每次处理全部图片）
+
+    Returns:
+        基准测试结果，images_per_second为每秒检测的图片数，single为逐张调用 detect_array 的结果
+    """
+    from ..core.detection_engine import DetectionEngine
+
+    engine = DetectionEngine()
+    images = [engine.decode_bytes(data) for data in make_click_images(count)]
+    expected = [engine.detect_array(img) for img in images]
+
+    single = time_call(lambda: [engine.detect_array(img) for img in images], repeat, 1)
+    results: List[Dict[str, Any]] = [{
+        'batch_size': 'single',
+        'images_per_second': count / single['mean_ms'] * 1000
+    }]
+    for batch_size in batch_sizes:
+        timing = time_call(lambda: engine.detect_arrays(images, max_batch_size=batch_size), repeat, 1)
+        results.append({
+            'batch_size': batch_size,
+            'images_per_second': count / timing['mean_ms'] * 1000,
+            'speedup': single['mean_ms'] / timing['mean_ms'],
+            'same_boxes': engine.detect_arrays(images, max_batch_size=batch_size) == expected
+        })
+
+    engine.cleanup()
+    return {'benchmark': 'detection_batch', 'images': count, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.detection",
+                                     description="目标检测耗时测试")
+    parser.add_argument("--mode", choices=("input", "resolution", "batch"), default="input",
+                        help="input: 输入转换路径耗时；resolution: 各输入尺寸的延迟和召回率；batch: 各批大小的吞吐量")
+    parser.add_argument("--count", type=int, default=50, help="图片数量")
+    parser.add_argument("--repeat", type=int, default=10, help="每项计时次数")
+    parser.add_argument("--sizes", default="416,320,256", help="resolution模式测试的输入边长，逗号分隔")
+    parser.add_argument("--images", default=None, help="resolution模式使用的样本图片目录，默认使用合成点选图片")
+    parser.add_argument("--batch-sizes", default="1,4,8,16,32", help="batch模式测试的批大小，逗号分隔")
+    args = parser.parse_args()
+    if args.mode == "resolution":
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        result = run_resolutions(sizes, args.count, args.repeat, args.images)
+    elif args.mode == "batch":
+        batch_sizes = [int(size) for size in args.batch_sizes.split(",") if size.strip()]
+        result = run_batch(batch_sizes, args.count, args.repeat)
+    else:
+        result = run(args.count, args.repeat)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
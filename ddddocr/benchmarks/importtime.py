@@ -0,0 +1,243 @@
+# coding=utf-8
+"""
+导入耗时基准测试
+测量 import ddddocr 的耗时与内存增长、导入后已加载的重量级依赖、仅使用滑块功能时的初始化开销，
+以及字符集模块的编译/反序列化开销
+
+每次测量都在全新的子进程中进行（使用 -X importtime 获取各模块的导入耗时）。
+源码运行时若没有字节码缓存，Python需要编译模块源码；打包后的exe（PyInstaller）
+直接从归档中反序列化字节码，对应结果中的 unmarshal_ms。
+
+运行方式：
+    python -m ddddocr.benchmarks.importtime
+    python -m ddddocr.benchmarks.importtime --baseline old_charset_manager.py
+    python -m ddddocr.benchmarks.importtime --max-import-ms 50
+
+--max-import-ms 用作回归检查：import ddddocr 的中位耗时超过阈值，或导入时加载了
+onnxruntime/OpenCV/PIL 时，以非零状态码退出。
+
+--baseline 可传入旧版本的 charset_manager.py（如 git show <rev>:ddddocr/models/charset_manager.py），
+用于对比同一模块的编译与反序列化开销。
+"""
+
+import argparse
+import json
+import marshal
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# 子进程中执行的测量代码：只依赖标准库（和可选的psutil），避免测量代码本身影响导入耗时
+_MEASURE_CODE = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            import os
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except Exception:
+        return None
+HEAVY = ('onnxruntime', 'cv2', 'PIL', 'numpy')
+rss_before = rss_mb()
+start = time.perf_counter()
+import ddddocr
+import_ms = (time.perf_counter() - start) * 1000
+rss_after = rss_mb()
+loaded_after_import = [m for m in HEAVY if m in sys.modules]
+start = time.perf_counter()
+ddddocr.DdddOcr(ocr=False, show_ad=False)
+slide_init_ms = (time.perf_counter() - start) * 1000
+loaded_after_slide_init = [m for m in HEAVY if m in sys.modules]
+from ddddocr.models.charset_manager import CharsetManager
+start = time.perf_counter()
+CharsetManager().load_default_charset()
+first_load_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+CharsetManager().load_default_charset()
+cached_load_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({
+    'import_ms': import_ms,
+    'import_rss_mb': None if rss_before is None or rss_after is None else rss_after - rss_before,
+    'loaded_after_import': loaded_after_import,
+    'slide_init_ms': slide_init_ms,
+    'loaded_after_slide_init': loaded_after_slide_init,
+    'charset_first_load_ms': first_load_ms,
+    'charset_cached_load_ms': cached_load_ms,
+}))
+"""
+
+
+def _package_parent() -> str:
+    """ddddocr包所在的目录"""
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _parse_importtime(stderr: str, modules: List[str]) -> Dict[str, int]:
+    """从 -X importtime 输出中提取指定模块的累计导入耗时（微秒）"""
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = [part.strip() for part in line[len('import time:'):].split('|')]
+        if len(parts) == 3 and parts[2] in modules:
+            try:
+                result[parts[2]] = int(parts[1])
+            except ValueError:
+                pass
+    return result
+
+
+def measure_import(python: str = sys.executable) -> Dict[str, Any]:
+    """
+    在子进程中测量一次 import ddddocr
+
+    Args:
+        python: Python解释器路径
+
+    Returns:
+        测量结果
+    """
+    modules = ['ddddocr', 'ddddocr.models.charset_manager']
+    completed = subprocess.run([python, '-X', 'importtime', '-c', _MEASURE_CODE, _package_parent()],
+                               capture_output=True, text=True, encoding='utf-8')
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else 'unknown error')
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    cumulative = _parse_importtime(completed.stderr, modules)
+    result['ddddocr_cumulative_us'] = cumulative.get('ddddocr')
+    result['charset_manager_cumulative_us'] = cumulative.get('ddddocr.models.charset_manager')
+    return result
+
+
+def measure_module_code(path: str, repeat: int = 5) -> Dict[str, Any]:
+    """
+    测量单个模块源码的编译与字节码反序列化耗时
+
+    Args:
+        path: 模块源码路径
+        repeat: 重复次数（取最小值）
+
+    Returns:
+        源码大小、字节码大小、编译耗时与反序列化耗时
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+
+    compile_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = compile(source, path, 'exec')
+        compile_times.append((time.perf_counter() - start) * 1000)
+
+    data = marshal.dumps(code)
+    unmarshal_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        marshal.loads(data)
+        unmarshal_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'path': path,
+        'source_kb': len(source) / 1024,
+        'bytecode_kb': len(data) / 1024,
+        'compile_ms': min(compile_times),
+        'unmarshal_ms': min(unmarshal_times),
+    }
+
+
+def _median(results: List[Dict[str, Any]], key: str) -> Optional[float]:
+    values = [result[key] for result in results if result.get(key) is not None]
+    return statistics.median(values) if values else None
+
+
+def run(repeat: int = 5, baseline: str = "", python: str = sys.executable) -> Dict[str, Any]:
+    """
+    测量导入耗时
+
+    Args:
+        repeat: 子进程测量次数（取中位数）
+        baseline: 用于对比的旧版 charset_manager.py 路径
+        python: Python解释器路径
+
+    Returns:
+        基准测试报告
+    """
+    # 先导入一次，确保字节码缓存已生成，后续测量反映的是正常启动的情况
+    measure_import(python)
+    runs = [measure_import(python) for _ in range(repeat)]
+
+    keys = ['import_ms', 'import_rss_mb', 'ddddocr_cumulative_us', 'charset_manager_cumulative_us',
+            'slide_init_ms', 'charset_first_load_ms', 'charset_cached_load_ms']
+    summary = {key: _median(runs, key) for key in keys}
+    summary['loaded_after_import'] = runs[-1]['loaded_after_import']
+    summary['loaded_after_slide_init'] = runs[-1]['loaded_after_slide_init']
+    report = {
+        'benchmark': 'import_time',
+        'runs': repeat,
+        'import': summary,
+        'charset_manager_code': measure_module_code(
+            os.path.join(_package_parent(), 'ddddocr', 'models', 'charset_manager.py')
+        ),
+    }
+    if baseline:
+        report['baseline_charset_manager_code'] = measure_module_code(baseline)
+    return report
+
+
+def check_regression(report: Dict[str, Any], max_import_ms: float) -> List[str]:
+    """
+    检查导入耗时是否回退
+
+    Args:
+        report: run返回的报告
+        max_import_ms: import ddddocr 中位耗时的上限（毫秒）
+
+    Returns:
+        问题描述列表，为空表示通过
+    """
+    problems = []
+    summary = report['import']
+    if summary['import_ms'] is not None and summary['import_ms'] > max_import_ms:
+        problems.append(f"import ddddocr 耗时 {summary['import_ms']:.1f}ms 超过阈值 {max_import_ms:.1f}ms")
+
+    eager = [name for name in ('onnxruntime', 'cv2', 'PIL') if name in summary['loaded_after_import']]
+    if eager:
+        problems.append(f"import ddddocr 时加载了重量级依赖: {', '.join(eager)}")
+    if 'onnxruntime' in summary['loaded_after_slide_init']:
+        problems.append("仅初始化滑块功能时加载了onnxruntime")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.importtime",
+                                     description="import ddddocr 耗时测试")
+    parser.add_argument("--repeat", type=int, default=5, help="子进程测量次数")
+    parser.add_argument("--baseline", default="", help="用于对比的旧版 charset_manager.py 路径")
+    parser.add_argument("--python", default=sys.executable, help="Python解释器路径")
+    parser.add_argument("--max-import-ms", type=float, default=0.0,
+                        help="回归检查阈值（毫秒），为0时不检查")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.baseline, args.python)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.max_import_ms:
+        problems = check_regression(report, args.max_import_ms)
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
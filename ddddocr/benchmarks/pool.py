@@ -0,0 +1,91 @@
+# coding=utf-8
+"""
+多进程工作池基准测试
+对比单进程逐张识别与不同工作进程数下OCRPool的吞吐量
+
+运行方式：
+    python -m ddddocr.benchmarks.pool
+    python -m ddddocr.benchmarks.pool --workers 1 2 4 8 --count 400
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from . import make_captcha_images
+
+
+def run(workers: Optional[List[int]] = None, count: int = 200, beta: bool = False) -> Dict[str, Any]:
+    """
+    测量吞吐量
+
+    Args:
+        workers: 要测试的工作进程数列表，为None时测试1到CPU核数之间的2的幂
+        count: 合成图片数量
+        beta: 是否使用beta模型
+
+    Returns:
+        基准测试结果
+    """
+    from ..core.ocr_engine import OCREngine
+    from ..core.ocr_pool import OCRPool
+
+    cpu_count = os.cpu_count() or 1
+    if workers is None:
+        workers = [1]
+        while workers[-1] * 2 <= cpu_count:
+            workers.append(workers[-1] * 2)
+
+    images = make_captcha_images(count)
+
+    engine = OCREngine(beta=beta)
+    engine.predict(images[0])
+    start = time.perf_counter()
+    expected = [engine.predict(image) for image in images]
+    single_seconds = time.perf_counter() - start
+    engine.cleanup()
+
+    results = [{
+        'mode': 'single_process',
+        'workers': 1,
+        'images_per_second': count / single_seconds,
+        'matches_single_process': True
+    }]
+
+    for num_workers in workers:
+        start = time.perf_counter()
+        with OCRPool(num_workers=num_workers, beta=beta) as pool:
+            startup_seconds = time.perf_counter() - start
+            # 预热每个工作进程
+            pool.map(images[:num_workers])
+
+            start = time.perf_counter()
+            texts = pool.map(images)
+            seconds = time.perf_counter() - start
+
+        results.append({
+            'mode': 'pool',
+            'workers': num_workers,
+            'startup_seconds': startup_seconds,
+            'images_per_second': count / seconds,
+            'speedup': single_seconds / seconds,
+            'matches_single_process': texts == expected
+        })
+
+    return {'benchmark': 'ocr_pool', 'images': count, 'cpu_count': cpu_count, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.pool",
+                                     description="多进程OCR工作池吞吐量测试")
+    parser.add_argument("--workers", type=int, nargs='+', default=None, help="要测试的工作进程数")
+    parser.add_argument("--count", type=int, default=200, help="合成图片数量")
+    parser.add_argument("--beta", action="store_true", help="使用beta模型")
+    args = parser.parse_args()
+    print(json.dumps(run(args.workers, args.count, args.beta), indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
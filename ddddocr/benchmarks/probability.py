@@ -0,0 +1,71 @@
+# coding=utf-8
+"""
+概率输出基准测试
+对比compact与full两种概率输出模式的JSON体积与序列化耗时
+
+运行方式：
+    python -m ddddocr.benchmarks.probability
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from . import make_captcha_images
+
+
+def run(count: int = 20, beta: bool = False, top_k: int = 5) -> Dict[str, Any]:
+    """
+    对比两种概率输出模式
+
+    Args:
+        count: 合成图片数量
+        beta: 是否使用beta模型
+        top_k: compact模式下每个时间步返回的候选数
+
+    Returns:
+        基准测试结果，体积与耗时均为每张图片的平均值
+    """
+    from ..compat.legacy import DdddOcr
+
+    ocr = DdddOcr(show_ad=False, beta=beta)
+    images = make_captcha_images(count)
+
+    results = []
+    for mode in ('full', 'compact'):
+        infer_ms = 0.0
+        serialize_ms = 0.0
+        total_bytes = 0
+        for image in images:
+            start = time.perf_counter()
+            result = ocr.classification(image, probability=True, probability_mode=mode, top_k=top_k)
+            infer_ms += (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            payload = json.dumps(result, ensure_ascii=False)
+            serialize_ms += (time.perf_counter() - start) * 1000
+            total_bytes += len(payload.encode('utf-8'))
+
+        results.append({
+            'mode': mode,
+            'json_kb': total_bytes / count / 1024,
+            'classification_ms': infer_ms / count,
+            'json_dumps_ms': serialize_ms / count
+        })
+
+    return {'benchmark': 'probability_output', 'images': count, 'top_k': top_k, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.probability",
+                                     description="概率输出模式对比测试")
+    parser.add_argument("--count", type=int, default=20, help="合成图片数量")
+    parser.add_argument("--beta", action="store_true", help="使用beta模型")
+    parser.add_argument("--top-k", type=int, default=5, help="compact模式下每个时间步返回的候选数")
+    args = parser.parse_args()
+    print(json.dumps(run(args.count, args.beta, args.top_k), indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
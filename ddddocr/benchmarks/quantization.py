@@ -0,0 +1,164 @@
+# coding=utf-8
+"""
+量化模型基准测试
+对比float32与INT8量化模型的延迟、峰值内存和识别准确率
+
+每个模型变体在独立子进程中运行，保证峰值内存互不干扰。
+
+运行方式：
+    python -m ddddocr quantize
+    python -m ddddocr.benchmarks.quantization --samples <样本目录>
+
+样本目录中图片的文件名格式为 ``<标注>_<任意后缀>.png``。未提供样本目录时使用合成图片，
+此时准确率以float32模型的输出为参照（即两种模型的结果一致率）。
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from . import load_sample_images, make_captcha_images, peak_rss_mb, percentile
+
+
+def run_variant(model: str, quantized: bool, sample_dir: str = "", count: int = 200,
+                repeat: int = 1) -> Dict[str, Any]:
+    """
+    在当前进程中测试单个模型变体
+
+    Args:
+        model: 模型名称，'ocr_old'、'ocr_beta' 或 'det'
+        quantized: 是否使用量化模型
+        sample_dir: 样本目录
+        count: 未提供样本目录时生成的合成图片数量
+        repeat: 样本集重复次数
+
+    Returns:
+        测试结果，包含每张图片的预测结果
+    """
+    from ..compat.legacy import DdddOcr
+
+    if sample_dir:
+        samples = load_sample_images(sample_dir)
+    else:
+        samples = [('', image) for image in make_captcha_images(count)]
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    if model == 'det':
+        engine = DdddOcr(det=True, show_ad=False, quantized=quantized)
+        infer = engine.detection
+    else:
+        engine = DdddOcr(show_ad=False, beta=(model == 'ocr_beta'), quantized=quantized)
+        infer = engine.classification
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_loaded = peak_rss_mb()
+
+    # 预热
+    infer(samples[0][1])
+
+    latencies = []
+    predictions = []
+    for round_index in range(repeat):
+        for _, image in samples:
+            start = time.perf_counter()
+            prediction = infer(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if round_index == 0:
+                predictions.append(prediction)
+
+    return {
+        'model': model,
+        'variant': 'int8' if quantized else 'float32',
+        'load_ms': load_ms,
+        'mean_ms': sum(latencies) / len(latencies),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'rss_before_load_mb': rss_before,
+        'rss_after_load_mb': rss_loaded,
+        'peak_rss_mb': peak_rss_mb(),
+        'labels': [label for label, _ in samples],
+        'predictions': predictions
+    }
+
+
+def _run_in_subprocess(model: str, quantized: bool, sample_dir: str, count: int,
+                       repeat: int) -> Optional[Dict[str, Any]]:
+    """在子进程中运行单个变体，避免不同模型的内存占用互相影响"""
+    command = [sys.executable, '-m', 'ddddocr.benchmarks.quantization', '--worker',
+               '--model', model, '--count', str(count), '--repeat', str(repeat)]
+    if quantized:
+        command.append('--quantized')
+    if sample_dir:
+        command.extend(['--samples', sample_dir])
+
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    if completed.returncode != 0:
+        return {'model': model, 'variant': 'int8' if quantized else 'float32',
+                'error': completed.stderr.strip().splitlines()[-1:] or ['unknown error']}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _accuracy(result: Dict[str, Any], reference: Optional[List[Any]]) -> Optional[float]:
+    """计算与标注（或参照预测）一致的比例"""
+    predictions = result.get('predictions')
+    if not predictions:
+        return None
+    targets = result['labels'] if any(result['labels']) else reference
+    if targets is None:
+        return None
+    return sum(p == t for p, t in zip(predictions, targets)) / len(predictions)
+
+
+def run(models=('ocr_old', 'det'), sample_dir: str = "", count: int = 200, repeat: int = 1) -> Dict[str, Any]:
+    """
+    对比各模型float32与INT8变体
+
+    Args:
+        models: 测试的模型名称
+        sample_dir: 样本目录
+        count: 未提供样本目录时生成的合成图片数量
+        repeat: 样本集重复次数
+
+    Returns:
+        基准测试报告
+    """
+    report = []
+    for model in models:
+        float_result = _run_in_subprocess(model, False, sample_dir, count, repeat)
+        int8_result = _run_in_subprocess(model, True, sample_dir, count, repeat)
+        reference = float_result.get('predictions')
+
+        for result in (float_result, int8_result):
+            if 'error' not in result:
+                result['accuracy'] = _accuracy(result, reference)
+                result['accuracy_reference'] = 'labels' if any(result['labels']) else 'float32'
+                del result['labels'], result['predictions']
+            report.append(result)
+
+    return {'benchmark': 'quantization', 'samples': sample_dir or f'synthetic x{count}', 'results': report}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.quantization",
+                                     description="float32与INT8量化模型对比测试")
+    parser.add_argument("--samples", default="", help="样本目录，文件名格式为 <标注>_<后缀>.png")
+    parser.add_argument("--models", nargs="+", default=["ocr_old", "det"], choices=["ocr_old", "ocr_beta", "det"])
+    parser.add_argument("--count", type=int, default=200, help="未提供样本目录时的合成图片数量")
+    parser.add_argument("--repeat", type=int, default=1, help="样本集重复次数")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--model", default="ocr_old", help=argparse.SUPPRESS)
+    parser.add_argument("--quantized", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_variant(args.model, args.quantized, args.samples, args.count, args.repeat),
+                         ensure_ascii=False))
+    else:
+        print(json.dumps(run(args.models, args.samples, args.count, args.repeat), indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+# coding=utf-8
+"""
+综合基准测试
+测量OCR、目标检测、滑块匹配三个引擎在不同模型变体、线程数和批大小下的
+延迟分位数（p50/p95/p99）、吞吐量、峰值内存以及各阶段（解码、预处理、推理、后处理）耗时
+
+每个测试用例在独立子进程中运行，峰值内存互不影响。结果以JSON输出，附带版本与运行环境信息，
+便于对比不同版本的测试结果。
+
+运行方式：
+    python -m ddddocr bench
+    python -m ddddocr bench --engines ocr --variants old beta --threads 1 4 --batch-sizes 1 16
+    python -m ddddocr bench --samples <样本目录> --output result.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import (load_sample_images, make_captcha_images, make_click_images, make_slide_pairs, peak_rss_mb,
+               percentile)
+
+# 引擎与可选的模型变体
+ENGINE_VARIANTS = {
+    'ocr': ('old', 'beta', 'old_int8', 'beta_int8'),
+    'det': ('float32', 'int8'),
+    'slide': ('simple', 'edge'),
+}
+
+# 默认测试的变体
+DEFAULT_VARIANTS = {
+    'ocr': ('old',),
+    'det': ('float32',),
+    'slide': ('simple', 'edge'),
+}
+
+class _StageTimer:
+    """按阶段累计耗时（作为引擎的阶段计时监听器）"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def __call__(self, record) -> None:
+        """接收引擎上报的阶段记录"""
+        self.samples.setdefault(record.stage, []).append(record.duration_ms)
+
+    def summary(self, total_ms: float) -> Dict[str, Dict[str, float]]:
+        """各阶段的平均耗时、中位耗时和耗时占比"""
+        return {
+            stage: {
+                'mean_ms': sum(values) / len(values),
+                'p50_ms': percentile(values, 50),
+                'share': sum(values) / total_ms if total_ms else 0.0
+            }
+            for stage, values in self.samples.items()
+        }
+
+
+def _latency_summary(latencies: List[float], images_per_call: int) -> Dict[str, float]:
+    """延迟分位数与吞吐量"""
+    total_ms = sum(latencies)
+    return {
+        'mean_ms': total_ms / len(latencies),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'throughput_ips': len(latencies) * images_per_call / (total_ms / 1000) if total_ms else 0.0
+    }
+
+
+def _session_config(threads: int):
+    """线程数为0时使用onnxruntime默认配置"""
+    from ..models.session_config import SessionConfig
+    return SessionConfig(intra_op_num_threads=threads) if threads else None
+
+
+def _ocr_case(variant: str, threads: int, batch_size: int, images: List[bytes],
+              timer: _StageTimer) -> Tuple[Callable[[List[bytes]], Any], Callable[[], None]]:
+    """构建OCR测试用例，返回 (单次调用函数, 清理函数)"""
+    from ..core.ocr_engine import OCREngine
+
+    engine = OCREngine(beta=variant.startswith('beta'), quantized=variant.endswith('_int8'),
+                       session_config=_session_config(threads))
+    engine.add_stage_listener(timer)
+
+    def call_single(batch: List[bytes]) -> Any:
+        return engine.predict(batch[0])
+
+    def call_batch(batch: List[bytes]) -> Any:
+        return engine.predict_batch(batch)
+
+    return (call_single if batch_size == 1 else call_batch), engine.cleanup
+
+
+def _det_case(variant: str, threads: int, batch_size: int, images: List[bytes],
+              timer: _StageTimer) -> Tuple[Callable[[List[bytes]], Any], Callable[[], None]]:
+    """构建目标检测测试用例"""
+    from ..core.detection_engine import DetectionEngine
+
+    engine = DetectionEngine(quantized=(variant == 'int8'), session_config=_session_config(threads))
+    engine.add_stage_listener(timer)
+
+    def call(batch: List[bytes]) -> Any:
+        return engine.predict(batch[0])
+
+    return call, engine.cleanup
+
+
+def _slide_case(variant: str, threads: int, batch_size: int, pairs: List[Tuple[bytes, bytes]],
+                timer: _StageTimer) -> Tuple[Callable[[List[Tuple[bytes, bytes]]], Any], Callable[[], None]]:
+    """构建滑块匹配测试用例（滑块匹配不使用模型，只有解码和模板匹配两个阶段）"""
+    from ..core.slide_engine import SlideEngine
+
+    engine = SlideEngine()
+    engine.add_stage_listener(timer)
+    simple_target = variant == 'simple'
+
+    def call(batch: List[Tuple[bytes, bytes]]) -> Any:
+        target, background = batch[0]
+        return engine.slide_match(target, background, simple_target)
+
+    return call, engine.cleanup
+
+
+def _load_inputs(engine: str, sample_dir: str, count: int) -> Tuple[List[Any], str]:
+    """加载测试输入，返回 (输入列表, 来源描述)"""
+    if engine == 'slide':
+        return [(target, background) for target, background, _ in make_slide_pairs(count)], f'synthetic x{count}'
+    if sample_dir:
+        samples = [image for _, image in load_sample_images(sample_dir)]
+        if samples:
+            return samples, sample_dir
+    if engine == 'det':
+        return make_click_images(count), f'synthetic x{count}'
+    return make_captcha_images(count), f'synthetic x{count}'
+
+
+def run_case(engine: str, variant: str, threads: int = 0, batch_size: int = 1, sample_dir: str = "",
+             count: int = 100, repeat: int = 3, warmup: int = 5) -> Dict[str, Any]:
+    """
+    在当前进程中运行单个测试用例
+
+    Args:
+        engine: 'ocr'、'det' 或 'slide'
+        variant: 模型变体，见 ENGINE_VARIANTS
+        threads: onnxruntime算子内线程数，0表示默认
+        batch_size: 批大小（仅OCR支持大于1，此时使用 predict_batch）
+        sample_dir: 样本目录
+        count: 未提供样本目录时生成的合成图片数量
+        repeat: 样本集重复次数
+        warmup: 预热调用次数
+
+    Returns:
+        测试结果
+    """
+    inputs, source = _load_inputs(engine, sample_dir, count)
+    case = {'ocr': _ocr_case, 'det': _det_case, 'slide': _slide_case}[engine]
+
+    rss_before = peak_rss_mb()
+    timer = _StageTimer()
+    start = time.perf_counter()
+    call, cleanup = case(variant, threads, batch_size, inputs, timer)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    batches = [inputs[i:i + batch_size] for i in range(0, len(inputs), batch_size)]
+    for i in range(warmup):
+        call(batches[i % len(batches)])
+    timer.samples.clear()
+
+    latencies = []
+    for _ in range(repeat):
+        for batch in batches:
+            start = time.perf_counter()
+            call(batch)
+            latencies.append((time.perf_counter() - start) * 1000)
+    cleanup()
+
+    summary = _latency_summary(latencies, batch_size)
+    # 最后一批可能不满，按实际图片数计算吞吐量
+    summary['throughput_ips'] = len(inputs) * repeat / (sum(latencies) / 1000)
+    return {
+        'engine': engine,
+        'variant': variant,
+        'threads': threads,
+        'batch_size': batch_size,
+        'inputs': source,
+        'calls': len(latencies),
+        'load_ms': load_ms,
+        'latency': summary,
+        'stages': timer.summary(sum(latencies)),
+        'rss_before_load_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def _run_in_subprocess(case: Dict[str, Any]) -> Dict[str, Any]:
+    """在子进程中运行单个测试用例"""
+    command = [sys.executable, '-m', 'ddddocr.benchmarks.suite', '--worker', json.dumps(case)]
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {**case, 'error': lines[-1] if lines else 'unknown error'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def environment_info() -> Dict[str, Any]:
+    """
+    获取运行环境信息
+
+    Returns:
+        版本、平台与CPU信息
+    """
+    from .. import __version__
+
+    info = {
+        'ddddocr': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    for module in ('onnxruntime', 'numpy', 'cv2', 'PIL'):
+        try:
+            info[module] = __import__(module).__version__
+        except Exception:
+            info[module] = None
+    return info
+
+
+def run(engines: Sequence[str] = ('ocr', 'det', 'slide'), variants: Optional[Sequence[str]] = None,
+        threads: Sequence[int] = (0,), batch_sizes: Sequence[int] = (1,), sample_dir: str = "",
+        count: int = 100, repeat: int = 3, in_process: bool = False) -> Dict[str, Any]:
+    """
+    运行全部测试用例
+
+    Args:
+        engines: 测试的引擎
+        variants: 模型变体，为None时使用各引擎的默认变体；不适用于某引擎的变体会被跳过
+        threads: onnxruntime算子内线程数列表（滑块匹配不使用onnxruntime，只测试一次）
+        batch_sizes: 批大小列表（大于1的批大小只用于OCR）
+        sample_dir: 样本目录
+        count: 未提供样本目录时生成的合成图片数量
+        repeat: 样本集重复次数
+        in_process: 是否在当前进程中运行（不启动子进程，峰值内存会相互影响）
+
+    Returns:
+        基准测试报告
+    """
+    cases = []
+    for engine in engines:
+        engine_variants = [v for v in (variants or DEFAULT_VARIANTS[engine]) if v in ENGINE_VARIANTS[engine]]
+        engine_threads = [0] if engine == 'slide' else list(threads)
+        engine_batches = list(batch_sizes) if engine == 'ocr' else [1]
+        for variant in engine_variants:
+            for thread_count in engine_threads:
+                for batch_size in engine_batches:
+                    cases.append({'engine': engine, 'variant': variant, 'threads': thread_count,
+                                  'batch_size': batch_size, 'sample_dir': sample_dir,
+                                  'count': count, 'repeat': repeat})
+
+    results = [run_case(**case) if in_process else _run_in_subprocess(case) for case in cases]
+    return {'benchmark': 'suite', 'environment': environment_info(), 'results': results}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    添加命令行参数（供 python -m ddddocr bench 复用）
+
+    Args:
+        parser: 参数解析器
+    """
+    all_variants = sorted({v for values in ENGINE_VARIANTS.values() for v in values})
+    parser.add_argument("--engines", nargs="+", default=["ocr", "det", "slide"], choices=list(ENGINE_VARIANTS),
+                        help="测试的引擎 (默认: 全部)")
+    parser.add_argument("--variants", nargs="+", default=None, choices=all_variants,
+                        help="模型变体 (默认: ocr=old, det=float32, slide=simple/edge)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0], help="onnxruntime算子内线程数，0为默认")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1], help="OCR批大小")
+    parser.add_argument("--samples", default="", help="样本目录（用于OCR和目标检测）")
+    parser.add_argument("--count", type=int, default=100, help="未提供样本目录时的合成图片数量")
+    parser.add_argument("--repeat", type=int, default=3, help="样本集重复次数")
+    parser.add_argument("--in-process", action="store_true", help="在当前进程中运行全部用例")
+    parser.add_argument("--output", default="", help="结果输出文件路径 (默认: 输出到标准输出)")
+
+
+def run_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    按命令行参数运行并输出结果
+
+    Args:
+        args: 解析后的参数
+
+    Returns:
+        基准测试报告
+    """
+    report = run(args.engines, args.variants, args.threads, args.batch_sizes, args.samples,
+                 args.count, args.repeat, args.in_process)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"结果已写入: {args.output}")
+    else:
+        print(text)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m ddddocr.benchmarks.suite",
+                                     description="OCR、目标检测、滑块匹配综合基准测试")
+    add_arguments(parser)
+    parser.add_argument("--worker", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(**json.loads(args.worker)), ensure_ascii=False))
+    else:
+        run_from_args(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,34 @@
 提供与原始DdddOcr类完全兼容的接口
 """
 
+import asyncio
+import base64
+import contextvars
+import functools
+import os
 import pathlib
-from typing import Union, List, Optional, Dict, Any, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List, Optional, Dict, Any, Sequence, Tuple, Callable
 
 from PIL import Image
 
 from ..core.detection_engine import DetectionEngine
 from ..core.ocr_engine import OCREngine
+from ..core.pipeline import DetectClassifyPipeline
 from ..core.slide_engine import SlideEngine
-from ..utils.exceptions import DDDDOCRError
-from ..utils.validators import validate_model_config
+from ..models.charset_range import CharsetRangeInput
+from ..models.model_loader import ModelLoader
+from ..models.session_config import SessionConfig
+from ..preprocessing.color_filter import ColorFilter
+from ..preprocessing.image_processor import ImageProcessor
+from ..utils.exceptions import DDDDOCRError, ImageProcessError
+from ..utils.image_io import ImageInput, load_image_from_input, png_rgba_black_preprocess
+from ..utils.result_cache import ResultCache
+from ..utils.validators import validate_image_input, validate_model_config
+
+# 级联识别支持的备选方案
+CASCADE_ALTERNATIVES = ('binarize', 'model')
 
 
 class DdddOcr:
@@ -26,7 +44,12 @@ class DdddOcr:
 
     def __init__(self, ocr: bool = True, det: bool = False, old: bool = False, beta: bool = False,
                  use_gpu: bool = False, device_id: int = 0, show_ad: bool = True,
-                 import_onnx_path: str = "", charsets_path: str = ""):
+                 import_onnx_path: str = "", charsets_path: str = "",
+                 session_config: Optional[SessionConfig] = None, quantized: bool = False,
+                 preprocess_mode: str = 'exact', interpolation: str = 'auto',
+                 max_workers: Optional[int] = None, cache_size: int = 0, cache_ttl: Optional[float] = None,
+                 tile_threshold: int = 4096, det_input_size: Tuple[int, int] = (416, 416),
+                 det_nms_thr: float = 0.45, det_score_thr: float = 0.1):
         """
         初始化DDDDOCR
         
@@ -40,6 +63,23 @@ class DdddOcr:
             show_ad: 是否显示广告信息
             import_onnx_path: 自定义ONNX模型路径
             charsets_path: 自定义字符集路径
+            session_config: onnxruntime会话配置（线程数、图优化级别、优化模型缓存目录等）
+            quantized: 是否使用INT8量化的内置模型（需先通过 python -m ddddocr quantize 生成）
+            preprocess_mode: OCR预处理模式，'exact'与历史版本结果完全一致，
+                'fast'直接解码为灰度图并使用OpenCV缩放，速度更快、结果与exact模式接近
+            interpolation: fast模式下的插值方式，'auto'（放大用lanczos、缩小用area）、
+                'nearest'、'linear'、'cubic'、'area' 或 'lanczos'
+            max_workers: *_async 方法使用的线程池大小，为None时取 min(4, CPU核数)。
+                onnxruntime和OpenCV在计算时会释放GIL，多个请求可以在线程池中并行执行
+            cache_size: 识别结果缓存的最大条目数，为0时不缓存。缓存键为图片内容的哈希加上全部识别参数，
+                同一验证码被重复截图时直接返回缓存的结果
+            cache_ttl: 缓存结果的有效期（秒），为None时不过期
+            tile_threshold: 缩放到模型输入高度后宽度超过该值的图像（如误传的整行截图、长文本条）
+                按相互重叠的窗口分块推理并拼接结果，内存占用不随宽度增长；0表示不分块
+            det_input_size: 目标检测模型的输入尺寸 (高, 宽)，必须是32的倍数；
+                点选验证码图片较小时可使用320或256以提高速度（需要以动态输入尺寸导出的检测模型）
+            det_nms_thr: 目标检测的NMS阈值
+            det_score_thr: 目标检测的置信度阈值
         """
         # 显示广告信息（保持原有行为）
         if show_ad:
@@ -55,6 +95,10 @@ class DdddOcr:
 
         # 验证配置参数
         validate_model_config(ocr, det, old, beta, use_gpu, device_id)
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise DDDDOCRError("max_workers必须为正整数")
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise DDDDOCRError("cache_size必须为非负整数")
 
         # 保存配置
         self.ocr_enabled = ocr
@@ -65,6 +109,24 @@ class DdddOcr:
         self.device_id = device_id
         self.import_onnx_path = import_onnx_path
         self.charsets_path = charsets_path
+        self.session_config = session_config
+        self.quantized = quantized
+        self.preprocess_mode = preprocess_mode
+        self.interpolation = interpolation
+        self.tile_threshold = tile_threshold
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+        # 异步方法使用的线程池，首次调用时创建
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # 级联识别使用的另一套OCR模型，首次需要时创建
+        self._cascade_engine: Optional[OCREngine] = None
+        self._cascade_lock = threading.Lock()
+
+        # 检测+识别流水线，首次调用 detect_and_classify 时创建
+        self._pipeline: Optional[DetectClassifyPipeline] = None
+        self._pipeline_lock = threading.Lock()
 
         # 初始化引擎
         self.ocr_engine: Optional[OCREngine] = None
@@ -75,7 +137,9 @@ class DdddOcr:
         if det:
             # 目标检测模式
             self.det = True
-            self.detection_engine = DetectionEngine(use_gpu, device_id)
+            self.detection_engine = DetectionEngine(use_gpu, device_id, session_config, quantized,
+                                                    input_size=det_input_size, nms_thr=det_nms_thr,
+                                                    score_thr=det_score_thr)
         elif ocr or import_onnx_path:
             # OCR模式
             self.det = False
@@ -85,7 +149,12 @@ class DdddOcr:
                 old=old,
                 beta=beta,
                 import_onnx_path=import_onnx_path,
-                charsets_path=charsets_path
+                charsets_path=charsets_path,
+                session_config=session_config,
+                quantized=quantized,
+                preprocess_mode=preprocess_mode,
+                interpolation=interpolation,
+                tile_threshold=tile_threshold
             )
         else:
             # 滑块模式
@@ -94,12 +163,20 @@ class DdddOcr:
         # 滑块引擎总是可用
         self.slide_engine = SlideEngine()
 
-    def classification(self, img: Union[bytes, str, pathlib.PurePath, Image.Image],
+        # 识别结果缓存，所有引擎共享同一个缓存（键中包含模型标识）
+        self.result_cache: Optional[ResultCache] = ResultCache(cache_size, cache_ttl) if cache_size else None
+        if self.result_cache is not None:
+            for engine in (self.ocr_engine, self.detection_engine, self.slide_engine):
+                if engine is not None:
+                    engine.enable_cache(cache=self.result_cache)
+
+    def classification(self, img: ImageInput,
                        png_fix: bool = False, probability: bool = False,
                        color_filter_colors: Optional[List[str]] = None,
                        color_filter_custom_ranges: Optional[
-                           List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None) -> Union[
-        str, Dict[str, Any]]:
+                           List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None,
+                       probability_mode: str = 'compact', top_k: int = 5,
+                       charset_range: Optional[CharsetRangeInput] = None) -> Union[str, Dict[str, Any]]:
         """
         OCR识别方法
         
@@ -109,6 +186,11 @@ class DdddOcr:
             probability: 是否返回概率信息
             color_filter_colors: 颜色过滤预设颜色列表，如 ['red', 'blue']
             color_filter_custom_ranges: 自定义HSV颜色范围列表，如 [((0,50,50), (10,255,255))]
+            probability_mode: 概率输出模式。'compact'（默认）返回每个时间步的top-k候选、
+                每个字符的置信度和整体置信度；'full' 返回完整的softmax矩阵和字符集（数据量很大）
+            top_k: compact模式下每个时间步返回的候选数
+            charset_range: 字符集范围限制（整数、字符串、字符列表或CharsetRange），只对本次调用生效，
+                不影响 set_ranges 设置的范围。需要反复使用的范围可预先创建 CharsetRange.from_value(...)
         
         Returns:
             识别结果文本或包含概率信息的字典
@@ -127,15 +209,246 @@ class DdddOcr:
             png_fix=png_fix,
             probability=probability,
             color_filter_colors=color_filter_colors,
-            color_filter_custom_ranges=color_filter_custom_ranges
+            color_filter_custom_ranges=color_filter_custom_ranges,
+            charset_range=charset_range,
+            probability_mode=probability_mode,
+            top_k=top_k
+        )
+
+    def classification_batch(self, imgs: Sequence[ImageInput],
+                             png_fix: bool = False, probability: bool = False,
+                             color_filter_colors: Optional[List[str]] = None,
+                             color_filter_custom_ranges: Optional[
+                                 List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None,
+                             bucket_width: int = 32, max_batch_size: int = 32,
+                             probability_mode: str = 'compact', top_k: int = 5,
+                             charset_range: Optional[CharsetRangeInput] = None
+                             ) -> List[Union[str, Dict[str, Any]]]:
+        """
+        批量OCR识别方法
+
+        按宽度分桶后每个桶执行一次推理，结果顺序与输入一致
+
+        Args:
+            imgs: 图片数据序列
+            png_fix: 是否修复PNG透明背景问题
+            probability: 是否返回概率信息
+            color_filter_colors: 颜色过滤预设颜色列表
+            color_filter_custom_ranges: 自定义HSV颜色范围列表
+            bucket_width: 宽度分桶粒度（像素）
+            max_batch_size: 单次推理的最大图像数
+            probability_mode: 概率输出模式，'compact' 或 'full'
+            top_k: compact模式下每个时间步返回的候选数
+            charset_range: 字符集范围限制，只对本次调用生效
+
+        Returns:
+            识别结果列表
+
+        Raises:
+            DDDDOCRError: 当功能未启用或识别失败时
+        """
+        if self.det:
+            raise DDDDOCRError("当前识别类型为目标检测")
+
+        if not self.ocr_engine:
+            raise DDDDOCRError("OCR功能未初始化")
+
+        return self.ocr_engine.predict_batch(
+            images=imgs,
+            png_fix=png_fix,
+            probability=probability,
+            color_filter_colors=color_filter_colors,
+            color_filter_custom_ranges=color_filter_custom_ranges,
+            charset_range=charset_range,
+            bucket_width=bucket_width,
+            max_batch_size=max_batch_size,
+            probability_mode=probability_mode,
+            top_k=top_k
         )
 
-    def detection(self, img: Union[bytes, str, pathlib.PurePath, Image.Image]) -> List[List[int]]:
+    def classification_cascade(self, img: ImageInput, threshold: float = 0.7, min_length: int = 0,
+                               alternatives: Sequence[str] = CASCADE_ALTERNATIVES,
+                               color_filter_colors: Optional[List[str]] = None,
+                               png_fix: bool = False,
+                               charset_range: Optional[CharsetRangeInput] = None) -> Dict[str, Any]:
+        """
+        置信度门控的级联识别
+
+        先用当前模型识别原图，置信度（各字符置信度的最小值）不低于threshold且长度满足min_length时直接返回；
+        否则将备选方案一起识别，返回置信度最高的结果。额外开销有上限：
+        当前模型对所有图像变体只执行一次批量推理，另一套模型只识别一次原图。
+
+        Args:
+            img: 图片数据
+            threshold: 置信度阈值，取值0~1
+            min_length: 结果的最小长度，不足时视为不可信（如4位验证码可设为4）
+            alternatives: 备选方案，'binarize'（Otsu二值化后的图像）、'model'（另一套内置OCR模型，old与beta互为备选，
+                自定义模型时忽略）
+            color_filter_colors: 颜色过滤备选，每种颜色生成一个只保留该颜色的图像变体，如 ['red', 'blue']
+            png_fix: 是否修复PNG透明背景问题
+            charset_range: 字符集范围限制，对所有备选方案生效
+
+        Returns:
+            {'text': 文本, 'confidence': 置信度, 'variant': 结果来源,
+             'candidates': [{'variant': ..., 'text': ..., 'confidence': ...}, ...]}，
+            variant为 'default'、'binarize'、'model' 或 'color:<颜色>'
+
+        Raises:
+            DDDDOCRError: 当功能未启用、参数无效或识别失败时
+        """
+        if self.det:
+            raise DDDDOCRError("当前识别类型为目标检测")
+
+        if not self.ocr_engine:
+            raise DDDDOCRError("OCR功能未初始化")
+
+        unknown = [name for name in alternatives if name not in CASCADE_ALTERNATIVES]
+        if unknown:
+            raise DDDDOCRError(f"不支持的级联备选方案: {', '.join(unknown)}，支持: {', '.join(CASCADE_ALTERNATIVES)}")
+        validate_image_input(img)
+
+        # 原图最多被当前模型、图像变体和另一套模型使用三次，先统一读出为原始字节，
+        # 避免文件路径被重复读取、base64字符串被重复解码
+        img = self._read_encoded_input(img)
+
+        candidates = [self._cascade_candidate('default', self.classification(
+            img, png_fix=png_fix, probability=True, top_k=1, charset_range=charset_range))]
+        if self._cascade_accepts(candidates[0], threshold, min_length):
+            return self._cascade_result(candidates)
+
+        # 当前模型：所有图像变体一次批量推理
+        variants = []
+        if 'binarize' in alternatives or color_filter_colors:
+            source = load_image_from_input(img)
+            if png_fix and source.mode == 'RGBA':
+                source = png_rgba_black_preprocess(source)
+            if 'binarize' in alternatives:
+                variants.append(('binarize', ImageProcessor.binarize_image(source, method='otsu')))
+            for color in color_filter_colors or []:
+                variants.append((f'color:{color}', ColorFilter(colors=[color]).filter_image(source)))
+        if variants:
+            results = self.ocr_engine.predict_batch([image for _, image in variants], probability=True, top_k=1,
+                                                    charset_range=charset_range)
+            candidates.extend(self._cascade_candidate(name, result) for (name, _), result in zip(variants, results))
+
+        # 另一套模型只识别原图
+        if 'model' in alternatives:
+            engine = self._get_cascade_engine()
+            if engine is not None:
+                candidates.append(self._cascade_candidate('model', engine.predict(
+                    img, png_fix=png_fix, probability=True, top_k=1,
+                    charset_range=self._cascade_charset_range(charset_range))))
+
+        return self._cascade_result(candidates, min_length)
+
+    @staticmethod
+    def _read_encoded_input(img: ImageInput) -> ImageInput:
+        """
+        将文件路径、base64字符串和一维memoryview读取为原始字节，其他输入原样返回
+
+        Args:
+            img: 图片输入
+
+        Returns:
+            原始字节或原输入
+
+        Raises:
+            DDDDOCRError: 当文件读取或base64解码失败时
+        """
+        if isinstance(img, memoryview) and img.ndim == 1:
+            return img.tobytes()
+        if isinstance(img, pathlib.PurePath) or (isinstance(img, str) and os.path.exists(img)):
+            try:
+                with open(img, 'rb') as fp:
+                    return fp.read()
+            except OSError as e:
+                raise ImageProcessError(f"图片文件读取失败: {str(e)}") from e
+        if isinstance(img, str):
+            try:
+                return base64.b64decode(img)
+            except Exception as e:
+                raise ImageProcessError(f"base64图片解码失败: {str(e)}") from e
+        return img
+
+    @staticmethod
+    def _cascade_candidate(variant: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """由compact概率输出计算候选结果，置信度取最不确定的字符"""
+        chars = result.get('chars') or []
+        confidence = min(item['confidence'] for item in chars) if chars else 0.0
+        return {'variant': variant, 'text': result['text'], 'confidence': confidence}
+
+    @staticmethod
+    def _cascade_accepts(candidate: Dict[str, Any], threshold: float, min_length: int) -> bool:
+        """候选结果是否可信"""
+        return candidate['confidence'] >= threshold and len(candidate['text']) >= max(min_length, 1)
+
+    @staticmethod
+    def _cascade_result(candidates: List[Dict[str, Any]], min_length: int = 0) -> Dict[str, Any]:
+        """选出满足长度要求且置信度最高的候选（均不满足长度要求时只比较置信度）"""
+        best = max(candidates, key=lambda item: (len(item['text']) >= min_length, item['confidence']))
+        return {**best, 'candidates': candidates}
+
+    def _cascade_charset_range(self, charset_range: Optional[CharsetRangeInput]) -> Optional[CharsetRangeInput]:
+        """
+        获取另一套模型使用的字符集范围
+
+        未指定时沿用当前模型通过 set_ranges 设置的范围，按字符传递给另一套模型
+        """
+        if charset_range is not None:
+            return charset_range
+        chars = [char for char in self.ocr_engine.charset_manager.charset_range if char]
+        return chars or None
+
+    def _get_cascade_engine(self) -> Optional[OCREngine]:
+        """
+        获取级联识别使用的另一套内置OCR模型（old与beta互为备选），首次调用时创建
+
+        备选模型按当前实际加载的模型文件选择（old优先于beta，old=True且beta=True时加载的是old模型），
+        两者的模型文件相同时不创建备选模型。
+
+        Returns:
+            OCR引擎，使用自定义模型或没有不同的备选模型时返回None
+        """
+        if self.import_onnx_path:
+            return None
+        # 当前加载的是beta模型时以old模型为备选，否则以beta模型为备选
+        beta_path = ModelLoader.get_ocr_model_path(beta=True)
+        primary_is_beta = ModelLoader.get_ocr_model_path(self.old, self.beta) == beta_path
+        alternate_old, alternate_beta = primary_is_beta, not primary_is_beta
+        if (ModelLoader.get_ocr_model_path(alternate_old, alternate_beta)
+                == ModelLoader.get_ocr_model_path(self.old, self.beta)):
+            return None
+        engine = self._cascade_engine
+        if engine is None:
+            with self._cascade_lock:
+                if self._cascade_engine is None:
+                    primary = self.ocr_engine
+                    self._cascade_engine = OCREngine(
+                        use_gpu=self.use_gpu,
+                        device_id=self.device_id,
+                        old=alternate_old,
+                        beta=alternate_beta,
+                        session_config=self.session_config,
+                        quantized=self.quantized,
+                        preprocess_mode=self.preprocess_mode,
+                        interpolation=primary.preprocessor.interpolation,
+                        tile_threshold=primary.tile_threshold
+                    )
+                    if self.result_cache is not None:
+                        self._cascade_engine.enable_cache(cache=self.result_cache)
+                engine = self._cascade_engine
+        return engine
+
+    def detection(self, img: ImageInput, input_size: Optional[Tuple[int, int]] = None,
+                  nms_thr: Optional[float] = None, score_thr: Optional[float] = None) -> List[List[int]]:
         """
         目标检测方法
         
         Args:
             img: 图片数据
+            input_size: 本次调用的模型输入尺寸 (高, 宽)，为None时使用初始化时的设置
+            nms_thr: 本次调用的NMS阈值，为None时使用初始化时的设置
+            score_thr: 本次调用的置信度阈值，为None时使用初始化时的设置
             
         Returns:
             检测到的边界框列表
@@ -149,10 +462,100 @@ class DdddOcr:
         if not self.detection_engine:
             raise DDDDOCRError("目标检测功能未初始化")
 
-        return self.detection_engine.predict(img)
+        return self.detection_engine.predict(img, input_size, nms_thr, score_thr)
+
+    def detection_batch(self, imgs: Sequence[ImageInput], input_size: Optional[Tuple[int, int]] = None,
+                        nms_thr: Optional[float] = None, score_thr: Optional[float] = None,
+                        max_batch_size: int = 32) -> List[List[List[int]]]:
+        """
+        批量目标检测方法
+
+        所有图片合并为一个批次执行一次推理，NMS对整批结果一次完成，结果顺序与输入一致
+
+        Args:
+            imgs: 图片数据序列
+            input_size: 模型输入尺寸 (高, 宽)，为None时使用初始化时的设置
+            nms_thr: NMS阈值，为None时使用初始化时的设置
+            score_thr: 置信度阈值，为None时使用初始化时的设置
+            max_batch_size: 单次推理的最大图像数
+
+        Returns:
+            每张图片检测到的边界框列表
+
+        Raises:
+            DDDDOCRError: 当功能未启用或检测失败时
+        """
+        if not self.det:
+            raise DDDDOCRError("当前识别类型为OCR")
+
+        if not self.detection_engine:
+            raise DDDDOCRError("目标检测功能未初始化")
+
+        return self.detection_engine.predict_batch(imgs, input_size, nms_thr, score_thr, max_batch_size)
 
-    def slide_match(self, target_img: Union[bytes, str, pathlib.PurePath, Image.Image],
-                    background_img: Union[bytes, str, pathlib.PurePath, Image.Image],
+    def detect_and_classify(self, img: ImageInput, png_fix: bool = False,
+                            charset_range: Optional[CharsetRangeInput] = None,
+                            input_size: Optional[Tuple[int, int]] = None,
+                            nms_thr: Optional[float] = None,
+                            score_thr: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        点选验证码的检测+识别：图片只解码一次，检测出的目标用numpy切片裁剪后在一次批量推理中识别
+
+        识别使用初始化时的OCR模型配置（old、beta、import_onnx_path等），该OCR模型在首次调用时加载
+
+        Args:
+            img: 图片数据
+            png_fix: 是否修复PNG透明背景问题
+            charset_range: 字符集范围限制，只对本次调用生效
+            input_size: 检测模型输入尺寸 (高, 宽)，为None时使用初始化时的设置
+            nms_thr: NMS阈值，为None时使用初始化时的设置
+            score_thr: 检测置信度阈值，为None时使用初始化时的设置
+
+        Returns:
+            每个目标的 {'box': [x1, y1, x2, y2], 'text': 识别文本, 'confidence': 置信度, 'chars': 各字符的置信度}
+
+        Raises:
+            DDDDOCRError: 当目标检测功能未启用或识别失败时
+        """
+        if not self.det or not self.detection_engine:
+            raise DDDDOCRError("检测识别需要启用目标检测功能（det=True）")
+
+        return self._get_pipeline().detect_and_classify(img, png_fix=png_fix, charset_range=charset_range,
+                                                        input_size=input_size, nms_thr=nms_thr,
+                                                        score_thr=score_thr)
+
+    def _get_pipeline(self) -> DetectClassifyPipeline:
+        """
+        获取检测+识别流水线，首次调用时按初始化参数加载OCR模型
+
+        Returns:
+            检测+识别流水线
+        """
+        pipeline = self._pipeline
+        if pipeline is None:
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    ocr_engine = OCREngine(
+                        use_gpu=self.use_gpu,
+                        device_id=self.device_id,
+                        old=self.old,
+                        beta=self.beta,
+                        import_onnx_path=self.import_onnx_path,
+                        charsets_path=self.charsets_path,
+                        session_config=self.session_config,
+                        quantized=self.quantized,
+                        preprocess_mode=self.preprocess_mode,
+                        interpolation=self.interpolation,
+                        tile_threshold=self.tile_threshold
+                    )
+                    if self.result_cache is not None:
+                        ocr_engine.enable_cache(cache=self.result_cache)
+                    self._pipeline = DetectClassifyPipeline(self.detection_engine, ocr_engine)
+                pipeline = self._pipeline
+        return pipeline
+
+    def slide_match(self, target_img: ImageInput,
+                    background_img: ImageInput,
                     simple_target: bool = False) -> Dict[str, Any]:
         """
         滑块匹配方法
@@ -173,8 +576,8 @@ class DdddOcr:
 
         return self.slide_engine.slide_match(target_img, background_img, simple_target)
 
-    def slide_comparison(self, target_img: Union[bytes, str, pathlib.PurePath, Image.Image],
-                         background_img: Union[bytes, str, pathlib.PurePath, Image.Image]) -> Dict[str, Any]:
+    def slide_comparison(self, target_img: ImageInput,
+                         background_img: ImageInput) -> Dict[str, Any]:
         """
         滑块比较方法
         
@@ -193,9 +596,114 @@ class DdddOcr:
 
         return self.slide_engine.slide_comparison(target_img, background_img)
 
-    def set_ranges(self, charset_range: Union[int, str, List[str]]) -> None:
+    async def classification_async(self, img: ImageInput,
+                                   png_fix: bool = False, probability: bool = False,
+                                   color_filter_colors: Optional[List[str]] = None,
+                                   color_filter_custom_ranges: Optional[
+                                       List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None,
+                                   probability_mode: str = 'compact', top_k: int = 5,
+                                   charset_range: Optional[CharsetRangeInput] = None
+                                   ) -> Union[str, Dict[str, Any]]:
+        """
+        异步OCR识别方法，在线程池中执行 classification
+
+        Args:
+            参数与 classification 相同
+
+        Returns:
+            识别结果文本或包含概率信息的字典
+
+        Raises:
+            DDDDOCRError: 当功能未启用或识别失败时
+        """
+        return await self._run_in_executor(
+            self.classification, img,
+            png_fix=png_fix,
+            probability=probability,
+            color_filter_colors=color_filter_colors,
+            color_filter_custom_ranges=color_filter_custom_ranges,
+            probability_mode=probability_mode,
+            top_k=top_k,
+            charset_range=charset_range
+        )
+
+    async def detection_async(self, img: ImageInput, input_size: Optional[Tuple[int, int]] = None,
+                              nms_thr: Optional[float] = None,
+                              score_thr: Optional[float] = None) -> List[List[int]]:
+        """
+        异步目标检测方法，在线程池中执行 detection
+
+        Args:
+            参数与 detection 相同
+
+        Returns:
+            检测到的边界框列表
+
+        Raises:
+            DDDDOCRError: 当功能未启用或检测失败时
+        """
+        return await self._run_in_executor(self.detection, img, input_size=input_size,
+                                           nms_thr=nms_thr, score_thr=score_thr)
+
+    async def slide_match_async(self, target_img: ImageInput,
+                                background_img: ImageInput,
+                                simple_target: bool = False) -> Dict[str, Any]:
+        """
+        异步滑块匹配方法，在线程池中执行 slide_match
+
+        Args:
+            target_img: 滑块图片
+            background_img: 背景图片
+            simple_target: 是否为简单滑块
+
+        Returns:
+            匹配结果字典
+
+        Raises:
+            DDDDOCRError: 当匹配失败时
+        """
+        return await self._run_in_executor(self.slide_match, target_img, background_img, simple_target)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        获取线程池，首次调用时创建
+
+        Returns:
+            线程池
+        """
+        executor = self._executor
+        if executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='ddddocr')
+                executor = self._executor
+        return executor
+
+    async def _run_in_executor(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在线程池中执行同步方法
+
+        Args:
+            func: 同步方法
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            方法的返回值
+        """
+        loop = asyncio.get_running_loop()
+        # 在调用方的上下文副本中执行，使 collect_stages 等上下文变量在线程池中同样生效
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(),
+                                          functools.partial(context.run, func, *args, **kwargs))
+
+    def set_ranges(self, charset_range: CharsetRangeInput) -> None:
         """
         设置字符集范围
+
+        设置的范围对之后所有未指定 charset_range 的调用生效；
+        并发调用时应改为在每次调用中传入 charset_range
         
         Args:
             charset_range: 字符集范围参数
@@ -229,6 +737,20 @@ class DdddOcr:
 
         return self.ocr_engine.get_charset()
 
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        获取识别结果缓存的统计信息
+
+        Returns:
+            命中、未命中次数等统计信息，未开启缓存时返回None
+        """
+        return self.result_cache.get_stats() if self.result_cache is not None else None
+
+    def clear_cache(self) -> None:
+        """清空识别结果缓存"""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
     def switch_device(self, use_gpu: bool, device_id: int = 0) -> None:
         """
         切换计算设备
@@ -244,9 +766,15 @@ class DdddOcr:
         if self.ocr_engine:
             self.ocr_engine.switch_device(use_gpu, device_id)
 
+        if self._cascade_engine:
+            self._cascade_engine.switch_device(use_gpu, device_id)
+
         if self.detection_engine:
             self.detection_engine.switch_device(use_gpu, device_id)
 
+        if self._pipeline:
+            self._pipeline.ocr_engine.switch_device(use_gpu, device_id)
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         获取模型信息
@@ -258,7 +786,12 @@ class DdddOcr:
             'ocr_enabled': self.ocr_enabled,
             'det_enabled': self.det_enabled,
             'use_gpu': self.use_gpu,
-            'device_id': self.device_id
+            'device_id': self.device_id,
+            'quantized': self.quantized,
+            'preprocess_mode': self.preprocess_mode,
+            'max_workers': self.max_workers,
+            'cache': self.get_cache_stats(),
+            'session_config': self.session_config.to_dict() if self.session_config else None
         }
 
         if self.ocr_engine:
@@ -271,12 +804,26 @@ class DdddOcr:
 
     def cleanup(self) -> None:
         """清理所有资源"""
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            # 不等待正在执行的任务，避免在析构时阻塞
+            executor.shutdown(wait=False)
+            self._executor = None
+
         if self.ocr_engine:
             self.ocr_engine.cleanup()
 
+        cascade_engine = getattr(self, '_cascade_engine', None)
+        if cascade_engine:
+            cascade_engine.cleanup()
+
         if self.detection_engine:
             self.detection_engine.cleanup()
 
+        pipeline = getattr(self, '_pipeline', None)
+        if pipeline:
+            pipeline.ocr_engine.cleanup()
+
         if self.slide_engine:
             self.slide_engine.cleanup()
 
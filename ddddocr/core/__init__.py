@@ -7,11 +7,16 @@
 from .base import BaseEngine
 from .detection_engine import DetectionEngine
 from .ocr_engine import OCREngine
+from .ocr_pool import OCRPool
+from .pipeline import DetectClassifyPipeline, detect_and_classify
 from .slide_engine import SlideEngine
 
 __all__ = [
     'BaseEngine',
     'OCREngine',
+    'OCRPool',
     'DetectionEngine',
-    'SlideEngine'
+    'SlideEngine',
+    'DetectClassifyPipeline',
+    'detect_and_classify'
 ]
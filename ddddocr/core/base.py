@@ -5,28 +5,41 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
-
-import onnxruntime
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
 
 from ..models.model_loader import ModelLoader
+from ..models.session_config import SessionConfig
+from ..utils.instrumentation import StageListener, stage_timer
+from ..utils.result_cache import ResultCache
+
+if TYPE_CHECKING:
+    # 仅用于类型注解，运行时onnxruntime由 lazy_import 延迟加载
+    import onnxruntime
 
 
 class BaseEngine(ABC):
     """基础引擎抽象类"""
 
-    def __init__(self, use_gpu: bool = False, device_id: int = 0):
+    # 阶段计时监听器，使用不可变元组并在修改时整体替换，推理线程读取时无需加锁
+    _stage_listeners: Tuple[StageListener, ...] = ()
+
+    # 识别结果缓存，默认关闭（见 enable_cache）
+    result_cache: Optional[ResultCache] = None
+
+    def __init__(self, use_gpu: bool = False, device_id: int = 0,
+                 session_config: Optional[SessionConfig] = None):
         """
         初始化基础引擎
         
         Args:
             use_gpu: 是否使用GPU
             device_id: GPU设备ID
+            session_config: onnxruntime会话配置
         """
         self.use_gpu = use_gpu
         self.device_id = device_id
-        self.model_loader = ModelLoader(use_gpu, device_id)
-        self.session: Optional[onnxruntime.InferenceSession] = None
+        self.model_loader = ModelLoader(use_gpu, device_id, session_config)
+        self.session: Optional['onnxruntime.InferenceSession'] = None
         self.is_initialized = False
 
     @abstractmethod
@@ -89,19 +102,98 @@ class BaseEngine(ABC):
             self.device_id = device_id
             self.model_loader.switch_provider(use_gpu, device_id)
 
-            # 如果已经初始化，需要重新加载模型
+            # 如果已经初始化，需要释放旧会话并重新加载模型
             if self.is_initialized:
+                self._release_session()
                 self._reload_model()
 
+    def enable_cache(self, max_size: int = 1024, ttl: Optional[float] = None,
+                     cache: Optional[ResultCache] = None) -> ResultCache:
+        """
+        开启识别结果缓存
+
+        缓存键为图片内容的哈希加上全部识别参数和模型标识，同一个缓存可以在多个引擎之间共享。
+
+        Args:
+            max_size: 最多缓存的结果数
+            ttl: 结果的有效期（秒），为None时不过期
+            cache: 使用已有的缓存，指定时忽略max_size和ttl
+
+        Returns:
+            使用的缓存
+        """
+        self.result_cache = cache if cache is not None else ResultCache(max_size, ttl)
+        return self.result_cache
+
+    def disable_cache(self) -> None:
+        """关闭识别结果缓存"""
+        self.result_cache = None
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            命中、未命中次数等统计信息，未开启缓存时返回None
+        """
+        cache = self.result_cache
+        return cache.get_stats() if cache is not None else None
+
+    def _cache_model_id(self) -> Hashable:
+        """
+        缓存键中的模型标识，加载不同模型（或同一模型的不同配置）的引擎必须返回不同的值
+
+        Returns:
+            可哈希的模型标识
+        """
+        return (self.__class__.__name__,)
+
+    def add_stage_listener(self, listener: StageListener) -> None:
+        """
+        注册阶段计时监听器
+
+        监听器在推理线程中同步调用，参数为 StageRecord，应尽量轻量（如写日志或累加指标）。
+
+        Args:
+            listener: 监听器
+        """
+        self._stage_listeners = self._stage_listeners + (listener,)
+
+    def remove_stage_listener(self, listener: StageListener) -> None:
+        """
+        移除阶段计时监听器
+
+        Args:
+            listener: 已注册的监听器
+        """
+        self._stage_listeners = tuple(item for item in self._stage_listeners if item != listener)
+
+    def _stage(self, name: str):
+        """
+        创建阶段计时上下文，未启用收集器和监听器时返回共享的空阶段
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            上下文管理器
+        """
+        return stage_timer(self.__class__.__name__, name, self._stage_listeners)
+
     def _reload_model(self) -> None:
         """重新加载模型（子类可重写）"""
         pass
 
-    def cleanup(self) -> None:
-        """清理资源"""
+    def _release_session(self) -> None:
+        """将当前会话归还给模型注册表"""
         if self.session:
-            del self.session
+            self.model_loader.release_session(self.session)
             self.session = None
+
+    def cleanup(self) -> None:
+        """清理资源（共享会话仍保留在模型注册表中，可通过注册表显式驱逐）"""
+        if getattr(self, 'session', None):
+            self._release_session()
         self.is_initialized = False
 
     def __del__(self):
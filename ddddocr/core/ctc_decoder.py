@@ -0,0 +1,234 @@
+# coding=utf-8
+"""
+CTC解码模块
+提供基于NumPy的向量化CTC贪心解码，支持批量输出
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def constrained_argmax(logits: np.ndarray, valid_mask: Optional[np.ndarray] = None,
+                       valid_indices: Optional[np.ndarray] = None,
+                       slice_ratio: float = 0.5) -> np.ndarray:
+    """
+    在字符集范围内沿最后一维求argmax
+
+    候选类别较少时直接切出候选列再求argmax（计算量与候选数成正比），
+    否则将范围外的类别置为负无穷后求argmax。
+
+    Args:
+        logits: 最后一维为类别的模型输出
+        valid_mask: 字符集范围布尔掩码，为None时不做限制
+        valid_indices: 升序排列的候选索引数组（应包含blank）
+        slice_ratio: 候选数不超过类别数的该比例时采用切片方式
+
+    Returns:
+        去掉最后一维的索引数组，索引均落在字符集范围内
+    """
+    if valid_mask is None:
+        return np.argmax(logits, axis=-1)
+
+    num_classes = logits.shape[-1]
+    if valid_indices is None:
+        valid_indices = np.flatnonzero(valid_mask)
+    if valid_indices[-1] >= num_classes:
+        valid_indices = valid_indices[valid_indices < num_classes]
+
+    if len(valid_indices) <= num_classes * slice_ratio:
+        return valid_indices[np.argmax(logits[..., valid_indices], axis=-1)]
+
+    mask = np.zeros(num_classes, dtype=bool)
+    mask[valid_indices] = True
+    return np.argmax(np.where(mask, logits, -np.inf), axis=-1)
+
+
+def to_time_major_indices(output: np.ndarray, valid_mask: Optional[np.ndarray] = None,
+                          valid_indices: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    对模型输出做argmax，并统一整理为 (sequence_length, batch_size) 形状的索引数组
+
+    Args:
+        output: 模型输出，支持 (T, B, C)、(1, T, C)、(T, C) 和 (C,) 形状
+        valid_mask: 字符集范围布尔掩码，提供时在范围内求argmax
+        valid_indices: 升序排列的候选索引数组
+
+    Returns:
+        形状为 (T, B) 的索引数组
+    """
+    if output.ndim == 3 and output.shape[1] != 1 and output.shape[0] == 1:
+        # (1, sequence_length, num_classes)
+        output = output[0][:, None, :]
+
+    indices = constrained_argmax(output, valid_mask, valid_indices)
+    if indices.ndim == 2:
+        # (sequence_length, batch_size, num_classes)
+        return indices
+
+    # 单字符输出或2D序列输出
+    return np.atleast_1d(indices).reshape(-1, 1)
+
+
+def ctc_keep_mask(indices: np.ndarray, valid_mask: Optional[np.ndarray] = None,
+                  num_classes: Optional[int] = None, blank: int = 0) -> np.ndarray:
+    """
+    计算CTC解码后需要保留的位置
+
+    规则：去除连续重复、去除blank、去除超出字符集或不在字符集范围内的索引。
+
+    Args:
+        indices: 形状为 (T,) 或 (T, B) 的索引数组
+        valid_mask: 字符集范围布尔掩码，为None时不做范围限制
+        num_classes: 字符集大小，超出该值的索引将被丢弃
+        blank: blank字符索引
+
+    Returns:
+        与indices形状相同的布尔数组
+    """
+    keep = indices != blank
+    if len(indices) > 1:
+        # 沿时间轴做游程折叠：只保留与前一时间步不同的索引
+        keep[1:] &= indices[1:] != indices[:-1]
+
+    if num_classes is not None:
+        keep &= indices < num_classes
+
+    if valid_mask is not None:
+        in_mask = indices < len(valid_mask)
+        keep &= in_mask
+        keep[in_mask] &= valid_mask[indices[in_mask]]
+
+    return keep
+
+
+def ctc_greedy_decode(indices: np.ndarray, valid_mask: Optional[np.ndarray] = None,
+                      num_classes: Optional[int] = None, blank: int = 0) -> np.ndarray:
+    """
+    单序列CTC贪心解码
+
+    Args:
+        indices: 形状为 (T,) 的argmax索引数组
+        valid_mask: 字符集范围布尔掩码
+        num_classes: 字符集大小
+        blank: blank字符索引
+
+    Returns:
+        解码后的索引数组
+    """
+    indices = np.asarray(indices).reshape(-1)
+    if indices.size == 0:
+        return indices
+    return indices[ctc_keep_mask(indices, valid_mask, num_classes, blank)]
+
+
+def ctc_greedy_decode_batch(indices: np.ndarray, valid_mask: Optional[np.ndarray] = None,
+                            num_classes: Optional[int] = None, blank: int = 0,
+                            lengths: Optional[np.ndarray] = None) -> List[np.ndarray]:
+    """
+    批量CTC贪心解码
+
+    Args:
+        indices: 形状为 (T, B) 的argmax索引数组
+        valid_mask: 字符集范围布尔掩码
+        num_classes: 字符集大小
+        blank: blank字符索引
+        lengths: 每个样本的有效时间步数（用于宽度填充后的批量输出），为None时使用全部时间步
+
+    Returns:
+        每个样本解码后的索引数组列表
+    """
+    if indices.size == 0:
+        return [indices[:, b] for b in range(indices.shape[1])]
+
+    keep = ctc_keep_mask(indices, valid_mask, num_classes, blank)
+    if lengths is not None:
+        keep &= np.arange(indices.shape[0])[:, None] < np.asarray(lengths)[None, :]
+
+    # 转为 (B, T) 后一次性取出所有保留的索引，再按样本切分
+    keep_bt = keep.T
+    flat = indices.T[keep_bt]
+    counts = keep_bt.sum(axis=1)
+    return np.split(flat, np.cumsum(counts)[:-1])
+
+
+def ctc_greedy_decode_with_scores(indices: np.ndarray, step_scores: np.ndarray,
+                                  valid_mask: Optional[np.ndarray] = None,
+                                  num_classes: Optional[int] = None,
+                                  blank: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    单序列CTC贪心解码，同时给出每个解码字符的置信度
+
+    字符置信度取其所在连续重复片段内各时间步得分的最大值。
+
+    Args:
+        indices: 形状为 (T,) 的argmax索引数组
+        step_scores: 形状为 (T,) 的每个时间步所选类别的概率
+        valid_mask: 字符集范围布尔掩码
+        num_classes: 字符集大小
+        blank: blank字符索引
+
+    Returns:
+        (解码后的索引数组, 对应的字符置信度数组)
+    """
+    indices = np.asarray(indices).reshape(-1)
+    step_scores = np.asarray(step_scores).reshape(-1)
+    if indices.size == 0:
+        return indices, step_scores[:0]
+
+    keep = ctc_keep_mask(indices, valid_mask, num_classes, blank)
+
+    # 每个连续重复片段的起点，保留的位置必然是片段起点
+    run_starts = np.flatnonzero(np.concatenate(([True], indices[1:] != indices[:-1])))
+    run_scores = np.maximum.reduceat(step_scores, run_starts)
+    kept = keep[run_starts]
+    return indices[run_starts][kept], run_scores[kept]
+
+
+def top_k_classes(probabilities: np.ndarray, k: int,
+                  valid_indices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    求每个时间步概率最高的k个类别
+
+    Args:
+        probabilities: 形状为 (T, C) 的概率数组
+        k: 每个时间步返回的类别数，超过候选数时取候选数
+        valid_indices: 升序排列的候选索引数组，为None时在全部类别中选取
+
+    Returns:
+        (形状为 (T, k) 的类别索引, 形状为 (T, k) 的概率)，按概率降序排列
+    """
+    num_classes = probabilities.shape[-1]
+    if valid_indices is not None:
+        valid_indices = valid_indices[valid_indices < num_classes]
+        candidates = probabilities[:, valid_indices]
+    else:
+        candidates = probabilities
+
+    k = max(1, min(k, candidates.shape[1]))
+    # 先用argpartition取出前k个，再只对这k个排序
+    top = np.argpartition(-candidates, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(candidates, top, axis=1)
+    order = np.argsort(-values, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+
+    if valid_indices is not None:
+        top = valid_indices[top]
+    return top, values
+
+
+def indices_to_text(indices: np.ndarray, charset_array: np.ndarray) -> str:
+    """
+    将解码后的索引转换为文本
+
+    Args:
+        indices: 解码后的索引数组
+        charset_array: 字符集的numpy对象数组
+
+    Returns:
+        识别文本
+    """
+    if len(indices) == 0:
+        return ''
+    return ''.join(charset_array[indices])
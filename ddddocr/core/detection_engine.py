@@ -4,32 +4,98 @@
 提供目标检测功能
 """
 
-from typing import Union, List
+import base64
+import functools
+import os
+import pathlib
+import threading
+from typing import Hashable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from PIL import Image
 
 from .base import BaseEngine
-from ..utils.exceptions import ModelLoadError, ImageProcessError, safe_import_opencv
-from ..utils.image_io import load_image_from_input
+from ..models.session_config import SessionConfig
+from ..utils.exceptions import ModelLoadError, ImageProcessError
+from ..utils.image_io import ImageInput, load_array_from_input, load_image_from_input
+from ..utils.lazy_import import cv2
+from ..utils.result_cache import image_digest
 from ..utils.validators import validate_image_input
 
-# 安全导入OpenCV
-cv2 = safe_import_opencv()
+# 默认检测输入尺寸 (高, 宽)
+DEFAULT_INPUT_SIZE = (416, 416)
+
+# 默认NMS阈值和置信度阈值
+DEFAULT_NMS_THR = 0.45
+DEFAULT_SCORE_THR = 0.1
+
+# YOLOX最大下采样步长，输入尺寸必须是它的整数倍
+_MAX_STRIDE = 32
+
+# letterbox填充值
+_PAD_VALUE = 114
+
+
+@functools.lru_cache(maxsize=16)
+def _yolox_grids(height: int, width: int, p6: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算YOLOX输出解码使用的网格坐标和步长，相同输入尺寸只计算一次
+
+    Args:
+        height: 输入高度
+        width: 输入宽度
+        p6: 是否包含步长64的输出层
+
+    Returns:
+        (网格坐标 (1, N, 2), 步长 (1, N, 1))，均为只读的float32数组
+    """
+    strides = [8, 16, 32, 64] if p6 else [8, 16, 32]
+    grids = []
+    expanded_strides = []
+    for stride in strides:
+        xv, yv = np.meshgrid(np.arange(width // stride), np.arange(height // stride))
+        grid = np.stack((xv, yv), 2).reshape(1, -1, 2)
+        grids.append(grid)
+        expanded_strides.append(np.full((*grid.shape[:2], 1), stride))
+    grids = np.concatenate(grids, 1).astype(np.float32)
+    expanded_strides = np.concatenate(expanded_strides, 1).astype(np.float32)
+    grids.flags.writeable = False
+    expanded_strides.flags.writeable = False
+    return grids, expanded_strides
 
 
 class DetectionEngine(BaseEngine):
     """目标检测引擎"""
 
-    def __init__(self, use_gpu: bool = False, device_id: int = 0):
+    def __init__(self, use_gpu: bool = False, device_id: int = 0,
+                 session_config: Optional[SessionConfig] = None, quantized: bool = False,
+                 input_size: Tuple[int, int] = DEFAULT_INPUT_SIZE,
+                 nms_thr: float = DEFAULT_NMS_THR, score_thr: float = DEFAULT_SCORE_THR):
         """
         初始化检测引擎
 
         Args:
             use_gpu: 是否使用GPU
             device_id: GPU设备ID
+            session_config: onnxruntime会话配置
+            quantized: 是否使用INT8量化模型（需先通过 python -m ddddocr quantize 生成）
+            input_size: 模型输入尺寸 (高, 宽)，必须是32的倍数。较小的尺寸速度更快，
+                但小目标的召回率会下降；输入尺寸固定的模型只能使用导出时的尺寸
+            nms_thr: NMS的IoU阈值
+            score_thr: 置信度阈值，低于该值的框被丢弃
+
+        Raises:
+            ImageProcessError: 当参数无效时
+            ModelLoadError: 当模型加载失败或模型不支持指定的输入尺寸时
         """
-        super().__init__(use_gpu, device_id)
+        super().__init__(use_gpu, device_id, session_config)
+        self.quantized = quantized
+        self.input_size = self._validate_input_size(input_size)
+        self.nms_thr, self.score_thr = self._validate_thresholds(nms_thr, score_thr)
+        # 模型声明的固定输入尺寸 (高, 宽)，动态尺寸的模型为None
+        self.model_input_size: Optional[Tuple[int, int]] = None
+        # 每个线程复用的letterbox画布和模型输入缓冲区
+        self._local = threading.local()
         self.initialize()
 
     def initialize(self, **kwargs) -> None:
@@ -41,24 +107,32 @@ class DetectionEngine(BaseEngine):
         """
         try:
             # 加载检测模型
-            self.session = self.model_loader.load_detection_model()
+            self.session = self.model_loader.load_detection_model(self.quantized)
+            height, width = self.session.get_inputs()[0].shape[2:4]
+            if isinstance(height, int) and isinstance(width, int):
+                self.model_input_size = (height, width)
+            self._check_model_input_size(self.input_size)
             self.is_initialized = True
 
         except Exception as e:
             raise ModelLoadError(f"检测引擎初始化失败: {str(e)}") from e
 
-    def predict(self, image: Union[bytes, str, Image.Image]) -> List[List[int]]:
+    def predict(self, image: ImageInput, input_size: Optional[Tuple[int, int]] = None,
+                nms_thr: Optional[float] = None, score_thr: Optional[float] = None) -> List[List[int]]:
         """
         执行目标检测
 
         Args:
             image: 输入图像
+            input_size: 本次调用的模型输入尺寸 (高, 宽)，为None时使用引擎的设置
+            nms_thr: 本次调用的NMS阈值，为None时使用引擎的设置
+            score_thr: 本次调用的置信度阈值，为None时使用引擎的设置
 
         Returns:
             检测到的边界框列表，每个边界框格式为[x1, y1, x2, y2]
 
         Raises:
-            ImageProcessError: 当图像处理失败时
+            ImageProcessError: 当参数无效或图像处理失败时
             ModelLoadError: 当模型未初始化时
         """
         if not self.is_ready():
@@ -66,88 +140,436 @@ class DetectionEngine(BaseEngine):
 
         # 验证输入
         validate_image_input(image)
+        input_size, nms_thr, score_thr = self._resolve_params(input_size, nms_thr, score_thr)
+
+        cache = self.result_cache
+        if cache is not None:
+            digest, image = image_digest(image)
+            cache_key = (self._cache_model_id(), digest, input_size, nms_thr, score_thr)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
-            # 直接使用原始的get_bbox方法
-            if isinstance(image, bytes):
-                return self.get_bbox(image)
-            elif isinstance(image, Image.Image):
-                import io
-                img_bytes = io.BytesIO()
-                image.save(img_bytes, format='PNG')
-                return self.get_bbox(img_bytes.getvalue())
-            else:
-                # 其他类型先转换为PIL Image再处理
-                pil_image = load_image_from_input(image)
-                import io
-                img_bytes = io.BytesIO()
-                pil_image.save(img_bytes, format='PNG')
-                return self.get_bbox(img_bytes.getvalue())
+            # 编码后的图片只解码一次，PIL图像和像素数组直接转换为BGR数组，不再经过PNG编码
+            with self._stage('decode') as stage:
+                img = self.load_image(image)
+                stage.set_size(img.shape)
+            result = self.detect_array(img, input_size, nms_thr, score_thr)
 
         except Exception as e:
             raise ImageProcessError(f"目标检测失败: {str(e)}") from e
 
-    def preproc(self, img, input_size, swap=(2, 0, 1)):
-        """预处理函数（来自原始代码）"""
-        if len(img.shape) == 3:
-            padded_img = np.ones((input_size[0], input_size[1], 3), dtype=np.uint8) * 114
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def predict_batch(self, images: Sequence[ImageInput], input_size: Optional[Tuple[int, int]] = None,
+                      nms_thr: Optional[float] = None, score_thr: Optional[float] = None,
+                      max_batch_size: int = 32) -> List[List[List[int]]]:
+        """
+        批量执行目标检测
+
+        所有图像letterbox到同一个输入中执行一次推理（超过max_batch_size时分批），
+        每张图片的结果与单独调用 predict 一致。
+
+        Args:
+            images: 输入图像序列
+            input_size: 模型输入尺寸 (高, 宽)，为None时使用引擎的设置
+            nms_thr: NMS阈值，为None时使用引擎的设置
+            score_thr: 置信度阈值，为None时使用引擎的设置
+            max_batch_size: 单次推理的最大图像数
+
+        Returns:
+            与输入顺序一致的边界框列表
+
+        Raises:
+            ImageProcessError: 当参数无效或图像处理失败时
+            ModelLoadError: 当模型未初始化时
+        """
+        if not self.is_ready():
+            raise ModelLoadError("检测引擎未初始化")
+
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ImageProcessError("max_batch_size必须为正整数")
+        for image in images:
+            validate_image_input(image)
+        input_size, nms_thr, score_thr = self._resolve_params(input_size, nms_thr, score_thr)
+
+        cache = self.result_cache
+        if cache is None:
+            return self._predict_batch(images, input_size, nms_thr, score_thr, max_batch_size)
+
+        # 只检测未命中缓存的图像
+        results: List[List[List[int]]] = [[] for _ in images]
+        pending_indices, pending_images, pending_keys = [], [], []
+        model_id = self._cache_model_id()
+        for index, image in enumerate(images):
+            digest, image = image_digest(image)
+            cache_key = (model_id, digest, input_size, nms_thr, score_thr)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending_indices.append(index)
+                pending_images.append(image)
+                pending_keys.append(cache_key)
+
+        if pending_images:
+            pending_results = self._predict_batch(pending_images, input_size, nms_thr, score_thr, max_batch_size)
+            for index, cache_key, result in zip(pending_indices, pending_keys, pending_results):
+                cache.put(cache_key, result)
+                results[index] = result
+
+        return results
+
+    def _predict_batch(self, images: Sequence[ImageInput], input_size: Tuple[int, int], nms_thr: float,
+                       score_thr: float, max_batch_size: int) -> List[List[List[int]]]:
+        """
+        批量检测（不经过缓存），参数含义见 predict_batch
+
+        Returns:
+            与输入顺序一致的边界框列表
+
+        Raises:
+            ImageProcessError: 当图像处理失败时
+        """
+        try:
+            decoded = []
+            for image in images:
+                with self._stage('decode') as stage:
+                    img = self.load_image(image)
+                    stage.set_size(img.shape)
+                decoded.append(img)
+            return self.detect_arrays(decoded, input_size, nms_thr, score_thr, max_batch_size)
+
+        except Exception as e:
+            raise ImageProcessError(f"批量目标检测失败: {str(e)}") from e
+
+    def _resolve_params(self, input_size: Optional[Tuple[int, int]], nms_thr: Optional[float],
+                        score_thr: Optional[float]) -> Tuple[Tuple[int, int], float, float]:
+        """
+        合并单次调用的检测参数和引擎的设置
+
+        Args:
+            input_size: 模型输入尺寸 (高, 宽)，为None时使用引擎的设置
+            nms_thr: NMS阈值，为None时使用引擎的设置
+            score_thr: 置信度阈值，为None时使用引擎的设置
+
+        Returns:
+            (输入尺寸, NMS阈值, 置信度阈值)
+
+        Raises:
+            ImageProcessError: 当参数无效或模型不支持指定的输入尺寸时
+        """
+        if input_size is None:
+            input_size = self.input_size
         else:
-            padded_img = np.ones(input_size, dtype=np.uint8) * 114
-        r = min(input_size[0] / img.shape[0], input_size[1] / img.shape[1])
-        resized_img = cv2.resize(
-            img,
-            (int(img.shape[1] * r), int(img.shape[0] * r)),
-            interpolation=cv2.INTER_LINEAR,
-        ).astype(np.uint8)
-        padded_img[: int(img.shape[0] * r), : int(img.shape[1] * r)] = resized_img
-        padded_img = padded_img.transpose(swap)
-        padded_img = np.ascontiguousarray(padded_img, dtype=np.float32)
+            input_size = self._validate_input_size(input_size)
+            self._check_model_input_size(input_size)
+        return (input_size,) + self._validate_thresholds(
+            self.nms_thr if nms_thr is None else nms_thr,
+            self.score_thr if score_thr is None else score_thr
+        )
+
+    @staticmethod
+    def _validate_input_size(input_size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        验证模型输入尺寸
+
+        Args:
+            input_size: 输入尺寸 (高, 宽)，也可以是单个整数表示正方形输入
+
+        Returns:
+            (高, 宽) 元组
+
+        Raises:
+            ImageProcessError: 当尺寸不是32的正整数倍时
+        """
+        if isinstance(input_size, int):
+            input_size = (input_size, input_size)
+        try:
+            height, width = input_size
+        except (TypeError, ValueError) as e:
+            raise ImageProcessError(f"检测输入尺寸必须为 (高, 宽)，实际为: {input_size!r}") from e
+        for value in (height, width):
+            if not isinstance(value, (int, np.integer)) or value <= 0 or value % _MAX_STRIDE:
+                raise ImageProcessError(f"检测输入尺寸必须是{_MAX_STRIDE}的正整数倍，实际为: {input_size!r}")
+        return int(height), int(width)
+
+    @staticmethod
+    def _validate_thresholds(nms_thr: float, score_thr: float) -> Tuple[float, float]:
+        """
+        验证NMS阈值和置信度阈值
+
+        Args:
+            nms_thr: NMS阈值，取值范围 (0, 1]
+            score_thr: 置信度阈值，取值范围 [0, 1)
+
+        Returns:
+            (NMS阈值, 置信度阈值)
+
+        Raises:
+            ImageProcessError: 当阈值超出范围时
+        """
+        if not 0 < nms_thr <= 1:
+            raise ImageProcessError(f"nms_thr必须在(0, 1]范围内，实际为: {nms_thr}")
+        if not 0 <= score_thr < 1:
+            raise ImageProcessError(f"score_thr必须在[0, 1)范围内，实际为: {score_thr}")
+        return float(nms_thr), float(score_thr)
+
+    def _check_model_input_size(self, input_size: Tuple[int, int]) -> None:
+        """
+        检查模型是否支持指定的输入尺寸
+
+        Args:
+            input_size: 输入尺寸 (高, 宽)
+
+        Raises:
+            ImageProcessError: 当模型的输入尺寸固定且与指定尺寸不同时
+        """
+        if self.model_input_size is not None and input_size != self.model_input_size:
+            raise ImageProcessError(
+                f"当前检测模型的输入尺寸固定为{self.model_input_size[0]}×{self.model_input_size[1]}，"
+                f"不支持{input_size[0]}×{input_size[1]}，请使用以动态输入尺寸导出的模型"
+            )
+
+    def _cache_model_id(self) -> Hashable:
+        """
+        缓存键中的模型标识
+
+        Returns:
+            (引擎名称, 是否使用量化模型)
+        """
+        return (self.__class__.__name__, self.quantized)
+
+    def load_image(self, image: ImageInput, keep_alpha: bool = False) -> np.ndarray:
+        """
+        将输入图像转换为检测使用的BGR uint8数组
+
+        字节、文件路径和base64字符串用OpenCV解码（OpenCV不支持的格式交给PIL）；
+        PIL图像和像素数组（按RGB/RGBA解释）直接转换，结果与编码为PNG后再解码一致。
+
+        EXIF方向与历史版本保持一致：bytes输入与 get_bbox 相同，按EXIF方向旋转；
+        文件路径、base64字符串、bytearray和memoryview历史上经过PIL加载，不旋转。
+
+        Args:
+            image: 输入图像
+            keep_alpha: 是否保留透明通道；为True且输入带透明通道时返回 (H, W, 4) 的BGRA数组
+
+        Returns:
+            形状为 (H, W, 3) 的BGR数组，或保留透明通道时形状为 (H, W, 4) 的BGRA数组
+
+        Raises:
+            ImageProcessError: 当图像加载失败时
+        """
+        if isinstance(image, bytes):
+            return self.decode_bytes(image, keep_alpha=keep_alpha)
+        if isinstance(image, bytearray) or (isinstance(image, memoryview) and image.ndim == 1):
+            return self.decode_bytes(image, ignore_orientation=True, keep_alpha=keep_alpha)
+        if isinstance(image, pathlib.PurePath) or (isinstance(image, str) and os.path.exists(image)):
+            with open(image, 'rb') as fp:
+                return self.decode_bytes(fp.read(), ignore_orientation=True, keep_alpha=keep_alpha)
+        if isinstance(image, str):
+            try:
+                data = base64.b64decode(image)
+            except Exception as e:
+                raise ImageProcessError(f"base64图片解码失败: {str(e)}") from e
+            return self.decode_bytes(data, ignore_orientation=True, keep_alpha=keep_alpha)
+        # 与OCR预处理一致，PIL图像只有RGBA模式保留透明通道
+        if keep_alpha and (not isinstance(image, Image.Image) or image.mode == 'RGBA'):
+            array = load_array_from_input(image, None)
+            if array.ndim == 3 and array.shape[2] == 4:
+                return cv2.cvtColor(array, cv2.COLOR_RGBA2BGRA)
+        return cv2.cvtColor(load_array_from_input(image, 'RGB'), cv2.COLOR_RGB2BGR)
+
+    @staticmethod
+    def decode_bytes(data: Union[bytes, bytearray, memoryview], ignore_orientation: bool = False,
+                     keep_alpha: bool = False) -> np.ndarray:
+        """
+        将编码后的图片解码为BGR uint8数组
+
+        Args:
+            data: 编码后的图片数据
+            ignore_orientation: 是否忽略JPEG的EXIF方向（与PIL加载的结果一致）；
+                为False时与OpenCV默认行为一致，按EXIF方向旋转
+            keep_alpha: 是否保留透明通道；为True且图片带透明通道时返回BGRA数组
+
+        Returns:
+            形状为 (H, W, 3) 的BGR数组，或保留透明通道时形状为 (H, W, 4) 的BGRA数组
+
+        Raises:
+            ImageProcessError: 当解码失败时
+        """
+        buffer = np.frombuffer(data, np.uint8)
+        if keep_alpha:
+            # 带透明通道的图片（PNG、WebP等）才按原样解码，其余仍走下面的彩色解码以保持EXIF方向处理不变
+            img = cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+            if img is not None and img.ndim == 3 and img.shape[2] == 4:
+                # 16位PNG在IMREAD_UNCHANGED下保留原始位深
+                return (img >> 8).astype(np.uint8) if img.dtype == np.uint16 else img
+            if img is None:
+                pil_image = load_image_from_input(bytes(data))
+                if pil_image.mode == 'RGBA':
+                    return cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGBA2BGRA)
+
+        flags = cv2.IMREAD_COLOR | (cv2.IMREAD_IGNORE_ORIENTATION if ignore_orientation else 0)
+        img = cv2.imdecode(buffer, flags)
+        if img is None:
+            # OpenCV不支持的格式（如GIF）交给PIL解码
+            img = cv2.cvtColor(load_array_from_input(bytes(data), 'RGB'), cv2.COLOR_RGB2BGR)
+        return img
+
+    def preproc(self, img, input_size, swap=(2, 0, 1)):
+        """预处理函数（来自原始代码），返回新分配的数组；检测流程内部使用 letterbox"""
+        blob, r = self.letterbox(img, input_size, reuse_buffer=False)
+        padded_img = blob[0]
+        if tuple(swap) != (2, 0, 1):
+            padded_img = np.ascontiguousarray(padded_img.transpose(1, 2, 0).transpose(swap))
         return padded_img, r
 
-    def demo_postprocess(self, outputs, img_size, p6=False):
-        """后处理函数（来自原始代码）"""
-        grids = []
-        expanded_strides = []
-        if not p6:
-            strides = [8, 16, 32]
+    def letterbox(self, img: np.ndarray, input_size: Tuple[int, int],
+                  reuse_buffer: bool = True) -> Tuple[np.ndarray, float]:
+        """
+        按比例缩放到输入尺寸内，左上角对齐，其余部分填充114，并转换为模型输入
+
+        Args:
+            img: BGR uint8数组 (H, W, 3)，灰度图 (H, W) 会先转换为三通道
+            input_size: 输入尺寸 (高, 宽)
+            reuse_buffer: 是否使用当前线程复用的缓冲区，结果在同一线程下一次调用前有效
+
+        Returns:
+            (形状为 (1, 3, 高, 宽) 的float32数组, 缩放比例)
+        """
+        height, width = input_size
+        if reuse_buffer:
+            canvas, blob = self._get_buffers(height, width)
         else:
-            strides = [8, 16, 32, 64]
-        hsizes = [img_size[0] // stride for stride in strides]
-        wsizes = [img_size[1] // stride for stride in strides]
-        for hsize, wsize, stride in zip(hsizes, wsizes, strides):
-            xv, yv = np.meshgrid(np.arange(wsize), np.arange(hsize))
-            grid = np.stack((xv, yv), 2).reshape(1, -1, 2)
-            grids.append(grid)
-            shape = grid.shape[:2]
-            expanded_strides.append(np.full((*shape, 1), stride))
-        grids = np.concatenate(grids, 1)
-        expanded_strides = np.concatenate(expanded_strides, 1)
-        outputs[..., :2] = (outputs[..., :2] + grids) * expanded_strides
-        outputs[..., 2:4] = np.exp(outputs[..., 2:4]) * expanded_strides
+            canvas = np.empty((height, width, 3), dtype=np.uint8)
+            blob = np.empty((1, 3, height, width), dtype=np.float32)
+        return blob, self._letterbox_into(img, canvas, blob[0])
+
+    @staticmethod
+    def _letterbox_into(img: np.ndarray, canvas: np.ndarray, out: np.ndarray) -> float:
+        """
+        将图像letterbox到画布上，并以 (3, 高, 宽) float32 格式写入out
+
+        Args:
+            img: BGR uint8数组 (H, W, 3) 或灰度图 (H, W)
+            canvas: (高, 宽, 3) uint8画布
+            out: (3, 高, 宽) float32输出数组
+
+        Returns:
+            缩放比例
+        """
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        height, width = canvas.shape[:2]
+        r = min(height / img.shape[0], width / img.shape[1])
+        resized_height, resized_width = int(img.shape[0] * r), int(img.shape[1] * r)
+        resized = cv2.resize(img, (resized_width, resized_height), interpolation=cv2.INTER_LINEAR)
+
+        # 只重新填充缩放后图像以外的区域
+        canvas[:resized_height, :resized_width] = resized
+        canvas[resized_height:] = _PAD_VALUE
+        canvas[:resized_height, resized_width:] = _PAD_VALUE
+        np.copyto(out, canvas.transpose(2, 0, 1))
+        return r
+
+    def _get_buffers(self, height: int, width: int, batch_size: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取当前线程指定输入尺寸的 (letterbox画布, 模型输入) 缓冲区
+
+        模型输入缓冲区按用过的最大批大小分配，返回前batch_size张的视图
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        pair = buffers.get((height, width))
+        if pair is None or pair[1].shape[0] < batch_size:
+            pair = buffers[(height, width)] = (np.empty((height, width, 3), dtype=np.uint8),
+                                               np.empty((batch_size, 3, height, width), dtype=np.float32))
+        return pair[0], pair[1][:batch_size]
+
+    def demo_postprocess(self, outputs, img_size, p6=False):
+        """后处理函数（来自原始代码），网格和步长按输入尺寸缓存，结果原地写入outputs"""
+        grids, expanded_strides = _yolox_grids(img_size[0], img_size[1], p6)
+        xy = outputs[..., :2]
+        xy += grids
+        xy *= expanded_strides
+        wh = outputs[..., 2:4]
+        np.exp(wh, out=wh)
+        wh *= expanded_strides
         return outputs
 
     def nms(self, boxes, scores, nms_thr):
         """Single class NMS implemented in Numpy."""
+        return self._greedy_nms(boxes, scores.argsort()[::-1], nms_thr)
+
+    def batched_nms(self, boxes: np.ndarray, scores: np.ndarray, image_ids: np.ndarray,
+                    nms_thr: float) -> List[int]:
+        """
+        多张图片的候选框一次完成NMS，不同图片的框互不抑制
+
+        每张图片内的处理顺序与 nms 相同，因此结果与逐张调用 nms 完全一致；
+        每次迭代只与同一张图片剩余的候选框计算IoU。
+
+        Args:
+            boxes: (M, 4) 候选框，按图片顺序排列
+            scores: (M,) 置信度
+            image_ids: (M,) 候选框所属图片的序号，非递减
+            nms_thr: NMS阈值
+
+        Returns:
+            保留的候选框下标，按图片分组，图片内按保留顺序排列
+        """
+        bounds = np.flatnonzero(np.diff(image_ids)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(image_ids)]))
+        order = np.concatenate([scores[start:end].argsort()[::-1] + start for start, end in zip(starts, ends)])
+        return self._greedy_nms(boxes, order, nms_thr, np.repeat(ends, ends - starts))
+
+    @staticmethod
+    def _greedy_nms(boxes: np.ndarray, order: np.ndarray, nms_thr: float,
+                    segment_ends: Optional[np.ndarray] = None) -> List[int]:
+        """
+        按给定顺序执行贪心NMS
+
+        Args:
+            boxes: (M, 4) 候选框
+            order: 处理顺序，同一分组的候选框在其中连续排列
+            nms_thr: NMS阈值
+            segment_ends: 每个候选框所在分组在order中的结束位置，不同分组的框互不抑制；
+                为None时所有框属于同一组
+
+        Returns:
+            保留的候选框下标
+        """
         x1 = boxes[:, 0]
         y1 = boxes[:, 1]
         x2 = boxes[:, 2]
         y2 = boxes[:, 3]
         areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-        order = scores.argsort()[::-1]
+        order = np.array(order)
         keep = []
-        while order.size > 0:
-            i = order[0]
+        # order[lo:]为待处理的候选框，保留下来的框原地移动到所在分组的末尾
+        lo = 0
+        while lo < order.size:
+            i = order[lo]
             keep.append(i)
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
+            end = order.size if segment_ends is None else segment_ends[i]
+            rest = order[lo + 1:end]
+            xx1 = np.maximum(x1[i], x1[rest])
+            yy1 = np.maximum(y1[i], y1[rest])
+            xx2 = np.minimum(x2[i], x2[rest])
+            yy2 = np.minimum(y2[i], y2[rest])
             w = np.maximum(0.0, xx2 - xx1 + 1)
             h = np.maximum(0.0, yy2 - yy1 + 1)
             inter = w * h
-            ovr = inter / (areas[i] + areas[order[1:]] - inter)
-            inds = np.where(ovr <= nms_thr)[0]
-            order = order[inds + 1]
+            ovr = inter / (areas[i] + areas[rest] - inter)
+            survivors = rest[ovr <= nms_thr]
+            lo = end - survivors.size
+            order[lo:end] = survivors
         return keep
 
     def multiclass_nms_class_agnostic(self, boxes, scores, nms_thr, score_thr):
@@ -172,42 +594,151 @@ class DetectionEngine(BaseEngine):
         return self.multiclass_nms_class_agnostic(boxes, scores, nms_thr, score_thr)
 
     def get_bbox(self, image_bytes):
-        """原始的目标检测方法"""
-        img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
-        im, ratio = self.preproc(img, (416, 416))
-        ort_inputs = {self.session.get_inputs()[0].name: im[None, :, :, :]}
-        output = self.session.run(None, ort_inputs)
-        predictions = self.demo_postprocess(output[0], (416, 416))[0]
-        boxes = predictions[:, :4]
-        scores = predictions[:, 4:5] * predictions[:, 5:]
-        boxes_xyxy = np.ones_like(boxes)
-        boxes_xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2.
-        boxes_xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2.
-        boxes_xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2.
-        boxes_xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2.
-        boxes_xyxy /= ratio
-        pred = self.multiclass_nms(boxes_xyxy, scores, nms_thr=0.45, score_thr=0.1)
-        try:
-            final_boxes = pred[:, :4].tolist()
-            result = []
-            for b in final_boxes:
-                if b[0] < 0:
-                    x_min = 0
-                else:
-                    x_min = int(b[0])
-                if b[1] < 0:
-                    y_min = 0
-                else:
-                    y_min = int(b[1])
-                if b[2] > img.shape[1]:
-                    x_max = int(img.shape[1])
-                else:
-                    x_max = int(b[2])
-                if b[3] > img.shape[0]:
-                    y_max = int(img.shape[0])
-                else:
-                    y_max = int(b[3])
-                result.append([x_min, y_min, x_max, y_max])
-        except Exception as e:
-            return []
-        return result
+        """原始的目标检测方法（输入为编码后的图片字节）"""
+        with self._stage('decode') as stage:
+            img = self.decode_bytes(image_bytes)
+            stage.set_size(img.shape)
+        return self.detect_array(img)
+
+    def detect_array(self, img: np.ndarray, input_size: Optional[Tuple[int, int]] = None,
+                     nms_thr: Optional[float] = None, score_thr: Optional[float] = None) -> List[List[int]]:
+        """
+        对已解码的图像执行目标检测
+
+        Args:
+            img: 形状为 (H, W, 3) 的BGR uint8数组
+            input_size: 模型输入尺寸 (高, 宽)，为None时使用引擎的设置
+            nms_thr: NMS阈值，为None时使用引擎的设置
+            score_thr: 置信度阈值，为None时使用引擎的设置
+
+        Returns:
+            边界框列表，每个边界框格式为[x1, y1, x2, y2]
+        """
+        input_size, nms_thr, score_thr = self._resolve_params(input_size, nms_thr, score_thr)
+        with self._stage('preprocess') as stage:
+            blob, ratio = self.letterbox(img, input_size)
+            stage.set_size(blob.shape)
+        ort_inputs = {self.session.get_inputs()[0].name: blob}
+        with self._stage('inference'):
+            output = self.session.run(None, ort_inputs)
+        with self._stage('postprocess'):
+            return self.postprocess_output(output[0], ratio, img.shape, input_size, nms_thr, score_thr)
+
+    def detect_arrays(self, images: Sequence[np.ndarray], input_size: Optional[Tuple[int, int]] = None,
+                      nms_thr: Optional[float] = None, score_thr: Optional[float] = None,
+                      max_batch_size: int = 32) -> List[List[List[int]]]:
+        """
+        对多张已解码的图像批量执行目标检测
+
+        每 max_batch_size 张图像letterbox到同一个 (N, 3, 高, 宽) 输入中，只执行一次推理，
+        后处理和NMS对整批输出一次完成。
+
+        Args:
+            images: BGR uint8数组 (H, W, 3) 序列
+            input_size: 模型输入尺寸 (高, 宽)，为None时使用引擎的设置
+            nms_thr: NMS阈值，为None时使用引擎的设置
+            score_thr: 置信度阈值，为None时使用引擎的设置
+            max_batch_size: 单次推理的最大图像数
+
+        Returns:
+            与输入顺序一致的边界框列表
+        """
+        input_size, nms_thr, score_thr = self._resolve_params(input_size, nms_thr, score_thr)
+        height, width = input_size
+        input_name = self.session.get_inputs()[0].name
+        results: List[List[List[int]]] = []
+        for start in range(0, len(images), max_batch_size):
+            chunk = images[start:start + max_batch_size]
+            with self._stage('preprocess') as stage:
+                canvas, blob = self._get_buffers(height, width, len(chunk))
+                ratios = [self._letterbox_into(img, canvas, blob[index]) for index, img in enumerate(chunk)]
+                stage.set_size(blob.shape)
+            with self._stage('inference'):
+                output = self.session.run(None, {input_name: blob})
+            with self._stage('postprocess'):
+                results.extend(self.postprocess_batch(output[0], ratios, [img.shape for img in chunk],
+                                                      input_size, nms_thr, score_thr))
+        return results
+
+    def postprocess_output(self, output: np.ndarray, ratio: float, image_shape,
+                           input_size: Tuple[int, int] = DEFAULT_INPUT_SIZE,
+                           nms_thr: float = DEFAULT_NMS_THR,
+                           score_thr: float = DEFAULT_SCORE_THR) -> List[List[int]]:
+        """
+        将模型输出转换为原图坐标系下的边界框
+
+        Args:
+            output: 模型输出 (1, N, 5 + 类别数)
+            ratio: 预处理时的缩放比例
+            image_shape: 原图形状 (H, W[, C])
+            input_size: 模型输入尺寸 (高, 宽)
+            nms_thr: NMS阈值
+            score_thr: 置信度阈值
+
+        Returns:
+            边界框列表，每个边界框格式为[x1, y1, x2, y2]
+        """
+        return self.postprocess_batch(output, [ratio], [image_shape], input_size, nms_thr, score_thr)[0]
+
+    def postprocess_batch(self, output: np.ndarray, ratios: Sequence[float], image_shapes: Sequence[Tuple[int, ...]],
+                          input_size: Tuple[int, int] = DEFAULT_INPUT_SIZE,
+                          nms_thr: float = DEFAULT_NMS_THR,
+                          score_thr: float = DEFAULT_SCORE_THR) -> List[List[List[int]]]:
+        """
+        将一批模型输出转换为各自原图坐标系下的边界框
+
+        解码、坐标转换和置信度过滤对整批输出向量化执行（原地写回output），NMS使用 batched_nms 一次完成，
+        每张图片的结果与单独调用 postprocess_output 完全一致。
+
+        Args:
+            output: 模型输出 (B, N, 5 + 类别数)
+            ratios: 每张图片预处理时的缩放比例
+            image_shapes: 每张原图的形状 (H, W[, C])
+            input_size: 模型输入尺寸 (高, 宽)
+            nms_thr: NMS阈值
+            score_thr: 置信度阈值
+
+        Returns:
+            每张图片的边界框列表，每个边界框格式为[x1, y1, x2, y2]
+        """
+        predictions = self.demo_postprocess(output, input_size)
+        scores = predictions[..., 4:5] * predictions[..., 5:]
+
+        # (cx, cy, w, h) -> (x1, y1, x2, y2)，原地写回predictions，只复制中心点坐标
+        boxes_xyxy = predictions[..., :4]
+        centers = boxes_xyxy[..., :2].copy()
+        half = boxes_xyxy[..., 2:4]
+        half *= 0.5
+        np.subtract(centers, half, out=boxes_xyxy[..., :2])
+        np.add(centers, half, out=half)
+        boxes_xyxy /= np.asarray(ratios, dtype=boxes_xyxy.dtype)[:, None, None]
+
+        # 类别无关：每个候选框取得分最高的类别
+        cls_scores = np.take_along_axis(scores, scores.argmax(2)[..., None], 2)[..., 0]
+        image_ids, anchor_ids = np.nonzero(cls_scores > score_thr)
+        results: List[List[List[int]]] = [[] for _ in image_shapes]
+        if image_ids.size == 0:
+            return results
+
+        valid_boxes = boxes_xyxy[image_ids, anchor_ids]
+        keep = np.asarray(self.batched_nms(valid_boxes, cls_scores[image_ids, anchor_ids], image_ids, nms_thr))
+        kept_boxes = valid_boxes[keep].tolist()
+        failed = set()
+        for image_id, box in zip(image_ids[keep].tolist(), kept_boxes):
+            try:
+                results[image_id].append(self._clip_box(box, image_shapes[image_id]))
+            except (ValueError, OverflowError):
+                # 坐标为nan或inf（模型输出溢出）时，与历史行为一致，该图片返回空列表
+                failed.add(image_id)
+        for image_id in failed:
+            results[image_id] = []
+        return results
+
+    @staticmethod
+    def _clip_box(box: List[float], image_shape) -> List[int]:
+        """将边界框裁剪到原图范围内并转换为整数坐标"""
+        x_min = 0 if box[0] < 0 else int(box[0])
+        y_min = 0 if box[1] < 0 else int(box[1])
+        x_max = int(image_shape[1]) if box[2] > image_shape[1] else int(box[2])
+        y_max = int(image_shape[0]) if box[3] > image_shape[0] else int(box[3])
+        return [x_min, y_min, x_max, y_max]
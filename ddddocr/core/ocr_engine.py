@@ -4,26 +4,38 @@ OCR识别引擎
 提供文字识别功能
 """
 
-from typing import Union, List, Optional, Dict, Any, Tuple
+from typing import Union, List, Optional, Dict, Any, Hashable, Sequence, Tuple
 
 import numpy as np
-from PIL import Image
 
 from .base import BaseEngine
+from .ctc_decoder import (constrained_argmax, ctc_greedy_decode, ctc_greedy_decode_batch,
+                          ctc_greedy_decode_with_scores, indices_to_text, to_time_major_indices, top_k_classes)
 from ..models.charset_manager import CharsetManager
+from ..models.charset_range import CharsetRange, CharsetRangeInput, RangeMasks
+from ..models.session_config import SessionConfig
 from ..preprocessing.color_filter import ColorFilter
-from ..preprocessing.image_processor import ImageProcessor
+from ..preprocessing.ocr_preprocessor import OCRPreprocessor
 from ..utils.exceptions import ModelLoadError, ImageProcessError
-from ..utils.image_io import load_image_from_input, png_rgba_black_preprocess
+from ..utils.image_io import ImageInput, load_image_from_input
+from ..utils.result_cache import freeze_param, image_digest
 from ..utils.validators import validate_image_input
 
 
+# 概率输出模式
+PROBABILITY_MODES = ('compact', 'full')
+
+
 class OCREngine(BaseEngine):
     """OCR识别引擎"""
 
     def __init__(self, use_gpu: bool = False, device_id: int = 0,
                  old: bool = False, beta: bool = False,
-                 import_onnx_path: str = "", charsets_path: str = ""):
+                 import_onnx_path: str = "", charsets_path: str = "",
+                 session_config: Optional[SessionConfig] = None, quantized: bool = False,
+                 preprocess_mode: str = 'exact', interpolation: str = 'auto',
+                 tile_threshold: int = 4096, tile_width: int = 512, tile_overlap: int = 64,
+                 tile_batch_size: int = 16):
         """
         初始化OCR引擎
         
@@ -34,11 +46,28 @@ class OCREngine(BaseEngine):
             beta: 是否使用beta版模型
             import_onnx_path: 自定义模型路径
             charsets_path: 自定义字符集路径
+            session_config: onnxruntime会话配置
+            quantized: 是否使用INT8量化模型（需先通过 python -m ddddocr quantize 生成）
+            preprocess_mode: 预处理模式，'exact'（与历史版本结果一致）或 'fast'（融合的灰度解码+OpenCV缩放）
+            interpolation: fast模式下的插值方式，'auto'、'nearest'、'linear'、'cubic'、'area' 或 'lanczos'
+            tile_threshold: 预处理后宽度超过该值时启用分块推理，0表示不分块
+            tile_width: 分块窗口宽度（模型输入坐标系下的像素）
+            tile_overlap: 相邻窗口的重叠宽度，结果在重叠区域中点处拼接
+            tile_batch_size: 单次推理的最大窗口数，决定分块推理的峰值内存
+
+        Raises:
+            ImageProcessError: 当分块参数无效时
         """
-        super().__init__(use_gpu, device_id)
+        if tile_width < 1 or tile_batch_size < 1 or not 0 <= tile_overlap < tile_width:
+            raise ImageProcessError("tile_width和tile_batch_size必须为正整数，tile_overlap必须小于tile_width")
+        if tile_threshold and tile_threshold < tile_width:
+            raise ImageProcessError("tile_threshold不能小于tile_width")
+
+        super().__init__(use_gpu, device_id, session_config)
 
         self.old = old
         self.beta = beta
+        self.quantized = quantized
         self.import_onnx_path = import_onnx_path
         self.charsets_path = charsets_path
         self.use_import_onnx = bool(import_onnx_path)
@@ -51,6 +80,15 @@ class OCREngine(BaseEngine):
         self.resize = []
         self.channel = 1
 
+        # 分块推理配置
+        self.tile_threshold = tile_threshold
+        self.tile_width = tile_width
+        self.tile_overlap = tile_overlap
+        self.tile_batch_size = tile_batch_size
+
+        # 预处理器（在初始化时根据模型配置更新输入尺寸）
+        self.preprocessor = OCRPreprocessor(mode=preprocess_mode, interpolation=interpolation)
+
         # 初始化引擎
         self.initialize()
 
@@ -79,7 +117,7 @@ class OCREngine(BaseEngine):
                 self.channel = charset_info['channel']
             else:
                 # 加载默认模型
-                self.session = self.model_loader.load_ocr_model(self.old, self.beta)
+                self.session = self.model_loader.load_ocr_model(self.old, self.beta, quantized=self.quantized)
 
                 # 加载默认字符集
                 self.charset_manager.load_default_charset(self.old, self.beta)
@@ -92,16 +130,21 @@ class OCREngine(BaseEngine):
                 self.resize = [64, 64]  # 默认尺寸
                 self.channel = 1
 
+            self.preprocessor.resize = self.resize if self.use_import_onnx else None
+            self.preprocessor.word = self.word
+            self.preprocessor.channel = self.channel
+
             self.is_initialized = True
 
         except Exception as e:
             raise ModelLoadError(f"OCR引擎初始化失败: {str(e)}") from e
 
-    def predict(self, image: Union[bytes, str, Image.Image],
+    def predict(self, image: ImageInput,
                 png_fix: bool = False, probability: bool = False,
                 color_filter_colors: Optional[List[str]] = None,
                 color_filter_custom_ranges: Optional[List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None,
-                charset_range: Optional[Union[int, str, List[str]]] = None) -> Union[str, Dict[str, Any]]:
+                charset_range: Optional[CharsetRangeInput] = None,
+                probability_mode: str = 'compact', top_k: int = 5) -> Union[str, Dict[str, Any]]:
         """
         执行OCR识别
         
@@ -111,7 +154,11 @@ class OCREngine(BaseEngine):
             probability: 是否返回概率信息
             color_filter_colors: 颜色过滤预设颜色列表
             color_filter_custom_ranges: 自定义HSV颜色范围列表
-            charset_range: 字符集范围限制
+            charset_range: 字符集范围限制（整数、字符串、字符列表或CharsetRange），只对本次调用生效；
+                未指定时使用 set_charset_range 设置的范围
+            probability_mode: 概率输出模式，'compact' 只返回每个时间步的top-k类别和字符置信度，
+                'full' 返回完整的softmax矩阵和字符集
+            top_k: compact模式下每个时间步返回的类别数
             
         Returns:
             识别结果文本或包含概率信息的字典
@@ -125,103 +172,279 @@ class OCREngine(BaseEngine):
 
         # 验证输入
         validate_image_input(image)
+        if probability:
+            self._validate_probability_options(probability_mode, top_k)
+
+        cache = self.result_cache
+        if cache is not None:
+            cache_key, image = self._cache_key(image, png_fix, probability, color_filter_colors,
+                                               color_filter_custom_ranges, charset_range, probability_mode, top_k)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
-            # 加载图像
-            pil_image = load_image_from_input(image)
-
-            # 应用颜色过滤
-            if color_filter_colors or color_filter_custom_ranges:
-                try:
-                    color_filter = ColorFilter(colors=color_filter_colors,
-                                               custom_ranges=color_filter_custom_ranges)
-                    pil_image = color_filter.filter_image(pil_image)
-                except Exception as e:
-                    print(f"颜色过滤警告: {str(e)}，将跳过颜色过滤步骤")
-
-            # 设置字符集范围
-            if charset_range is not None:
-                self.charset_manager.set_ranges(charset_range)
+            # 本次调用的字符集范围掩码（不修改共享的字符集管理器，可被多个线程同时调用）
+            range_masks = self._resolve_range_masks(charset_range)
+
+            # 加载并预处理图像，结果写入线程内复用的缓冲区，推理结束前不会被覆盖
+            with self._stage('decode'):
+                source = self._load_image(image, color_filter_colors, color_filter_custom_ranges)
+            with self._stage('preprocess') as stage:
+                processed_image = self._preprocess_image(source, png_fix)
+                stage.set_size(processed_image.shape)
+
+            # 执行推理，超宽图像分块推理
+            if self._needs_tiling(processed_image):
+                result = self._inference_tiled(processed_image, probability, probability_mode, top_k, range_masks)
             else:
-                # 确保在没有设置字符集范围时，有效索引被正确初始化
-                self.charset_manager._update_valid_indices()
+                result = self._inference(processed_image, probability, probability_mode, top_k, range_masks)
+
+        except Exception as e:
+            raise ImageProcessError(f"OCR识别失败: {str(e)}") from e
+
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def predict_batch(self, images: Sequence[ImageInput],
+                      png_fix: bool = False, probability: bool = False,
+                      color_filter_colors: Optional[List[str]] = None,
+                      color_filter_custom_ranges: Optional[
+                          List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None,
+                      charset_range: Optional[CharsetRangeInput] = None,
+                      bucket_width: int = 32, max_batch_size: int = 32,
+                      probability_mode: str = 'compact', top_k: int = 5) -> List[Union[str, Dict[str, Any]]]:
+        """
+        批量执行OCR识别
 
-            # 预处理图像
-            processed_image = self._preprocess_image(pil_image, png_fix)
+        图像统一缩放到模型输入高度后按宽度分桶，同一桶内的图像右侧按边缘像素填充到相同宽度，
+        每个桶只执行一次推理，填充部分对应的时间步在解码时被截掉。
 
-            # 执行推理
-            result = self._inference(processed_image, probability)
+        Args:
+            images: 输入图像序列
+            png_fix: 是否修复PNG透明背景
+            probability: 是否返回概率信息
+            color_filter_colors: 颜色过滤预设颜色列表
+            color_filter_custom_ranges: 自定义HSV颜色范围列表
+            charset_range: 字符集范围限制，只对本次调用生效
+            bucket_width: 宽度分桶粒度（像素）
+            max_batch_size: 单次推理的最大图像数
+            probability_mode: 概率输出模式，'compact' 或 'full'
+            top_k: compact模式下每个时间步返回的类别数
+
+        Returns:
+            与输入顺序一致的识别结果列表
+
+        Raises:
+            ImageProcessError: 当图像处理失败时
+            ModelLoadError: 当模型未初始化时
+        """
+        if not self.is_ready():
+            raise ModelLoadError("OCR引擎未初始化")
+
+        if bucket_width < 1 or max_batch_size < 1:
+            raise ImageProcessError("bucket_width和max_batch_size必须为正整数")
+        if probability:
+            self._validate_probability_options(probability_mode, top_k)
+
+        for image in images:
+            validate_image_input(image)
+
+        cache = self.result_cache
+        if cache is None:
+            return self._predict_batch(images, png_fix, probability, color_filter_colors, color_filter_custom_ranges,
+                                       charset_range, bucket_width, max_batch_size, probability_mode, top_k)
+
+        # 只识别未命中缓存的图像
+        results: List[Union[str, Dict[str, Any]]] = [''] * len(images)
+        pending_indices, pending_images, pending_keys = [], [], []
+        for index, image in enumerate(images):
+            cache_key, image = self._cache_key(image, png_fix, probability, color_filter_colors,
+                                               color_filter_custom_ranges, charset_range, probability_mode, top_k)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending_indices.append(index)
+                pending_images.append(image)
+                pending_keys.append(cache_key)
+
+        if pending_images:
+            pending_results = self._predict_batch(pending_images, png_fix, probability, color_filter_colors,
+                                                  color_filter_custom_ranges, charset_range, bucket_width,
+                                                  max_batch_size, probability_mode, top_k)
+            for index, cache_key, result in zip(pending_indices, pending_keys, pending_results):
+                cache.put(cache_key, result)
+                results[index] = result
+
+        return results
+
+    def _predict_batch(self, images: Sequence[ImageInput], png_fix: bool, probability: bool,
+                       color_filter_colors: Optional[List[str]],
+                       color_filter_custom_ranges: Optional[List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]],
+                       charset_range: Optional[CharsetRangeInput], bucket_width: int, max_batch_size: int,
+                       probability_mode: str, top_k: int) -> List[Union[str, Dict[str, Any]]]:
+        """
+        批量识别（不经过缓存），参数含义见 predict_batch
 
-            return result
+        Returns:
+            与输入顺序一致的识别结果列表
+
+        Raises:
+            ImageProcessError: 当图像处理失败时
+        """
+        try:
+            range_masks = self._resolve_range_masks(charset_range)
+
+            # 逐张预处理，并按 (通道数, 高度, 宽度桶) 分组
+            buckets: Dict[Tuple[int, int, int], List[int]] = {}
+            processed_images: List[Optional[np.ndarray]] = []
+            results: List[Union[str, Dict[str, Any]]] = [''] * len(images)
+            for index, image in enumerate(images):
+                # 预处理结果需要保留到分桶推理，不能使用复用缓冲区
+                with self._stage('decode'):
+                    source = self._load_image(image, color_filter_colors, color_filter_custom_ranges)
+                with self._stage('preprocess') as stage:
+                    processed = self._preprocess_image(source, png_fix, reuse_buffer=False)
+                    stage.set_size(processed.shape)
+                if self._needs_tiling(processed):
+                    # 超宽图像单独分块推理，不参与分桶，避免把同桶图像填充到超大宽度
+                    results[index] = self._inference_tiled(processed, probability, probability_mode, top_k,
+                                                           range_masks)
+                    processed_images.append(None)
+                    continue
+                processed_images.append(processed)
+                _, channels, height, width = processed.shape
+                key = (channels, height, (width + bucket_width - 1) // bucket_width)
+                buckets.setdefault(key, []).append(index)
+
+            for indices in buckets.values():
+                for start in range(0, len(indices), max_batch_size):
+                    chunk = indices[start:start + max_batch_size]
+                    chunk_results = self._inference_batch([processed_images[i] for i in chunk], probability,
+                                                          probability_mode, top_k, range_masks)
+                    for index, result in zip(chunk, chunk_results):
+                        results[index] = result
+
+            return results
 
         except Exception as e:
-            raise ImageProcessError(f"OCR识别失败: {str(e)}") from e
+            raise ImageProcessError(f"批量OCR识别失败: {str(e)}") from e
 
-    def _preprocess_image(self, image: Image.Image, png_fix: bool) -> np.ndarray:
+    def _cache_model_id(self) -> Hashable:
         """
-        预处理图像
-        
+        缓存键中的模型标识
+
+        Returns:
+            模型文件与预处理配置组成的元组
+        """
+        return (self.__class__.__name__, self.old, self.beta, self.quantized, self.import_onnx_path,
+                self.charsets_path, self.preprocessor.mode, self.preprocessor.interpolation,
+                self.tile_threshold, self.tile_width, self.tile_overlap)
+
+    def _cache_key(self, image: ImageInput, png_fix: bool, probability: bool,
+                   color_filter_colors: Optional[List[str]],
+                   color_filter_custom_ranges: Optional[List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]],
+                   charset_range: Optional[CharsetRangeInput], probability_mode: str,
+                   top_k: int) -> Tuple[Hashable, ImageInput]:
+        """
+        计算识别结果的缓存键
+
         Args:
             image: 输入图像
-            png_fix: 是否修复PNG透明背景
-            
+            其余参数与 predict 相同
+
         Returns:
-            预处理后的numpy数组
+            (缓存键, 后续识别使用的图像输入)
         """
-        try:
-            # 处理PNG透明背景
-            if png_fix and image.mode == 'RGBA':
-                image = png_rgba_black_preprocess(image)
-
-            # 调整图像尺寸
-            if not self.use_import_onnx:
-                # 默认模型的预处理
-                target_height = 64
-                target_width = int(image.size[0] * (target_height / image.size[1]))
-                image = ImageProcessor.resize_image(image, (target_width, target_height))
-                image = ImageProcessor.convert_to_grayscale(image)
-            else:
-                # 自定义模型的预处理
-                if self.resize[0] == -1:
-                    if self.word:
-                        image = ImageProcessor.resize_image(image, (self.resize[1], self.resize[1]))
-                    else:
-                        target_height = self.resize[1]
-                        target_width = int(image.size[0] * (target_height / image.size[1]))
-                        image = ImageProcessor.resize_image(image, (target_width, target_height))
-                else:
-                    image = ImageProcessor.resize_image(image, (self.resize[0], self.resize[1]))
+        digest, image = image_digest(image)
+        if charset_range is None:
+            # 未指定时使用 set_charset_range 设置的范围，范围改变后旧结果不会被命中
+            range_key = ('default', tuple(self.charset_manager.charset_range))
+        else:
+            range_key = CharsetRange.from_value(charset_range)
+        probability_key = (probability_mode, top_k) if probability else None
+        key = (self._cache_model_id(), digest, png_fix, probability, probability_key,
+               freeze_param(color_filter_colors), freeze_param(color_filter_custom_ranges), range_key)
+        return key, image
+
+    def _resolve_range_masks(self, charset_range: Optional[CharsetRangeInput]) -> RangeMasks:
+        """
+        获取本次调用使用的字符集范围掩码
 
-                # 根据通道数转换
-                if self.channel == 1:
-                    image = ImageProcessor.convert_to_grayscale(image)
+        Args:
+            charset_range: 本次调用的字符集范围，为None时使用字符集管理器当前的范围
 
-            # 转换为numpy数组并标准化
-            img_array = np.array(image).astype(np.float32)
+        Returns:
+            (布尔掩码, 候选索引数组)
+        """
+        if charset_range is None:
+            return self.charset_manager.get_range_masks()
+        return self.charset_manager.compile_range(charset_range)
+
+    def _load_image(self, image: ImageInput,
+                    color_filter_colors: Optional[List[str]] = None,
+                    color_filter_custom_ranges: Optional[
+                        List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = None
+                    ) -> ImageInput:
+        """
+        加载图像并应用颜色过滤
 
-            # 标准化到[0,1]
-            img_array = img_array / 255.0
+        融合预处理模式下且无需颜色过滤时直接返回原始输入，由预处理器解码为灰度图。
 
-            # 调整维度
-            if len(img_array.shape) == 2:
-                img_array = np.expand_dims(img_array, axis=0)  # 添加通道维度
-            elif len(img_array.shape) == 3:
-                img_array = img_array.transpose(2, 0, 1)  # HWC -> CHW
+        Args:
+            image: 输入图像
+            color_filter_colors: 颜色过滤预设颜色列表
+            color_filter_custom_ranges: 自定义HSV颜色范围列表
 
-            img_array = np.expand_dims(img_array, axis=0)  # 添加batch维度
+        Returns:
+            PIL图像或原始输入
+        """
+        need_filter = bool(color_filter_colors or color_filter_custom_ranges)
+        if self.preprocessor.fused and not need_filter:
+            return image
 
-            return img_array
+        pil_image = load_image_from_input(image)
 
-        except Exception as e:
-            raise ImageProcessError(f"图像预处理失败: {str(e)}") from e
+        # 应用颜色过滤
+        if need_filter:
+            try:
+                color_filter = ColorFilter(colors=color_filter_colors,
+                                           custom_ranges=color_filter_custom_ranges)
+                pil_image = color_filter.filter_image(pil_image)
+            except Exception as e:
+                print(f"颜色过滤警告: {str(e)}，将跳过颜色过滤步骤")
 
-    def _inference(self, image_array: np.ndarray, probability: bool) -> Union[str, Dict[str, Any]]:
+        return pil_image
+
+    def _preprocess_image(self, image: ImageInput, png_fix: bool,
+                          reuse_buffer: bool = True) -> np.ndarray:
+        """
+        预处理图像
+        
+        Args:
+            image: 输入图像（exact模式下为PIL图像）
+            png_fix: 是否修复PNG透明背景
+            reuse_buffer: 是否写入线程内复用的缓冲区
+            
+        Returns:
+            预处理后的numpy数组
+        """
+        return self.preprocessor(image, png_fix, reuse_buffer=reuse_buffer)
+
+    def _inference(self, image_array: np.ndarray, probability: bool,
+                   probability_mode: str = 'compact', top_k: int = 5,
+                   range_masks: Optional[RangeMasks] = None) -> Union[str, Dict[str, Any]]:
         """
         执行模型推理
         
         Args:
             image_array: 预处理后的图像数组
             probability: 是否返回概率信息
+            probability_mode: 概率输出模式
+            top_k: compact模式下每个时间步返回的类别数
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
             
         Returns:
             识别结果
@@ -231,72 +454,249 @@ class OCREngine(BaseEngine):
             input_name = self.session.get_inputs()[0].name
 
             # 执行推理
-            outputs = self.session.run(None, {input_name: image_array})
+            with self._stage('inference') as stage:
+                outputs = self.session.run(None, {input_name: image_array})
+                stage.set_size(image_array.shape)
 
             # 处理输出
-            if probability:
-                return self._process_probability_output(outputs[0])
-            else:
-                return self._process_text_output(outputs[0])
+            with self._stage('postprocess'):
+                if probability:
+                    return self._process_probability_output(outputs[0], probability_mode, top_k, range_masks)
+                else:
+                    return self._process_text_output(outputs[0], range_masks)
 
         except Exception as e:
             raise ModelLoadError(f"模型推理失败: {str(e)}") from e
 
-    def _process_text_output(self, output: np.ndarray) -> str:
+    def _inference_batch(self, image_arrays: List[np.ndarray], probability: bool,
+                         probability_mode: str = 'compact', top_k: int = 5,
+                         range_masks: Optional[RangeMasks] = None) -> List[Union[str, Dict[str, Any]]]:
+        """
+        将同一宽度桶内的图像填充到相同宽度后执行一次推理
+
+        Args:
+            image_arrays: 预处理后的图像数组列表，形状均为 (1, C, H, W_i)
+            probability: 是否返回概率信息
+            probability_mode: 概率输出模式
+            top_k: compact模式下每个时间步返回的类别数
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
+
+        Returns:
+            每张图像的识别结果
+        """
+        try:
+            widths = [array.shape[3] for array in image_arrays]
+            max_width = max(widths)
+            with self._stage('batch_pad') as stage:
+                batch = np.empty((len(image_arrays),) + image_arrays[0].shape[1:3] + (max_width,), dtype=np.float32)
+                for i, array in enumerate(image_arrays):
+                    width = widths[i]
+                    batch[i, :, :, :width] = array[0]
+                    # 使用最右侧一列像素填充，避免在文字边缘引入人为的边界
+                    batch[i, :, :, width:] = array[0, :, :, width - 1:width]
+                stage.set_size(batch.shape)
+
+            input_name = self.session.get_inputs()[0].name
+            with self._stage('inference') as stage:
+                output = self.session.run(None, {input_name: batch})[0]
+                stage.set_size(batch.shape)
+
+            with self._stage('postprocess'):
+                return self._process_batch_output(output, widths, probability, probability_mode, top_k, range_masks)
+
+        except Exception as e:
+            raise ModelLoadError(f"批量模型推理失败: {str(e)}") from e
+
+    def _needs_tiling(self, image_array: np.ndarray) -> bool:
+        """
+        判断预处理后的图像是否需要分块推理
+
+        只有输入宽度可变的序列模型（默认模型、按比例缩放的自定义模型）才分块。
+
+        Args:
+            image_array: 预处理后的图像数组 (1, C, H, W)
+
+        Returns:
+            是否分块
+        """
+        if not self.tile_threshold or image_array.shape[3] <= self.tile_threshold:
+            return False
+        return self.preprocessor.resize is None or (self.preprocessor.resize[0] == -1 and not self.word)
+
+    def _tile_layout(self, width: int) -> Tuple[List[int], List[int]]:
+        """
+        计算分块窗口的位置
+
+        窗口按 tile_width - tile_overlap 的步长排列，最后一个窗口与图像右边缘对齐；
+        相邻窗口以重叠区域的中点为界，每个窗口只保留边界之间的部分。
+
+        Args:
+            width: 预处理后的图像宽度
+
+        Returns:
+            (各窗口起点, 各窗口保留区域的边界)，边界列表比起点列表多一个元素
+        """
+        step = self.tile_width - self.tile_overlap
+        starts = list(range(0, width - self.tile_width, step)) + [width - self.tile_width]
+        cuts = [0] + [(starts[i + 1] + starts[i] + self.tile_width) // 2 for i in range(len(starts) - 1)] + [width]
+        return starts, cuts
+
+    def _inference_tiled(self, image_array: np.ndarray, probability: bool,
+                         probability_mode: str = 'compact', top_k: int = 5,
+                         range_masks: Optional[RangeMasks] = None) -> Union[str, Dict[str, Any]]:
+        """
+        将超宽图像切分为相互重叠的窗口，分批推理后拼接CTC输出
+
+        每次推理最多 tile_batch_size 个窗口，文本模式下每批输出立即转换为类别索引，
+        峰值内存与图像宽度无关；概率模式需要保留每个时间步的输出用于计算置信度。
+
+        Args:
+            image_array: 预处理后的图像数组 (1, C, H, W)
+            probability: 是否返回概率信息
+            probability_mode: 概率输出模式
+            top_k: compact模式下每个时间步返回的类别数
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
+
+        Returns:
+            识别结果
+        """
+        try:
+            valid_mask, valid_indices = range_masks or self.charset_manager.get_range_masks()
+            starts, cuts = self._tile_layout(image_array.shape[3])
+            input_name = self.session.get_inputs()[0].name
+
+            pieces = []
+            for chunk_start in range(0, len(starts), self.tile_batch_size):
+                chunk = starts[chunk_start:chunk_start + self.tile_batch_size]
+                with self._stage('tile') as stage:
+                    batch = np.stack([image_array[0, :, :, start:start + self.tile_width] for start in chunk])
+                    stage.set_size(batch.shape)
+                with self._stage('inference') as stage:
+                    output = self.session.run(None, {input_name: batch})[0]
+                    stage.set_size(batch.shape)
+                if output.ndim != 3 or output.shape[1] != len(chunk):
+                    raise ModelLoadError(f"模型输出形状 {output.shape} 不是 (时间步, 批大小, 类别数)，无法分块推理")
+
+                # 将窗口内保留区域的像素范围换算为时间步范围
+                steps = output.shape[0]
+                with self._stage('postprocess'):
+                    for offset, start in enumerate(chunk):
+                        index = chunk_start + offset
+                        begin = round((cuts[index] - start) * steps / self.tile_width)
+                        end = round((cuts[index + 1] - start) * steps / self.tile_width)
+                        window = output[begin:end, offset:offset + 1, :]
+                        if probability:
+                            pieces.append(window.copy())
+                        else:
+                            pieces.append(to_time_major_indices(window, valid_mask, valid_indices)[:, 0])
+
+            with self._stage('postprocess'):
+                if probability:
+                    return self._process_probability_output(np.concatenate(pieces, axis=0), probability_mode, top_k,
+                                                            range_masks)
+                decoded_indices = ctc_greedy_decode(
+                    np.concatenate(pieces),
+                    valid_mask=valid_mask,
+                    num_classes=self.charset_manager.get_charset_size()
+                )
+                return indices_to_text(decoded_indices, self.charset_manager.get_charset_array())
+
+        except Exception as e:
+            raise ModelLoadError(f"分块推理失败: {str(e)}") from e
+
+    def _process_batch_output(self, output: np.ndarray, widths: List[int], probability: bool,
+                              probability_mode: str, top_k: int,
+                              range_masks: Optional[RangeMasks]) -> List[Union[str, Dict[str, Any]]]:
+        """
+        将批量推理的输出拆分为每张图像的识别结果
+
+        Args:
+            output: 批量推理输出
+            widths: 每张图像填充前的宽度
+            probability: 是否返回概率信息
+            probability_mode: 概率输出模式
+            top_k: compact模式下每个时间步返回的类别数
+            range_masks: 字符集范围掩码
+
+        Returns:
+            每张图像的识别结果
+        """
+        max_width = max(widths)
+        batch_size = len(widths)
+        if output.ndim == 3 and output.shape[1] == batch_size:
+            # (sequence_length, batch_size, num_classes)：按原始宽度截掉填充部分的时间步
+            sequence_length = output.shape[0]
+            lengths = np.array([min(sequence_length, -(-width * sequence_length // max_width))
+                                for width in widths])
+            if probability:
+                return [self._process_probability_output(output[:lengths[b], b:b + 1, :], probability_mode, top_k,
+                                                         range_masks)
+                        for b in range(batch_size)]
+            return self.decode_batch(output, lengths, range_masks)
+
+        # 其他输出形状（如单字符分类）按batch维度逐个处理
+        if probability:
+            return [self._process_probability_output(output[b:b + 1], probability_mode, top_k, range_masks)
+                    for b in range(batch_size)]
+        return [self._process_text_output(output[b:b + 1], range_masks) for b in range(batch_size)]
+
+    def _process_text_output(self, output: np.ndarray,
+                             range_masks: Optional[RangeMasks] = None) -> str:
         """
         处理文本输出
         
         Args:
             output: 模型输出
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
             
         Returns:
             识别的文本
         """
         try:
-            # 获取预测结果
-            if len(output.shape) == 3:
-                # 序列输出 (sequence_length, batch_size, num_classes) 或 (batch_size, sequence_length, num_classes)
-                # 需要判断哪个维度是batch_size=1
-                if output.shape[1] == 1:
-                    # 形状为 (sequence_length, 1, num_classes)
-                    predicted_indices = np.argmax(output[:, 0, :], axis=1)
-                elif output.shape[0] == 1:
-                    # 形状为 (1, sequence_length, num_classes)
-                    predicted_indices = np.argmax(output[0, :, :], axis=1)
-                else:
-                    # 默认取第一个batch
-                    predicted_indices = np.argmax(output[0, :, :], axis=1)
-            else:
-                # 单字符输出或2D序列输出
-                predicted_indices = np.argmax(output, axis=-1)
-                # 确保结果是数组形式，即使是单个值
-                if predicted_indices.ndim == 0:
-                    predicted_indices = np.array([predicted_indices])
+            valid_mask, valid_indices = range_masks or self.charset_manager.get_range_masks()
 
-            # 正确的CTC解码：在索引级别进行去重
-            charset = self.charset_manager.get_charset()
-            valid_indices = self.charset_manager.get_valid_indices()
+            # 在字符集范围内求argmax，统一为 (sequence_length, batch_size)，取第一个样本
+            predicted_indices = to_time_major_indices(output, valid_mask, valid_indices)[:, 0]
 
-            # 步骤1：CTC解码 - 在索引级别去除连续重复
-            decoded_indices = self._ctc_decode_indices(predicted_indices)
+            # CTC解码：去除连续重复和blank，并应用字符集范围限制
+            decoded_indices = ctc_greedy_decode(
+                predicted_indices,
+                valid_mask=valid_mask,
+                num_classes=self.charset_manager.get_charset_size()
+            )
 
-            # 步骤2：转换为字符并应用字符集范围限制
-            result_chars = []
-            for idx in decoded_indices:
-                # 检查字符集范围限制
-                if valid_indices and idx not in valid_indices:
-                    continue
+            return indices_to_text(decoded_indices, self.charset_manager.get_charset_array())
+
+        except Exception as e:
+            raise ModelLoadError(f"文本输出处理失败: {str(e)}") from e
 
-                # 检查索引有效性并转换为字符
-                if 0 <= idx < len(charset):
-                    char = charset[idx]
-                    # 注意：这里不跳过空字符，因为CTC解码已经处理了blank
-                    result_chars.append(char)
+    def decode_batch(self, output: np.ndarray, lengths: Optional[np.ndarray] = None,
+                     range_masks: Optional[RangeMasks] = None) -> List[str]:
+        """
+        批量解码 (sequence_length, batch_size, num_classes) 形状的模型输出
 
-            return ''.join(result_chars)
+        Args:
+            output: 模型输出
+            lengths: 每个样本的有效时间步数，为None时使用全部时间步
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
+
+        Returns:
+            每个样本的识别文本
+        """
+        try:
+            valid_mask, valid_indices = range_masks or self.charset_manager.get_range_masks()
+            predicted_indices = constrained_argmax(output, valid_mask, valid_indices)
+            decoded = ctc_greedy_decode_batch(
+                predicted_indices,
+                valid_mask=valid_mask,
+                num_classes=self.charset_manager.get_charset_size(),
+                lengths=lengths
+            )
+            charset_array = self.charset_manager.get_charset_array()
+            return [indices_to_text(indices, charset_array) for indices in decoded]
 
         except Exception as e:
-            raise ModelLoadError(f"文本输出处理失败: {str(e)}") from e
+            raise ModelLoadError(f"批量文本输出处理失败: {str(e)}") from e
 
     def _ctc_decode_indices(self, predicted_indices: np.ndarray) -> List[int]:
         """
@@ -308,37 +708,40 @@ class OCREngine(BaseEngine):
         Returns:
             解码后的索引列表
         """
-        if len(predicted_indices) == 0:
-            return []
-
-        decoded_indices = []
-        prev_idx = None
+        return ctc_greedy_decode(predicted_indices).tolist()
 
-        for idx in predicted_indices:
-            # 转换为Python int类型以确保一致性
-            idx = int(idx)
-
-            # CTC解码规则：
-            # 1. 跳过连续重复的索引
-            # 2. 跳过blank字符（索引0，对应空字符）
-            if idx != prev_idx:  # 不是连续重复
-                if idx != 0:  # 不是blank字符（假设索引0是blank）
-                    decoded_indices.append(idx)
-
-            prev_idx = idx
-
-        return decoded_indices
+    @staticmethod
+    def _validate_probability_options(probability_mode: str, top_k: int) -> None:
+        """
+        校验概率输出参数
 
-    def _process_probability_output(self, output: np.ndarray) -> Dict[str, Any]:
+        Raises:
+            ImageProcessError: 当参数无效时
+        """
+        if probability_mode not in PROBABILITY_MODES:
+            raise ImageProcessError(f"不支持的概率输出模式: {probability_mode}，"
+                                    f"支持: {', '.join(PROBABILITY_MODES)}")
+        if not isinstance(top_k, int) or top_k < 1:
+            raise ImageProcessError("top_k必须为正整数")
+
+    def _process_probability_output(self, output: np.ndarray, probability_mode: str = 'compact',
+                                    top_k: int = 5,
+                                    range_masks: Optional[RangeMasks] = None) -> Dict[str, Any]:
         """
         处理概率输出
         
         Args:
             output: 模型输出
+            probability_mode: 'compact' 或 'full'
+            top_k: compact模式下每个时间步返回的类别数
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
             
         Returns:
             包含概率信息的字典
         """
+        if probability_mode == 'compact':
+            return self._process_compact_probability_output(output, top_k, range_masks)
+
         try:
             # 应用softmax
             if len(output.shape) == 3:
@@ -347,7 +750,7 @@ class OCREngine(BaseEngine):
                 probabilities = self._softmax(output, axis=1)
 
             # 获取文本结果
-            text_result = self._process_text_output(output)
+            text_result = self._process_text_output(output, range_masks)
 
             # 构建概率信息
             charset = self.charset_manager.get_charset()
@@ -363,6 +766,61 @@ class OCREngine(BaseEngine):
         except Exception as e:
             raise ModelLoadError(f"概率输出处理失败: {str(e)}") from e
 
+    def _process_compact_probability_output(self, output: np.ndarray, top_k: int,
+                                            range_masks: Optional[RangeMasks] = None) -> Dict[str, Any]:
+        """
+        生成紧凑的概率信息：每个时间步的top-k类别、每个识别字符的置信度和整体置信度
+
+        Args:
+            output: 模型输出
+            top_k: 每个时间步返回的类别数
+            range_masks: 字符集范围掩码，为None时使用字符集管理器当前的范围
+
+        Returns:
+            包含 text、confidence、chars、top_k 的字典。
+            confidence为各时间步所选类别概率的平均值；
+            chars中每项为 {'char': 字符, 'confidence': 置信度}；
+            top_k中每个时间步为 [[字符, 概率], ...]，blank以空字符串表示
+        """
+        try:
+            # 统一为 (sequence_length, num_classes)，批量输出取第一个样本
+            if output.ndim == 3:
+                sequence = output[0] if output.shape[0] == 1 and output.shape[1] != 1 else output[:, 0, :]
+            else:
+                sequence = output.reshape(-1, output.shape[-1])
+
+            probabilities = self._softmax(sequence, axis=-1)
+            valid_mask, valid_indices = range_masks or self.charset_manager.get_range_masks()
+            charset_array = self.charset_manager.get_charset_array()
+
+            predicted_indices = constrained_argmax(sequence, valid_mask, valid_indices)
+            step_scores = np.take_along_axis(probabilities, predicted_indices[:, None], axis=1)[:, 0]
+            decoded_indices, char_scores = ctc_greedy_decode_with_scores(
+                predicted_indices, step_scores,
+                valid_mask=valid_mask,
+                num_classes=self.charset_manager.get_charset_size()
+            )
+
+            top_candidates = valid_indices
+            if top_candidates is None and probabilities.shape[1] > len(charset_array):
+                # 模型类别数多于字符集时，只在字符集内选取
+                top_candidates = np.arange(len(charset_array))
+            top_indices, top_values = top_k_classes(probabilities, top_k, top_candidates)
+            top_chars = charset_array[top_indices].tolist()
+            top_values = top_values.tolist()
+
+            return {
+                'text': indices_to_text(decoded_indices, charset_array),
+                'confidence': float(step_scores.mean()) if step_scores.size else 0.0,
+                'chars': [{'char': char, 'confidence': score}
+                          for char, score in zip(charset_array[decoded_indices].tolist(), char_scores.tolist())],
+                'top_k': [[[char, value] for char, value in zip(chars, values)]
+                          for chars, values in zip(top_chars, top_values)]
+            }
+
+        except Exception as e:
+            raise ModelLoadError(f"概率输出处理失败: {str(e)}") from e
+
     def _softmax(self, x: np.ndarray, axis: int = -1) -> np.ndarray:
         """
         计算softmax
@@ -377,7 +835,7 @@ class OCREngine(BaseEngine):
         exp_x = np.exp(x - np.max(x, axis=axis, keepdims=True))
         return exp_x / np.sum(exp_x, axis=axis, keepdims=True)
 
-    def set_charset_range(self, charset_range: Union[int, str, List[str]]) -> None:
+    def set_charset_range(self, charset_range: CharsetRangeInput) -> None:
         """
         设置字符集范围
         
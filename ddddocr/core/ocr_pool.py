@@ -0,0 +1,507 @@
+# coding=utf-8
+"""
+多进程OCR工作池
+在多个工作进程中各自加载OCR模型并行识别，图片数据通过共享内存传递，避免在进程间序列化图片字节
+"""
+
+import itertools
+import multiprocessing
+import os
+import pathlib
+import threading
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from ..models.session_config import SessionConfig
+from ..utils.exceptions import DDDDOCRError, ImageProcessError, ModelLoadError
+from ..utils.image_io import ImageInput, as_pixel_array
+from ..utils.validators import validate_image_input
+
+
+class _Task:
+    """等待执行或正在执行的识别任务"""
+
+    __slots__ = ('task_id', 'future', 'payload', 'shm', 'kwargs')
+
+    def __init__(self, task_id: int, future: Future, payload: Tuple[Any, ...],
+                 shm: Optional[shared_memory.SharedMemory], kwargs: Dict[str, Any]):
+        self.task_id = task_id
+        self.future = future
+        self.payload = payload
+        self.shm = shm
+        self.kwargs = kwargs
+
+    def release(self) -> None:
+        """释放任务占用的共享内存"""
+        if self.shm is not None:
+            try:
+                self.shm.close()
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+
+
+class _Worker:
+    """工作进程及其连接"""
+
+    __slots__ = ('index', 'process', 'conn', 'ready', 'task')
+
+    def __init__(self, index: int, process: multiprocessing.process.BaseProcess, conn: Any):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task: Optional[_Task] = None
+
+
+def _attach_image(payload: Tuple[Any, ...]) -> Tuple[Any, Optional[shared_memory.SharedMemory]]:
+    """在工作进程中根据任务数据取得图片输入"""
+    kind = payload[0]
+    if kind == 'raw':
+        return payload[1], None
+
+    _, name, nbytes, shape, dtype = payload
+    shm = shared_memory.SharedMemory(name=name)
+    if shape is None:
+        # 编码后的图片字节，以一维memoryview交给引擎
+        return shm.buf[:nbytes], shm
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf), shm
+
+
+def _worker_main(conn: Any, engine_kwargs: Dict[str, Any]) -> None:
+    """
+    工作进程入口
+
+    Args:
+        conn: 与主进程通信的连接
+        engine_kwargs: OCREngine的初始化参数
+    """
+    from .ocr_engine import OCREngine
+
+    try:
+        engine = OCREngine(**engine_kwargs)
+    except Exception as e:
+        conn.send(('init_error', None, str(e)))
+        return
+    conn.send(('ready', None, None))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        task_id, payload, kwargs = message
+        shm = None
+        try:
+            image, shm = _attach_image(payload)
+            reply = ('result', task_id, engine.predict(image, **kwargs))
+        except Exception as e:
+            # 去掉traceback，避免其中的栈帧继续引用共享内存
+            reply = ('error', task_id, e.with_traceback(None))
+        finally:
+            image = None
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    # 仍有对象引用共享内存时由主进程负责unlink，这里只放弃映射
+                    pass
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # 异常对象无法序列化时只返回错误信息
+            conn.send(('error', task_id, ImageProcessError(f"OCR识别失败: {str(e)}")))
+
+    conn.close()
+
+
+class OCRPool:
+    """
+    多进程OCR工作池
+
+    每个工作进程持有一个OCREngine（模型通过模型注册表加载），每次处理一个任务。
+    提交的图片写入共享内存后只把共享内存名称发给工作进程；submit返回Future。
+    工作进程异常退出时，其正在处理的任务以DDDDOCRError失败，并自动启动新的工作进程。
+
+    使用示例：
+        with OCRPool(num_workers=4) as pool:
+            results = pool.map(images)
+    """
+
+    def __init__(self, num_workers: Optional[int] = None,
+                 use_gpu: bool = False, device_id: int = 0,
+                 old: bool = False, beta: bool = False,
+                 import_onnx_path: str = "", charsets_path: str = "",
+                 session_config: Optional[SessionConfig] = None, quantized: bool = False,
+                 preprocess_mode: str = 'exact', interpolation: str = 'auto',
+                 start_method: str = 'spawn', startup_timeout: float = 120.0):
+        """
+        初始化工作池并启动工作进程
+
+        Args:
+            num_workers: 工作进程数，为None时使用CPU核数
+            use_gpu: 是否使用GPU
+            device_id: GPU设备ID
+            old: 是否使用旧版模型
+            beta: 是否使用beta版模型
+            import_onnx_path: 自定义模型路径
+            charsets_path: 自定义字符集路径
+            session_config: onnxruntime会话配置，为None时每个进程的算子内线程数为 CPU核数/工作进程数，
+                避免多个进程争抢CPU
+            quantized: 是否使用INT8量化模型
+            preprocess_mode: 预处理模式，'exact' 或 'fast'
+            interpolation: fast模式下的插值方式
+            start_method: 进程启动方式，默认spawn（fork会复制主进程中onnxruntime的线程状态）
+            startup_timeout: 等待工作进程加载模型的超时时间（秒）
+
+        Raises:
+            DDDDOCRError: 当参数无效时
+            ModelLoadError: 当工作进程启动或模型加载失败时
+        """
+        cpu_count = os.cpu_count() or 1
+        if num_workers is None:
+            num_workers = cpu_count
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise DDDDOCRError("num_workers必须为正整数")
+
+        if session_config is None:
+            session_config = SessionConfig(intra_op_num_threads=max(1, cpu_count // num_workers))
+
+        self.num_workers = num_workers
+        self.startup_timeout = startup_timeout
+        self._engine_kwargs = {
+            'use_gpu': use_gpu,
+            'device_id': device_id,
+            'old': old,
+            'beta': beta,
+            'import_onnx_path': import_onnx_path,
+            'charsets_path': charsets_path,
+            'session_config': session_config,
+            'quantized': quantized,
+            'preprocess_mode': preprocess_mode,
+            'interpolation': interpolation,
+        }
+        self._context = multiprocessing.get_context(start_method)
+
+        self._lock = threading.Lock()
+        self._pending: Deque[_Task] = deque()
+        self._task_ids = itertools.count()
+        self._shutdown = False
+        self._stats = {'completed': 0, 'failed': 0, 'restarts': 0}
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+
+        self._workers: List[Optional[_Worker]] = [self._start_worker(i) for i in range(num_workers)]
+        try:
+            for worker in self._workers:
+                self._wait_ready(worker)
+        except Exception:
+            self._terminate_workers()
+            raise
+
+        self._manager = threading.Thread(target=self._manage, name='ddddocr-pool', daemon=True)
+        self._manager.start()
+
+    def submit(self, image: ImageInput, **kwargs) -> Future:
+        """
+        提交识别任务
+
+        Args:
+            image: 输入图像
+            **kwargs: 传给 OCREngine.predict 的参数，如 png_fix、probability、charset_range
+
+        Returns:
+            识别结果的Future
+
+        Raises:
+            DDDDOCRError: 当工作池已关闭或输入类型不支持时
+        """
+        validate_image_input(image)
+        payload, shm = self._to_payload(image)
+        future = Future()
+
+        with self._lock:
+            if self._shutdown:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                raise DDDDOCRError("工作池已关闭")
+            self._pending.append(_Task(next(self._task_ids), future, payload, shm, kwargs))
+            self._wakeup_writer.send_bytes(b'\0')
+        return future
+
+    def map(self, images: Sequence[ImageInput], timeout: Optional[float] = None, **kwargs) -> List[Any]:
+        """
+        批量识别，结果顺序与输入一致
+
+        Args:
+            images: 输入图像序列
+            timeout: 等待全部结果的超时时间（秒）
+            **kwargs: 传给 OCREngine.predict 的参数
+
+        Returns:
+            识别结果列表
+
+        Raises:
+            DDDDOCRError: 当任一任务失败时抛出该任务的异常
+        """
+        futures = [self.submit(image, **kwargs) for image in images]
+        return [future.result(timeout) for future in futures]
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """
+        关闭工作池
+
+        已提交的任务会继续执行完毕（cancel_futures为True时取消尚未开始的任务），之后工作进程退出。
+
+        Args:
+            wait: 是否等待工作进程退出
+            cancel_futures: 是否取消尚未开始的任务
+        """
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                if cancel_futures:
+                    while self._pending:
+                        task = self._pending.popleft()
+                        task.future.cancel()
+                        task.release()
+                self._wakeup_writer.send_bytes(b'\0')
+
+        if wait and self._manager.is_alive() and threading.current_thread() is not self._manager:
+            self._manager.join()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取工作池统计信息
+
+        Returns:
+            包含 workers、alive、pending、in_flight、completed、failed、restarts 的字典
+        """
+        with self._lock:
+            workers = [worker for worker in self._workers if worker is not None]
+            return {
+                'workers': self.num_workers,
+                'alive': sum(1 for worker in workers if worker.process.is_alive()),
+                'pending': len(self._pending),
+                'in_flight': sum(1 for worker in workers if worker.task is not None),
+                **self._stats
+            }
+
+    @staticmethod
+    def _to_payload(image: ImageInput) -> Tuple[Tuple[Any, ...], Optional[shared_memory.SharedMemory]]:
+        """
+        将图片写入共享内存
+
+        Returns:
+            (发送给工作进程的任务数据, 共享内存)；路径和base64字符串直接发送，不使用共享内存
+        """
+        if isinstance(image, (str, pathlib.PurePath)):
+            return ('raw', image), None
+
+        if isinstance(image, Image.Image):
+            if image.mode not in ('L', 'RGB', 'RGBA'):
+                has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+            image = np.asarray(image)
+
+        array = as_pixel_array(image)
+        if array is not None:
+            array = np.ascontiguousarray(array)
+            shape, dtype = array.shape, array.dtype.str
+            data = memoryview(array).cast('B')
+        else:
+            shape, dtype = None, None
+            data = memoryview(image).cast('B')
+
+        nbytes = data.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        shm.buf[:nbytes] = data
+        return ('shm', shm.name, nbytes, shape, dtype), shm
+
+    def _start_worker(self, index: int) -> _Worker:
+        """启动一个工作进程"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn, self._engine_kwargs),
+                                        name=f'ddddocr-worker-{index}', daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(index, process, parent_conn)
+
+    def _wait_ready(self, worker: _Worker) -> None:
+        """
+        等待工作进程加载模型
+
+        Raises:
+            ModelLoadError: 当加载失败或超时时
+        """
+        try:
+            if not worker.conn.poll(self.startup_timeout):
+                raise ModelLoadError(f"工作进程 {worker.index} 启动超时")
+            kind, _, value = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            raise ModelLoadError(f"工作进程 {worker.index} 启动失败，进程已退出") from e
+
+        if kind != 'ready':
+            raise ModelLoadError(f"工作进程 {worker.index} 模型加载失败: {value}")
+        worker.ready = True
+
+    def _manage(self) -> None:
+        """后台线程：分发任务、接收结果、重启异常退出的工作进程"""
+        while True:
+            with self._lock:
+                self._dispatch()
+                workers = [worker for worker in self._workers if worker is not None]
+                if self._shutdown and not self._pending and all(worker.task is None for worker in workers):
+                    break
+                if not workers:
+                    self._fail_pending(DDDDOCRError("没有可用的工作进程"))
+                    if self._shutdown:
+                        break
+
+            waitables = [self._wakeup_reader]
+            for worker in workers:
+                waitables.extend((worker.conn, worker.process.sentinel))
+
+            for ready in wait(waitables):
+                if ready is self._wakeup_reader:
+                    while self._wakeup_reader.poll():
+                        self._wakeup_reader.recv_bytes()
+                    continue
+
+                for worker in workers:
+                    if ready is worker.conn:
+                        self._receive(worker)
+                    elif ready == worker.process.sentinel:
+                        self._handle_exit(worker)
+
+        self._stop_workers()
+
+    def _dispatch(self) -> None:
+        """将等待中的任务发给空闲的工作进程（调用方持有锁）"""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker is None or not worker.ready or worker.task is not None:
+                continue
+
+            task = self._pending.popleft()
+            if not task.future.set_running_or_notify_cancel():
+                task.release()
+                continue
+            try:
+                worker.conn.send((task.task_id, task.payload, task.kwargs))
+                worker.task = task
+            except Exception as e:
+                task.future.set_exception(DDDDOCRError(f"任务发送失败: {str(e)}"))
+                task.release()
+                self._stats['failed'] += 1
+
+    def _receive(self, worker: _Worker) -> None:
+        """处理工作进程发来的消息"""
+        try:
+            kind, task_id, value = worker.conn.recv()
+        except (EOFError, OSError):
+            self._handle_exit(worker)
+            return
+
+        with self._lock:
+            if kind == 'ready':
+                worker.ready = True
+            elif kind == 'init_error':
+                # 重启的工作进程无法加载模型时不再重试
+                self._workers[worker.index] = None
+                worker.process.join()
+                worker.conn.close()
+            elif worker.task is not None and worker.task.task_id == task_id:
+                task, worker.task = worker.task, None
+                task.release()
+                if kind == 'result':
+                    task.future.set_result(value)
+                    self._stats['completed'] += 1
+                else:
+                    task.future.set_exception(value)
+                    self._stats['failed'] += 1
+
+    def _handle_exit(self, worker: _Worker) -> None:
+        """工作进程退出时让其任务失败并启动新的工作进程"""
+        with self._lock:
+            if self._workers[worker.index] is not worker:
+                return
+
+            worker.process.join()
+            worker.conn.close()
+            if worker.task is not None:
+                task, worker.task = worker.task, None
+                task.release()
+                task.future.set_exception(DDDDOCRError(
+                    f"工作进程 {worker.index} 异常退出（退出码 {worker.process.exitcode}）"))
+                self._stats['failed'] += 1
+
+            if self._shutdown and not self._pending:
+                self._workers[worker.index] = None
+                return
+
+            self._workers[worker.index] = self._start_worker(worker.index)
+            self._stats['restarts'] += 1
+
+    def _fail_pending(self, error: Exception) -> None:
+        """让所有等待中的任务失败（调用方持有锁）"""
+        while self._pending:
+            task = self._pending.popleft()
+            if task.future.set_running_or_notify_cancel():
+                task.future.set_exception(error)
+                self._stats['failed'] += 1
+            task.release()
+
+    def _stop_workers(self) -> None:
+        """通知工作进程退出并等待"""
+        with self._lock:
+            workers = [worker for worker in self._workers if worker is not None]
+            self._workers = [None] * self.num_workers
+
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout=10)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def _terminate_workers(self) -> None:
+        """启动失败时强制结束全部工作进程"""
+        for worker in self._workers:
+            if worker is not None and worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker is not None:
+                worker.conn.close()
+        self._workers = []
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def __enter__(self) -> 'OCRPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown(wait=True)
+
+    def __repr__(self) -> str:
+        return f"OCRPool(num_workers={self.num_workers}, shutdown={self._shutdown})"
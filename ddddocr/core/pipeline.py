@@ -0,0 +1,144 @@
+# coding=utf-8
+"""
+检测+识别流水线
+点选验证码先检测出每个字符的位置再逐个识别。流水线只解码一次图片，用numpy切片裁剪出各个目标，
+所有裁剪结果在一次批量OCR推理中完成识别，避免对每个目标重复解码、预处理和推理。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .detection_engine import DetectionEngine
+from .ocr_engine import OCREngine
+from ..models.charset_range import CharsetRangeInput
+from ..utils.exceptions import ImageProcessError, ModelLoadError
+from ..utils.image_io import ImageInput
+from ..utils.lazy_import import cv2
+from ..utils.validators import validate_image_input
+
+
+class DetectClassifyPipeline:
+    """检测+识别流水线，组合一个检测引擎和一个OCR引擎"""
+
+    def __init__(self, detection_engine: DetectionEngine, ocr_engine: OCREngine, padding: int = 0):
+        """
+        初始化流水线
+
+        Args:
+            detection_engine: 目标检测引擎
+            ocr_engine: OCR引擎
+            padding: 裁剪时向边界框四周扩展的像素数（裁剪到图片范围内）
+
+        Raises:
+            ImageProcessError: 当参数无效时
+        """
+        if not isinstance(padding, int) or padding < 0:
+            raise ImageProcessError("padding必须为非负整数")
+
+        self.detection_engine = detection_engine
+        self.ocr_engine = ocr_engine
+        self.padding = padding
+
+    def detect_and_classify(self, image: ImageInput, png_fix: bool = False,
+                            charset_range: Optional[CharsetRangeInput] = None,
+                            input_size: Optional[Tuple[int, int]] = None,
+                            nms_thr: Optional[float] = None, score_thr: Optional[float] = None,
+                            max_batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        检测图片中的目标并识别每个目标中的字符
+
+        Args:
+            image: 输入图像
+            png_fix: 是否修复PNG透明背景；开启时带透明通道的输入保留alpha，裁剪结果在识别前合成到白色背景上
+            charset_range: 字符集范围限制，只对本次调用生效
+            input_size: 检测模型输入尺寸 (高, 宽)，为None时使用检测引擎的设置
+            nms_thr: NMS阈值，为None时使用检测引擎的设置
+            score_thr: 检测置信度阈值，为None时使用检测引擎的设置
+            max_batch_size: 单次OCR推理的最大裁剪图数
+
+        Returns:
+            与检测结果顺序一致的列表，每项为
+            {'box': [x1, y1, x2, y2], 'text': 识别文本, 'confidence': 置信度, 'chars': 各字符的置信度}，
+            置信度取最不确定的字符，面积为0的边界框识别结果为空文本、置信度为0
+
+        Raises:
+            ImageProcessError: 当图像处理失败时
+            ModelLoadError: 当引擎未初始化时
+        """
+        if not self.detection_engine.is_ready() or not self.ocr_engine.is_ready():
+            raise ModelLoadError("检测引擎或OCR引擎未初始化")
+
+        validate_image_input(image)
+
+        try:
+            detection = self.detection_engine
+            with detection._stage('decode') as stage:
+                frame = detection.load_image(image, keep_alpha=png_fix)
+                stage.set_size(frame.shape)
+            # 检测与历史版本一致，丢弃透明通道
+            has_alpha = frame.shape[2] == 4
+            bgr = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR) if has_alpha else frame
+            boxes = detection.detect_array(bgr, input_size, nms_thr, score_thr)
+            if not boxes:
+                return []
+
+            # OCR引擎将彩色数组按RGB(A)解释；整图只转换一次，裁剪结果为视图。
+            # 带透明通道时裁剪RGBA数组，由OCR预处理按png_fix合成白色背景
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGBA if has_alpha else cv2.COLOR_BGR2RGB)
+            crops, crop_indices = self._crop(rgb, boxes)
+        except Exception as e:
+            raise ImageProcessError(f"检测识别失败: {str(e)}") from e
+
+        results = [{'box': box, 'text': '', 'confidence': 0.0, 'chars': []} for box in boxes]
+        if crops:
+            recognized = self.ocr_engine.predict_batch(crops, png_fix=png_fix, probability=True,
+                                                       charset_range=charset_range,
+                                                       max_batch_size=max_batch_size, top_k=1)
+            for index, result in zip(crop_indices, recognized):
+                chars = result.get('chars') or []
+                results[index]['text'] = result['text']
+                results[index]['confidence'] = min(item['confidence'] for item in chars) if chars else 0.0
+                results[index]['chars'] = chars
+        return results
+
+    def _crop(self, image: np.ndarray, boxes: List[List[int]]) -> Tuple[List[np.ndarray], List[int]]:
+        """
+        按边界框裁剪图像（numpy切片，不复制像素）
+
+        Args:
+            image: (H, W, 3) 或 (H, W, 4) 图像数组
+            boxes: 边界框列表
+
+        Returns:
+            (裁剪结果列表, 对应的边界框序号列表)，面积为0的边界框被跳过
+        """
+        height, width = image.shape[:2]
+        crops, indices = [], []
+        for index, (x1, y1, x2, y2) in enumerate(boxes):
+            x1, y1 = max(x1 - self.padding, 0), max(y1 - self.padding, 0)
+            x2, y2 = min(x2 + self.padding, width), min(y2 + self.padding, height)
+            if x2 > x1 and y2 > y1:
+                crops.append(image[y1:y2, x1:x2])
+                indices.append(index)
+        return crops, indices
+
+    def __repr__(self) -> str:
+        return f"DetectClassifyPipeline(detection={self.detection_engine!r}, ocr={self.ocr_engine!r})"
+
+
+def detect_and_classify(image: ImageInput, detection_engine: DetectionEngine, ocr_engine: OCREngine,
+                        **kwargs) -> List[Dict[str, Any]]:
+    """
+    检测图片中的目标并识别每个目标中的字符
+
+    Args:
+        image: 输入图像
+        detection_engine: 目标检测引擎
+        ocr_engine: OCR引擎
+        **kwargs: 传给 DetectClassifyPipeline.detect_and_classify 的参数
+
+    Returns:
+        每个目标的边界框、识别文本和置信度，格式见 DetectClassifyPipeline.detect_and_classify
+    """
+    return DetectClassifyPipeline(detection_engine, ocr_engine).detect_and_classify(image, **kwargs)
@@ -4,19 +4,17 @@
 提供滑块验证码的匹配和比较功能
 """
 
-from typing import Union, Dict, Any
+from typing import Dict, Any
 
 import numpy as np
-from PIL import Image
 
 from .base import BaseEngine
-from ..utils.exceptions import ImageProcessError, safe_import_opencv
-from ..utils.image_io import load_image_from_input, image_to_numpy
+from ..utils.exceptions import ImageProcessError
+from ..utils.image_io import ImageInput, load_array_from_input
+from ..utils.lazy_import import cv2
+from ..utils.result_cache import image_digest
 from ..utils.validators import validate_image_input
 
-# 安全导入OpenCV
-cv2 = safe_import_opencv()
-
 
 class SlideEngine(BaseEngine):
     """滑块匹配引擎"""
@@ -43,8 +41,8 @@ class SlideEngine(BaseEngine):
         """
         raise NotImplementedError("请使用slide_match或slide_comparison方法")
 
-    def slide_match(self, target_image: Union[bytes, str, Image.Image],
-                    background_image: Union[bytes, str, Image.Image],
+    def slide_match(self, target_image: ImageInput,
+                    background_image: ImageInput,
                     simple_target: bool = False) -> Dict[str, Any]:
         """
         滑块匹配算法
@@ -64,25 +62,36 @@ class SlideEngine(BaseEngine):
         validate_image_input(target_image)
         validate_image_input(background_image)
 
-        try:
-            # 加载图像
-            target_pil = load_image_from_input(target_image)
-            background_pil = load_image_from_input(background_image)
+        cache = self.result_cache
+        if cache is not None:
+            target_digest, target_image = image_digest(target_image)
+            background_digest, background_image = image_digest(background_image)
+            cache_key = (self._cache_model_id(), 'match', target_digest, background_digest, simple_target)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            # 转换为numpy数组
-            target_array = image_to_numpy(target_pil, 'RGB')
-            background_array = image_to_numpy(background_pil, 'RGB')
+        try:
+            # 加载为RGB数组（numpy数组输入不经过PIL，格式已满足时不复制；
+            # 编码输入仍由PIL解码，与历史版本一致，不按JPEG的EXIF方向旋转）
+            with self._stage('decode') as stage:
+                target_array = load_array_from_input(target_image, 'RGB')
+                background_array = load_array_from_input(background_image, 'RGB')
+                stage.set_size(background_array.shape)
 
             # 执行匹配
-            result = self._perform_slide_match(target_array, background_array, simple_target)
-
-            return result
+            with self._stage('match'):
+                result = self._perform_slide_match(target_array, background_array, simple_target)
 
         except Exception as e:
             raise ImageProcessError(f"滑块匹配失败: {str(e)}") from e
 
-    def slide_comparison(self, target_image: Union[bytes, str, Image.Image],
-                         background_image: Union[bytes, str, Image.Image]) -> Dict[str, Any]:
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def slide_comparison(self, target_image: ImageInput,
+                         background_image: ImageInput) -> Dict[str, Any]:
         """
         滑块比较算法（用于带坑位的图片）
         
@@ -100,23 +109,34 @@ class SlideEngine(BaseEngine):
         validate_image_input(target_image)
         validate_image_input(background_image)
 
-        try:
-            # 加载图像
-            target_pil = load_image_from_input(target_image)
-            background_pil = load_image_from_input(background_image)
+        cache = self.result_cache
+        if cache is not None:
+            target_digest, target_image = image_digest(target_image)
+            background_digest, background_image = image_digest(background_image)
+            cache_key = (self._cache_model_id(), 'comparison', target_digest, background_digest)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            # 转换为numpy数组
-            target_array = image_to_numpy(target_pil, 'RGB')
-            background_array = image_to_numpy(background_pil, 'RGB')
+        try:
+            # 加载为RGB数组（numpy数组输入不经过PIL，格式已满足时不复制；
+            # 编码输入仍由PIL解码，与历史版本一致，不按JPEG的EXIF方向旋转）
+            with self._stage('decode') as stage:
+                target_array = load_array_from_input(target_image, 'RGB')
+                background_array = load_array_from_input(background_image, 'RGB')
+                stage.set_size(background_array.shape)
 
             # 执行比较
-            result = self._perform_slide_comparison(target_array, background_array)
-
-            return result
+            with self._stage('match'):
+                result = self._perform_slide_comparison(target_array, background_array)
 
         except Exception as e:
             raise ImageProcessError(f"滑块比较失败: {str(e)}") from e
 
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
+
     def _perform_slide_match(self, target: np.ndarray, background: np.ndarray,
                              simple_target: bool) -> Dict[str, Any]:
         """
@@ -5,9 +5,19 @@
 """
 
 from .charset_manager import CharsetManager
-from .model_loader import ModelLoader
+from .charset_range import CharsetRange
+from .model_loader import ModelLoader, ModelRegistry, get_model_registry, preload
+from .quantization import build_quantized_models, quantize_model
+from .session_config import SessionConfig
 
 __all__ = [
     'ModelLoader',
-    'CharsetManager'
+    'ModelRegistry',
+    'get_model_registry',
+    'preload',
+    'SessionConfig',
+    'quantize_model',
+    'build_quantized_models',
+    'CharsetManager',
+    'CharsetRange'
 ]
@@ -0,0 +1,122 @@
+# coding=utf-8
+"""
+内置字符集数据模块
+内置字符集以紧凑的数据文件存放在 charsets 目录下，首次使用时才读取，并按内容哈希缓存
+
+文件格式：UTF-8编码，字符之间以NUL（\\x00）分隔，第一个元素为CTC blank（空字符串）。
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Iterable, Tuple
+
+from ..utils.exceptions import ModelLoadError
+
+# 字符集数据目录
+CHARSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'charsets')
+
+# 字符分隔符
+CHARSET_SEPARATOR = '\x00'
+
+# 内置字符集名称与文件名的对应关系（与模型文件名一致）
+BUILTIN_CHARSETS = {
+    'old': 'common_old.charset',
+    'beta': 'common.charset',
+}
+
+_lock = threading.Lock()
+# 内容哈希 -> 字符集
+_charsets_by_digest: Dict[str, Tuple[str, ...]] = {}
+# 文件路径 -> ((文件大小, 修改时间), 内容哈希)，文件未变化时无需重新读取
+_digest_by_path: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def encode_charset(charset: Iterable[str]) -> bytes:
+    """
+    将字符集编码为数据文件内容
+
+    Args:
+        charset: 字符集
+
+    Returns:
+        编码后的字节
+
+    Raises:
+        ModelLoadError: 当字符中包含分隔符时
+    """
+    charset = list(charset)
+    if any(CHARSET_SEPARATOR in char for char in charset):
+        raise ModelLoadError("字符集中的字符不能包含NUL分隔符")
+    return CHARSET_SEPARATOR.join(charset).encode('utf-8')
+
+
+def load_charset_file(path: str) -> Tuple[str, ...]:
+    """
+    读取字符集数据文件
+
+    相同内容的文件只解析一次；同一路径在文件大小和修改时间不变时不会重复读取。
+
+    Args:
+        path: 数据文件路径
+
+    Returns:
+        字符集元组（不可变，可在多个字符集管理器之间共享）
+
+    Raises:
+        ModelLoadError: 当文件不存在或读取失败时
+    """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise ModelLoadError(f"字符集数据文件不存在: {path}") from e
+
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _digest_by_path.get(path)
+        if cached is not None and cached[0] == signature:
+            return _charsets_by_digest[cached[1]]
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            raise ModelLoadError(f"字符集数据文件读取失败: {str(e)}") from e
+
+        digest = hashlib.sha256(data).hexdigest()
+        charset = _charsets_by_digest.get(digest)
+        if charset is None:
+            try:
+                charset = tuple(data.decode('utf-8').split(CHARSET_SEPARATOR))
+            except UnicodeDecodeError as e:
+                raise ModelLoadError(f"字符集数据文件解码失败: {path}") from e
+            _charsets_by_digest[digest] = charset
+
+        _digest_by_path[path] = (signature, digest)
+        return charset
+
+
+def load_builtin_charset(name: str) -> Tuple[str, ...]:
+    """
+    加载内置字符集
+
+    Args:
+        name: 内置字符集名称，'old' 或 'beta'
+
+    Returns:
+        字符集元组
+
+    Raises:
+        ModelLoadError: 当名称无效或数据文件缺失时
+    """
+    if name not in BUILTIN_CHARSETS:
+        raise ModelLoadError(f"未知的内置字符集: {name}，支持: {', '.join(BUILTIN_CHARSETS)}")
+    return load_charset_file(os.path.join(CHARSET_DIR, BUILTIN_CHARSETS[name]))
+
+
+def clear_charset_cache() -> None:
+    """清空字符集缓存"""
+    with _lock:
+        _charsets_by_digest.clear()
+        _digest_by_path.clear()
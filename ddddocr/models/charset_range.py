@@ -0,0 +1,110 @@
+# coding=utf-8
+"""
+字符集范围模块
+将字符集范围参数转换为不可变、可哈希的对象，作为范围掩码缓存的键，可在多个调用和线程之间共享
+"""
+
+import functools
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..utils.exceptions import DDDDOCRError
+from ..utils.validators import validate_charset_range
+
+# 字符集范围掩码：(布尔掩码, 包含CTC blank的候选索引数组)，不限制范围时均为None
+RangeMasks = Tuple[Optional[np.ndarray], Optional[np.ndarray]]
+
+
+@dataclass(frozen=True)
+class CharsetRange:
+    """
+    字符集范围
+
+    实例不可变且可哈希。chars和limit二选一：
+    chars为允许的字符集合；limit为整数范围，表示字符集的前 limit+1 个字符。
+
+    Attributes:
+        chars: 允许的字符集合
+        limit: 按索引限制的范围
+    """
+
+    chars: FrozenSet[str] = frozenset()
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        if self.limit is None:
+            if not self.chars:
+                raise DDDDOCRError("字符集范围不能为空")
+            if not isinstance(self.chars, frozenset):
+                object.__setattr__(self, 'chars', frozenset(self.chars))
+            if not all(isinstance(char, str) for char in self.chars):
+                raise DDDDOCRError("字符集范围中的元素必须为字符串")
+        else:
+            if self.chars:
+                raise DDDDOCRError("chars和limit不能同时指定")
+            if not isinstance(self.limit, int) or self.limit < 0:
+                raise DDDDOCRError("字符集范围索引必须为非负整数")
+
+    @classmethod
+    def from_value(cls, charset_range: 'CharsetRangeInput') -> 'CharsetRange':
+        """
+        从范围参数创建字符集范围，相同参数返回同一个缓存的实例
+
+        Args:
+            charset_range: 整数、字符串、字符列表或CharsetRange
+
+        Returns:
+            CharsetRange实例
+
+        Raises:
+            DDDDOCRError: 当参数无效时
+        """
+        if isinstance(charset_range, cls):
+            return charset_range
+        if isinstance(charset_range, (list, tuple)):
+            validate_charset_range(list(charset_range))
+            return _charset_range_from_chars(tuple(charset_range))
+        validate_charset_range(charset_range)
+        if isinstance(charset_range, int):
+            return _charset_range_from_limit(charset_range)
+        return _charset_range_from_chars(charset_range)
+
+    def resolve(self, charset: Sequence[str]) -> FrozenSet[str]:
+        """
+        计算在指定字符集下允许的字符
+
+        Args:
+            charset: 完整字符集
+
+        Returns:
+            允许的字符集合，始终包含空字符（CTC blank）
+        """
+        if self.limit is None:
+            return self.chars | {""}
+        if self.limit < len(charset):
+            return frozenset(charset[:self.limit + 1]) | {""}
+        # 超出字符集大小的整数范围只保留blank（与历史版本行为一致）
+        return frozenset({""})
+
+    def __repr__(self) -> str:
+        if self.limit is not None:
+            return f"CharsetRange(limit={self.limit})"
+        return f"CharsetRange(chars={''.join(sorted(self.chars))!r})"
+
+
+# 字符集范围参数
+CharsetRangeInput = Union[int, str, List[str], CharsetRange]
+
+
+@functools.lru_cache(maxsize=256)
+def _charset_range_from_chars(chars: Union[str, Tuple[str, ...]]) -> CharsetRange:
+    """按字符创建字符集范围（带缓存）"""
+    return CharsetRange(chars=frozenset(chars))
+
+
+@functools.lru_cache(maxsize=64)
+def _charset_range_from_limit(limit: int) -> CharsetRange:
+    """按索引创建字符集范围（带缓存）"""
+    return CharsetRange(limit=limit)
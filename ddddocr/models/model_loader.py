@@ -6,26 +6,267 @@
 
 import json
 import os
-from typing import List, Optional, Dict, Any
-
-import onnxruntime
+import threading
+from typing import List, Optional, Dict, Any, Tuple, Union
 
+from .quantization import get_quantized_path
+from .session_config import SessionConfig
 from ..utils.exceptions import ModelLoadError
+from ..utils.lazy_import import onnxruntime
+
+
+def _providers_key(providers: List[Union[str, Tuple[str, Dict[str, Any]]]]) -> tuple:
+    """
+    将执行提供者列表转换为可哈希的键
+
+    Args:
+        providers: 执行提供者列表
+
+    Returns:
+        可哈希的元组
+    """
+    key = []
+    for provider in providers:
+        if isinstance(provider, (tuple, list)):
+            name, options = provider
+            key.append((name, tuple(sorted((k, str(v)) for k, v in options.items()))))
+        else:
+            key.append(provider)
+    return tuple(key)
+
+
+class _RegistryEntry:
+    """注册表条目，保存共享的推理会话及其引用计数"""
+
+    __slots__ = ('session', 'ref_count')
+
+    def __init__(self, session: 'onnxruntime.InferenceSession'):
+        self.session = session
+        self.ref_count = 0
+
+
+class ModelRegistry:
+    """
+    进程级ONNX推理会话注册表
+
+    以 (模型路径, 执行提供者, 会话配置) 为键共享推理会话，
+    同一模型在进程内只会加载一次。引用计数归零后会话仍保留在缓存中，
+    直到被显式驱逐，因此重复创建引擎几乎没有开销。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[tuple, _RegistryEntry] = {}
+        self._session_keys: Dict[int, tuple] = {}
+        # 正在创建的会话的键 -> 创建锁，同一个键只创建一次，且创建时不持有全局锁
+        self._creating: Dict[tuple, threading.Lock] = {}
+
+    @staticmethod
+    def make_key(model_path: str, providers: List[Union[str, Tuple[str, Dict[str, Any]]]],
+                 session_config: Optional[SessionConfig] = None) -> tuple:
+        """
+        生成注册表键
+
+        Args:
+            model_path: 模型文件路径
+            providers: 执行提供者列表
+            session_config: 会话配置
+
+        Returns:
+            注册表键
+        """
+        return (os.path.abspath(model_path), _providers_key(providers), session_config or SessionConfig())
+
+    def acquire(self, model_path: str, providers: List[Union[str, Tuple[str, Dict[str, Any]]]],
+                session_config: Optional[SessionConfig] = None) -> 'onnxruntime.InferenceSession':
+        """
+        获取共享推理会话，不存在时创建，并增加引用计数
+
+        Args:
+            model_path: 模型文件路径
+            providers: 执行提供者列表
+            session_config: 会话配置
+
+        Returns:
+            ONNX推理会话对象
+        """
+        key = self.make_key(model_path, providers, session_config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.ref_count += 1
+                return entry.session
+            create_lock = self._creating.setdefault(key, threading.Lock())
+
+        # 会话创建（含图优化和写入优化模型缓存）只持有该键的锁，不阻塞其他线程获取已缓存的会话
+        with create_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # 等待期间已由其他线程创建
+                    entry.ref_count += 1
+                    return entry.session
+
+            try:
+                session = self._create_session(model_path, providers, key[2])
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        entry = _RegistryEntry(session)
+                        self._entries[key] = entry
+                        self._session_keys[id(session)] = key
+                    # 否则为上一次创建失败后，重试的线程已用新的创建锁并发创建成功，沿用已登记的会话
+                    entry.ref_count += 1
+                    session = entry.session
+            finally:
+                # 创建失败时同样移除，避免失败的键一直占用创建锁
+                with self._lock:
+                    self._creating.pop(key, None)
+            return session
+
+    @staticmethod
+    def _create_session(model_path: str, providers: List[Union[str, Tuple[str, Dict[str, Any]]]],
+                        session_config: SessionConfig) -> 'onnxruntime.InferenceSession':
+        """
+        按会话配置创建推理会话
+
+        Args:
+            model_path: 模型文件路径
+            providers: 执行提供者列表
+            session_config: 会话配置
+
+        Returns:
+            ONNX推理会话对象
+        """
+        load_path, options = session_config.build(model_path, providers)
+        try:
+            session = onnxruntime.InferenceSession(load_path, sess_options=options, providers=providers)
+        except Exception:
+            if load_path == model_path:
+                raise
+            # 缓存的优化模型不可用（如文件损坏），删除后从原始模型重新生成
+            try:
+                os.remove(load_path)
+            except OSError:
+                pass
+            load_path, options = session_config.build(model_path, providers)
+            session = onnxruntime.InferenceSession(load_path, sess_options=options, providers=providers)
+
+        session_config.commit_cache(options)
+        return session
+
+    def release(self, session: 'onnxruntime.InferenceSession') -> None:
+        """
+        释放共享推理会话，减少引用计数（会话仍保留在缓存中）
+
+        Args:
+            session: 通过acquire获取的推理会话
+        """
+        with self._lock:
+            key = self._session_keys.get(id(session))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None and entry.session is session and entry.ref_count > 0:
+                entry.ref_count -= 1
+
+    def preload(self, model_path: str, providers: List[Union[str, Tuple[str, Dict[str, Any]]]],
+                session_config: Optional[SessionConfig] = None) -> None:
+        """
+        预加载模型到注册表，不增加引用计数
+
+        Args:
+            model_path: 模型文件路径
+            providers: 执行提供者列表
+            session_config: 会话配置
+        """
+        session = self.acquire(model_path, providers, session_config)
+        self.release(session)
+
+    def evict(self, model_path: Optional[str] = None, force: bool = False) -> int:
+        """
+        驱逐缓存的推理会话
+
+        Args:
+            model_path: 仅驱逐该模型路径的会话，为空时驱逐全部
+            force: 是否驱逐仍被引用的会话（持有者可继续使用已获取的会话）
+
+        Returns:
+            被驱逐的会话数量
+        """
+        target = os.path.abspath(model_path) if model_path else None
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if (target is None or key[0] == target) and (force or entry.ref_count == 0)]
+            for key in keys:
+                entry = self._entries.pop(key)
+                self._session_keys.pop(id(entry.session), None)
+            return len(keys)
+
+    def clear(self) -> int:
+        """
+        清空注册表
+
+        Returns:
+            被驱逐的会话数量
+        """
+        return self.evict(force=True)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        获取注册表状态
+
+        Returns:
+            每个缓存会话的信息列表
+        """
+        with self._lock:
+            return [{
+                'model_path': key[0],
+                'providers': [p if isinstance(p, str) else p[0] for p in key[1]],
+                'ref_count': entry.ref_count
+            } for key, entry in self._entries.items()]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, model_path: str) -> bool:
+        target = os.path.abspath(model_path)
+        with self._lock:
+            return any(key[0] == target for key in self._entries)
+
+    def __repr__(self) -> str:
+        return f"ModelRegistry(sessions={len(self._entries)})"
+
+
+# 全局模型注册表
+_model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    获取进程级模型注册表
+
+    Returns:
+        全局ModelRegistry实例
+    """
+    return _model_registry
 
 
 class ModelLoader:
     """ONNX模型加载器"""
 
-    def __init__(self, use_gpu: bool = False, device_id: int = 0):
+    def __init__(self, use_gpu: bool = False, device_id: int = 0,
+                 session_config: Optional[SessionConfig] = None):
         """
         初始化模型加载器
         
         Args:
             use_gpu: 是否使用GPU
             device_id: GPU设备ID
+            session_config: onnxruntime会话配置，为None时使用默认配置
         """
         self.use_gpu = use_gpu
         self.device_id = device_id
+        self.session_config = session_config or SessionConfig()
+        self.registry = get_model_registry()
         self._setup_providers()
 
     def _setup_providers(self) -> None:
@@ -52,12 +293,13 @@ class ModelLoader:
             if self.use_gpu:
                 print(f"GPU设置失败，回退到CPU模式: {str(e)}")
 
-    def load_model(self, model_path: str) -> onnxruntime.InferenceSession:
+    def load_model(self, model_path: str, shared: bool = True) -> 'onnxruntime.InferenceSession':
         """
         加载ONNX模型
         
         Args:
             model_path: 模型文件路径
+            shared: 是否通过进程级注册表共享推理会话
             
         Returns:
             ONNX推理会话对象
@@ -72,15 +314,21 @@ class ModelLoader:
             # 设置ONNX运行时日志级别
             onnxruntime.set_default_logger_severity(3)
 
-            # 创建推理会话
-            session = onnxruntime.InferenceSession(model_path, providers=self.providers)
+            # 从注册表获取共享会话
+            if shared:
+                return self.registry.acquire(model_path, self.providers, self.session_config)
+
+            # 创建独立的推理会话
+            load_path, options = self.session_config.build(model_path, self.providers)
+            session = onnxruntime.InferenceSession(load_path, sess_options=options, providers=self.providers)
+            self.session_config.commit_cache(options)
 
             return session
 
         except Exception as e:
             raise ModelLoadError(f"模型加载失败: {str(e)}") from e
 
-    def get_model_info(self, session: onnxruntime.InferenceSession) -> Dict[str, Any]:
+    def get_model_info(self, session: 'onnxruntime.InferenceSession') -> Dict[str, Any]:
         """
         获取模型信息
         
@@ -116,8 +364,57 @@ class ModelLoader:
         except Exception as e:
             return {'error': str(e)}
 
+    @staticmethod
+    def get_ocr_model_path(old: bool = False, beta: bool = False, import_onnx_path: str = "",
+                           quantized: bool = False) -> str:
+        """
+        获取OCR模型文件路径
+
+        Args:
+            old: 是否使用旧版模型
+            beta: 是否使用beta版模型
+            import_onnx_path: 自定义模型路径
+            quantized: 是否使用INT8量化模型（不适用于自定义模型）
+
+        Returns:
+            模型文件路径
+        """
+        if import_onnx_path:
+            return import_onnx_path
+
+        base_dir = os.path.dirname(os.path.dirname(__file__))
+        if old:
+            model_path = os.path.join(base_dir, 'common_old.onnx')
+        elif beta:
+            model_path = os.path.join(base_dir, 'common.onnx')
+        else:
+            model_path = os.path.join(base_dir, 'common_old.onnx')
+
+        return get_quantized_path(model_path) if quantized else model_path
+
+    @staticmethod
+    def get_detection_model_path(quantized: bool = False) -> str:
+        """
+        获取目标检测模型文件路径
+
+        Args:
+            quantized: 是否使用INT8量化模型
+
+        Returns:
+            模型文件路径
+        """
+        base_dir = os.path.dirname(os.path.dirname(__file__))
+        model_path = os.path.join(base_dir, 'common_det.onnx')
+        return get_quantized_path(model_path) if quantized else model_path
+
+    @staticmethod
+    def _check_quantized_model(model_path: str) -> None:
+        """检查量化模型是否已生成"""
+        if not os.path.exists(model_path):
+            raise ModelLoadError(f"量化模型不存在: {model_path}，请先运行 python -m ddddocr quantize 生成")
+
     def load_ocr_model(self, old: bool = False, beta: bool = False,
-                       import_onnx_path: str = "") -> onnxruntime.InferenceSession:
+                       import_onnx_path: str = "", quantized: bool = False) -> 'onnxruntime.InferenceSession':
         """
         加载OCR模型
         
@@ -125,6 +422,7 @@ class ModelLoader:
             old: 是否使用旧版模型
             beta: 是否使用beta版模型
             import_onnx_path: 自定义模型路径
+            quantized: 是否使用INT8量化模型
             
         Returns:
             ONNX推理会话对象
@@ -133,25 +431,20 @@ class ModelLoader:
             ModelLoadError: 当模型加载失败时
         """
         try:
-            if import_onnx_path:
-                model_path = import_onnx_path
-            else:
-                base_dir = os.path.dirname(os.path.dirname(__file__))
-                if old:
-                    model_path = os.path.join(base_dir, 'common_old.onnx')
-                elif beta:
-                    model_path = os.path.join(base_dir, 'common.onnx')
-                else:
-                    model_path = os.path.join(base_dir, 'common_old.onnx')
-
+            model_path = self.get_ocr_model_path(old, beta, import_onnx_path, quantized)
+            if quantized and not import_onnx_path:
+                self._check_quantized_model(model_path)
             return self.load_model(model_path)
 
         except Exception as e:
             raise ModelLoadError(f"OCR模型加载失败: {str(e)}") from e
 
-    def load_detection_model(self) -> onnxruntime.InferenceSession:
+    def load_detection_model(self, quantized: bool = False) -> 'onnxruntime.InferenceSession':
         """
         加载目标检测模型
+
+        Args:
+            quantized: 是否使用INT8量化模型
         
         Returns:
             ONNX推理会话对象
@@ -160,13 +453,52 @@ class ModelLoader:
             ModelLoadError: 当模型加载失败时
         """
         try:
-            base_dir = os.path.dirname(os.path.dirname(__file__))
-            model_path = os.path.join(base_dir, 'common_det.onnx')
+            model_path = self.get_detection_model_path(quantized)
+            if quantized:
+                self._check_quantized_model(model_path)
             return self.load_model(model_path)
 
         except Exception as e:
             raise ModelLoadError(f"检测模型加载失败: {str(e)}") from e
 
+    def release_session(self, session: 'onnxruntime.InferenceSession') -> None:
+        """
+        释放通过注册表获取的推理会话
+
+        Args:
+            session: ONNX推理会话
+        """
+        self.registry.release(session)
+
+    def preload(self, ocr: bool = True, det: bool = False, old: bool = False, beta: bool = False,
+                quantized: bool = False) -> None:
+        """
+        预加载默认模型到进程级注册表
+
+        Args:
+            ocr: 是否预加载OCR模型
+            det: 是否预加载目标检测模型
+            old: 是否使用旧版OCR模型
+            beta: 是否使用beta版OCR模型
+            quantized: 是否使用INT8量化模型
+
+        Raises:
+            ModelLoadError: 当模型加载失败时
+        """
+        try:
+            if ocr:
+                model_path = self.get_ocr_model_path(old, beta, quantized=quantized)
+                if quantized:
+                    self._check_quantized_model(model_path)
+                self.registry.preload(model_path, self.providers, self.session_config)
+            if det:
+                model_path = self.get_detection_model_path(quantized)
+                if quantized:
+                    self._check_quantized_model(model_path)
+                self.registry.preload(model_path, self.providers, self.session_config)
+        except Exception as e:
+            raise ModelLoadError(f"模型预加载失败: {str(e)}") from e
+
     def load_custom_model(self, model_path: str, charset_path: str) -> tuple:
         """
         加载自定义模型和字符集
@@ -203,7 +535,7 @@ class ModelLoader:
         except Exception as e:
             raise ModelLoadError(f"自定义模型加载失败: {str(e)}") from e
 
-    def validate_model_compatibility(self, session: onnxruntime.InferenceSession,
+    def validate_model_compatibility(self, session: 'onnxruntime.InferenceSession',
                                      expected_input_shape: Optional[List[int]] = None) -> bool:
         """
         验证模型兼容性
@@ -257,4 +589,27 @@ class ModelLoader:
         self._setup_providers()
 
     def __repr__(self) -> str:
-        return f"ModelLoader(use_gpu={self.use_gpu}, device_id={self.device_id})"
+        return f"ModelLoader(use_gpu={self.use_gpu}, device_id={self.device_id}, session_config={self.session_config})"
+
+
+def preload(ocr: bool = True, det: bool = False, old: bool = False, beta: bool = False,
+            use_gpu: bool = False, device_id: int = 0, session_config: Optional[SessionConfig] = None,
+            quantized: bool = False) -> None:
+    """
+    预加载默认模型，使后续创建的引擎直接复用已加载的推理会话
+
+    Args:
+        ocr: 是否预加载OCR模型
+        det: 是否预加载目标检测模型
+        old: 是否使用旧版OCR模型
+        beta: 是否使用beta版OCR模型
+        use_gpu: 是否使用GPU
+        device_id: GPU设备ID
+        session_config: onnxruntime会话配置
+        quantized: 是否使用INT8量化模型
+
+    Raises:
+        ModelLoadError: 当模型加载失败时
+    """
+    ModelLoader(use_gpu, device_id, session_config).preload(ocr=ocr, det=det, old=old, beta=beta,
+                                                            quantized=quantized)
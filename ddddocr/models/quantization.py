@@ -0,0 +1,133 @@
+# coding=utf-8
+"""
+模型量化模块
+将内置的float32模型动态量化为INT8版本，降低CPU推理延迟和内存占用
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from ..utils.exceptions import ModelLoadError
+
+# 量化模型文件名后缀
+QUANTIZED_SUFFIX = '.int8.onnx'
+
+# 内置模型名称与文件名的对应关系
+BUILTIN_MODELS = {
+    'ocr_old': 'common_old.onnx',
+    'ocr_beta': 'common.onnx',
+    'det': 'common_det.onnx',
+}
+
+
+def get_quantized_path(model_path: str) -> str:
+    """
+    获取模型对应的量化模型路径
+
+    Args:
+        model_path: 原始模型路径
+
+    Returns:
+        量化模型路径，如 common_old.onnx -> common_old.int8.onnx
+    """
+    base, _ = os.path.splitext(model_path)
+    return base + QUANTIZED_SUFFIX
+
+
+def quantize_model(model_path: str, output_path: str = "", per_channel: bool = False,
+                   weight_type: str = 'qint8', op_types: Optional[List[str]] = None) -> str:
+    """
+    对ONNX模型进行动态量化
+
+    Args:
+        model_path: 原始float32模型路径
+        output_path: 输出路径，为空时写到原模型同目录下的 *.int8.onnx
+        per_channel: 是否按通道量化权重
+        weight_type: 权重量化类型，'qint8' 或 'quint8'
+        op_types: 需要量化的算子类型，为None时量化所有支持的算子
+
+    Returns:
+        量化模型路径
+
+    Raises:
+        ModelLoadError: 当量化失败时
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise ModelLoadError(f"模型量化需要安装onnx和onnxruntime: {str(e)}") from e
+
+    if not os.path.exists(model_path):
+        raise ModelLoadError(f"模型文件不存在: {model_path}")
+
+    weight_types = {'qint8': QuantType.QInt8, 'quint8': QuantType.QUInt8}
+    if weight_type not in weight_types:
+        raise ModelLoadError(f"不支持的权重量化类型: {weight_type}，支持: {', '.join(weight_types)}")
+
+    output_path = output_path or get_quantized_path(model_path)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = model_path
+
+            # 量化前先做形状推断和图优化预处理，失败时直接量化原始模型
+            try:
+                from onnxruntime.quantization.shape_inference import quant_pre_process
+                preprocessed_path = os.path.join(tmp_dir, 'preprocessed.onnx')
+                quant_pre_process(model_path, preprocessed_path, skip_symbolic_shape=True)
+                source_path = preprocessed_path
+            except Exception:
+                pass
+
+            tmp_output = os.path.join(tmp_dir, 'quantized.onnx')
+            quantize_dynamic(
+                source_path,
+                tmp_output,
+                per_channel=per_channel,
+                weight_type=weight_types[weight_type],
+                op_types_to_quantize=op_types
+            )
+            shutil.move(tmp_output, output_path)
+
+        return output_path
+
+    except Exception as e:
+        raise ModelLoadError(f"模型量化失败: {str(e)}") from e
+
+
+def build_quantized_models(models: Iterable[str] = ('ocr_old', 'ocr_beta', 'det'), force: bool = False,
+                           per_channel: bool = False, weight_type: str = 'qint8') -> Dict[str, str]:
+    """
+    为内置模型生成量化版本
+
+    Args:
+        models: 需要量化的内置模型名称，可选 'ocr_old'、'ocr_beta'、'det'
+        force: 量化模型已存在时是否重新生成
+        per_channel: 是否按通道量化权重
+        weight_type: 权重量化类型
+
+    Returns:
+        模型名称到量化模型路径的字典（跳过缺失的原始模型）
+
+    Raises:
+        ModelLoadError: 当模型名称无效或量化失败时
+    """
+    base_dir = os.path.dirname(os.path.dirname(__file__))
+    results = {}
+    for name in models:
+        if name not in BUILTIN_MODELS:
+            raise ModelLoadError(f"未知的内置模型: {name}，支持: {', '.join(BUILTIN_MODELS)}")
+
+        model_path = os.path.join(base_dir, BUILTIN_MODELS[name])
+        if not os.path.exists(model_path):
+            continue
+
+        output_path = get_quantized_path(model_path)
+        if force or not os.path.exists(output_path):
+            quantize_model(model_path, output_path, per_channel=per_channel, weight_type=weight_type)
+        results[name] = output_path
+
+    return results
+
@@ -0,0 +1,193 @@
+# coding=utf-8
+"""
+推理会话配置模块
+负责onnxruntime SessionOptions的构建以及优化后模型的磁盘缓存
+"""
+
+import hashlib
+import os
+import sys
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Tuple, Union
+
+from ..utils.exceptions import DDDDOCRError
+from ..utils.lazy_import import onnxruntime
+
+# 图优化级别映射（值为onnxruntime.GraphOptimizationLevel的成员名，构建会话选项时再取值）
+GRAPH_OPTIMIZATION_LEVELS = {
+    'disabled': 'ORT_DISABLE_ALL',
+    'basic': 'ORT_ENABLE_BASIC',
+    'extended': 'ORT_ENABLE_EXTENDED',
+    'all': 'ORT_ENABLE_ALL',
+}
+
+# 执行模式映射（值为onnxruntime.ExecutionMode的成员名）
+EXECUTION_MODES = {
+    'sequential': 'ORT_SEQUENTIAL',
+    'parallel': 'ORT_PARALLEL',
+}
+
+
+@dataclass(frozen=True)
+class SessionConfig:
+    """
+    onnxruntime推理会话配置
+
+    实例不可变且可哈希，可直接作为模型注册表键的一部分。
+
+    Attributes:
+        intra_op_num_threads: 算子内并行线程数，0表示由onnxruntime决定
+        inter_op_num_threads: 算子间并行线程数，0表示由onnxruntime决定
+        execution_mode: 执行模式，'sequential' 或 'parallel'
+        graph_optimization_level: 图优化级别，'disabled'、'basic'、'extended' 或 'all'
+        enable_cpu_mem_arena: 是否启用CPU内存池
+        enable_mem_pattern: 是否启用内存复用模式
+        optimized_model_cache_dir: 优化后模型的缓存目录，为空时不缓存
+    """
+
+    intra_op_num_threads: int = 0
+    inter_op_num_threads: int = 0
+    execution_mode: str = 'sequential'
+    graph_optimization_level: str = 'all'
+    enable_cpu_mem_arena: bool = True
+    enable_mem_pattern: bool = True
+    optimized_model_cache_dir: str = ""
+
+    def __post_init__(self):
+        if not isinstance(self.intra_op_num_threads, int) or self.intra_op_num_threads < 0:
+            raise DDDDOCRError("intra_op_num_threads必须为非负整数")
+        if not isinstance(self.inter_op_num_threads, int) or self.inter_op_num_threads < 0:
+            raise DDDDOCRError("inter_op_num_threads必须为非负整数")
+        if self.execution_mode not in EXECUTION_MODES:
+            raise DDDDOCRError(f"不支持的执行模式: {self.execution_mode}，"
+                               f"支持: {', '.join(EXECUTION_MODES)}")
+        if self.graph_optimization_level not in GRAPH_OPTIMIZATION_LEVELS:
+            raise DDDDOCRError(f"不支持的图优化级别: {self.graph_optimization_level}，"
+                               f"支持: {', '.join(GRAPH_OPTIMIZATION_LEVELS)}")
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'SessionConfig':
+        """
+        从字典创建配置，忽略值为None的字段
+
+        Args:
+            config: 配置字典
+
+        Returns:
+            SessionConfig实例
+        """
+        return cls(**{key: value for key, value in config.items() if value is not None})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典
+
+        Returns:
+            配置字典
+        """
+        return asdict(self)
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        """
+        获取默认的优化模型缓存目录
+
+        Windows下位于 %LOCALAPPDATA%\\ddddocr\\ort_cache，其他系统位于 ~/.cache/ddddocr/ort_cache
+
+        Returns:
+            缓存目录路径
+        """
+        if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+            base_dir = os.environ['LOCALAPPDATA']
+        else:
+            base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base_dir, 'ddddocr', 'ort_cache')
+
+    def get_cached_model_path(self, model_path: str,
+                              providers: List[Union[str, Tuple[str, Dict[str, Any]]]]) -> str:
+        """
+        计算优化后模型的缓存文件路径
+
+        缓存键包含模型文件大小与修改时间、onnxruntime版本、优化级别和执行提供者，
+        任一变化都会生成新的缓存文件。
+
+        Args:
+            model_path: 原始模型路径
+            providers: 执行提供者列表
+
+        Returns:
+            缓存文件路径，未启用缓存时返回空字符串
+        """
+        if not self.optimized_model_cache_dir:
+            return ""
+
+        stat = os.stat(model_path)
+        provider_names = [p if isinstance(p, str) else p[0] for p in providers]
+        digest = hashlib.sha1('|'.join([
+            os.path.abspath(model_path),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            onnxruntime.__version__,
+            self.graph_optimization_level,
+            ','.join(provider_names),
+        ]).encode('utf-8')).hexdigest()[:16]
+
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(self.optimized_model_cache_dir, f"{name}.{digest}.onnx")
+
+    def build(self, model_path: str,
+              providers: List[Union[str, Tuple[str, Dict[str, Any]]]]
+              ) -> Tuple[str, 'onnxruntime.SessionOptions']:
+        """
+        构建会话选项，并确定实际加载的模型路径
+
+        启用缓存时：缓存文件已存在则直接加载缓存并跳过图优化；
+        否则加载原始模型，并让onnxruntime把优化后的图写入缓存文件。
+
+        Args:
+            model_path: 原始模型路径
+            providers: 执行提供者列表
+
+        Returns:
+            (实际加载的模型路径, 会话选项)
+        """
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_num_threads
+        options.inter_op_num_threads = self.inter_op_num_threads
+        options.execution_mode = getattr(onnxruntime.ExecutionMode, EXECUTION_MODES[self.execution_mode])
+        options.graph_optimization_level = getattr(onnxruntime.GraphOptimizationLevel,
+                                                   GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level])
+        options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        options.enable_mem_pattern = self.enable_mem_pattern
+
+        cached_path = self.get_cached_model_path(model_path, providers)
+        if not cached_path:
+            return model_path, options
+
+        if os.path.exists(cached_path):
+            # 缓存中的模型已经过优化，无需再次优化
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+            return cached_path, options
+
+        # 先写入进程独占的临时文件，会话创建成功后再原子替换，避免多进程同时写入得到残缺文件
+        os.makedirs(self.optimized_model_cache_dir, exist_ok=True)
+        options.optimized_model_filepath = f"{cached_path}.{os.getpid()}.tmp"
+        return model_path, options
+
+    @staticmethod
+    def commit_cache(options: 'onnxruntime.SessionOptions') -> None:
+        """
+        会话创建成功后，将临时写入的优化模型移动到最终的缓存路径
+
+        Args:
+            options: build返回的会话选项
+        """
+        tmp_path = options.optimized_model_filepath
+        if not tmp_path or not tmp_path.endswith('.tmp'):
+            return
+        try:
+            if os.path.exists(tmp_path):
+                os.replace(tmp_path, tmp_path.rsplit('.', 2)[0])
+        except OSError:
+            # 缓存写入失败不影响推理，下次启动时重新生成
+            pass
@@ -6,8 +6,10 @@
 
 from .color_filter import ColorFilter
 from .image_processor import ImageProcessor
+from .ocr_preprocessor import OCRPreprocessor
 
 __all__ = [
     'ColorFilter',
-    'ImageProcessor'
+    'ImageProcessor',
+    'OCRPreprocessor'
 ]
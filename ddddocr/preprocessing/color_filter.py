@@ -9,13 +9,11 @@ from typing import List, Tuple, Optional, Union
 import numpy as np
 from PIL import Image
 
-from ..utils.exceptions import safe_import_opencv, ImageProcessError
+from ..utils.exceptions import ImageProcessError
 from ..utils.image_io import image_to_numpy, numpy_to_image
+from ..utils.lazy_import import cv2
 from ..utils.validators import validate_color_filter_params
 
-# 安全导入OpenCV
-cv2 = safe_import_opencv()
-
 
 class ColorFilter:
     """图片颜色过滤器类，支持HSV颜色空间的颜色范围过滤"""
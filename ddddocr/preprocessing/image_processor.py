@@ -9,11 +9,9 @@ from typing import Tuple, Union
 import numpy as np
 from PIL import Image
 
-from ..utils.exceptions import safe_import_opencv, ImageProcessError
+from ..utils.exceptions import ImageProcessError
 from ..utils.image_io import image_to_numpy, numpy_to_image, png_rgba_black_preprocess
-
-# 安全导入OpenCV
-cv2 = safe_import_opencv()
+from ..utils.lazy_import import cv2
 
 
 class ImageProcessor:
@@ -221,7 +219,7 @@ class ImageProcessor:
             else:
                 gray_image = image
 
-            img_array = image_to_numpy(gray_image)
+            img_array = image_to_numpy(gray_image, 'L')
 
             if method == 'simple':
                 _, binary = cv2.threshold(img_array, threshold, 255, cv2.THRESH_BINARY)
@@ -0,0 +1,311 @@
+# coding=utf-8
+"""
+OCR输入预处理模块
+将输入图像转换为模型所需的 (1, C, H, W) float32 数组
+
+提供两种模式：
+    - 'exact'：与历史版本完全一致的PIL流水线（彩色图LANCZOS缩放后转灰度）
+    - 'fast'：融合流水线，解码时直接得到灰度图，使用OpenCV缩放，
+      并将归一化结果写入预分配的缓冲区，避免中间PIL图像和临时数组
+"""
+
+import base64
+import io
+import os
+import pathlib
+import threading
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from .image_processor import ImageProcessor
+from ..utils.exceptions import ImageProcessError
+from ..utils.image_io import ImageInput, as_pixel_array, as_uint8_array, png_rgba_black_preprocess
+from ..utils.lazy_import import cv2
+
+
+# 预处理模式
+PREPROCESS_MODES = ('exact', 'fast')
+
+# 插值方式名称与OpenCV标志名的对应关系（使用时再从cv2取值，避免导入本模块时加载OpenCV）
+INTERPOLATIONS = {
+    'nearest': 'INTER_NEAREST',
+    'linear': 'INTER_LINEAR',
+    'cubic': 'INTER_CUBIC',
+    'area': 'INTER_AREA',
+    'lanczos': 'INTER_LANCZOS4',
+}
+
+# 缓冲区按该元素数向上取整扩容，减少宽度变化时的重复分配
+_BUFFER_GRANULARITY = 64 * 256
+
+
+class OCRPreprocessor:
+    """
+    OCR输入预处理器
+
+    每个线程持有独立的输出缓冲区，predict返回的数组在同一线程下一次调用前有效；
+    需要长期保留结果时（如批量识别）应传入 reuse_buffer=False。
+    """
+
+    def __init__(self, target_height: int = 64, resize: Optional[List[int]] = None,
+                 word: bool = False, channel: int = 1,
+                 mode: str = 'exact', interpolation: str = 'auto'):
+        """
+        初始化预处理器
+
+        Args:
+            target_height: 默认模型的输入高度（resize为None时使用）
+            resize: 自定义模型的输入尺寸 [宽, 高]，宽为-1表示按比例缩放
+            word: 自定义模型是否为单字模型（输入为正方形）
+            channel: 模型输入通道数
+            mode: 预处理模式，'exact' 或 'fast'
+            interpolation: fast模式的插值方式，'auto'（放大用lanczos、缩小用area）、
+                'nearest'、'linear'、'cubic'、'area' 或 'lanczos'
+
+        Raises:
+            ImageProcessError: 当参数无效时
+        """
+        if mode not in PREPROCESS_MODES:
+            raise ImageProcessError(f"不支持的预处理模式: {mode}，支持: {', '.join(PREPROCESS_MODES)}")
+        if interpolation != 'auto' and interpolation not in INTERPOLATIONS:
+            raise ImageProcessError(f"不支持的插值方式: {interpolation}，"
+                                    f"支持: auto, {', '.join(INTERPOLATIONS)}")
+
+        self.target_height = target_height
+        self.resize = resize
+        self.word = word
+        self.channel = channel
+        self.mode = mode
+        self.interpolation = interpolation
+        self._local = threading.local()
+
+    @property
+    def fused(self) -> bool:
+        """当前配置是否走融合流水线（仅支持单通道模型）"""
+        return self.mode == 'fast' and self.channel == 1
+
+    def get_target_size(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        计算模型输入尺寸
+
+        Args:
+            width: 原图宽度
+            height: 原图高度
+
+        Returns:
+            (目标宽度, 目标高度)
+        """
+        if self.resize is None:
+            return int(width * (self.target_height / height)), self.target_height
+
+        if self.resize[0] == -1:
+            if self.word:
+                return self.resize[1], self.resize[1]
+            return int(width * (self.resize[1] / height)), self.resize[1]
+
+        return self.resize[0], self.resize[1]
+
+    def __call__(self, image: ImageInput,
+                 png_fix: bool = False, reuse_buffer: bool = True) -> np.ndarray:
+        """
+        预处理图像
+
+        exact模式下image应为PIL图像；fast模式下还可以直接传入原始输入（字节、路径、base64、数组），
+        省去先解码为彩色PIL图像的开销。
+
+        Args:
+            image: 输入图像
+            png_fix: 是否修复PNG透明背景
+            reuse_buffer: 是否将结果写入线程内复用的缓冲区
+
+        Returns:
+            形状为 (1, C, H, W) 的float32数组
+
+        Raises:
+            ImageProcessError: 当预处理失败时
+        """
+        try:
+            if self.fused:
+                gray = self.decode_grayscale(image, png_fix)
+                target_width, target_height = self.get_target_size(gray.shape[1], gray.shape[0])
+                resized = self.resize_array(gray, (target_width, target_height))
+                return self._normalize(resized[None, None], reuse_buffer)
+
+            if not isinstance(image, Image.Image):
+                raise ImageProcessError("exact模式需要传入PIL图像")
+            return self._preprocess_exact(image, png_fix, reuse_buffer)
+
+        except ImageProcessError:
+            raise
+        except Exception as e:
+            raise ImageProcessError(f"图像预处理失败: {str(e)}") from e
+
+    def _preprocess_exact(self, image: Image.Image, png_fix: bool, reuse_buffer: bool) -> np.ndarray:
+        """与历史版本一致的PIL预处理流水线"""
+        # 处理PNG透明背景
+        if png_fix and image.mode == 'RGBA':
+            image = png_rgba_black_preprocess(image)
+
+        image = ImageProcessor.resize_image(image, self.get_target_size(*image.size))
+
+        # 默认模型总是转为灰度，自定义模型按通道数转换
+        if self.resize is None or self.channel == 1:
+            image = ImageProcessor.convert_to_grayscale(image)
+
+        img_array = np.asarray(image)
+        if img_array.ndim == 2:
+            img_array = img_array[None, None]
+        else:
+            img_array = img_array.transpose(2, 0, 1)[None]  # HWC -> CHW
+
+        return self._normalize(img_array, reuse_buffer)
+
+    def _normalize(self, img_array: np.ndarray, reuse_buffer: bool) -> np.ndarray:
+        """将uint8数组归一化到[0,1]，写入连续的float32数组"""
+        if not reuse_buffer:
+            out = np.empty(img_array.shape, dtype=np.float32)
+        else:
+            out = self._get_buffer(img_array.shape)
+        # 与 astype(np.float32) / 255.0 的结果逐位一致
+        np.divide(img_array, np.float32(255.0), out=out, dtype=np.float32)
+        return out
+
+    def _get_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """获取当前线程的输出缓冲区视图，容量不足时扩容"""
+        size = int(np.prod(shape))
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.size < size:
+            capacity = -(-size // _BUFFER_GRANULARITY) * _BUFFER_GRANULARITY
+            buffer = np.empty(capacity, dtype=np.float32)
+            self._local.buffer = buffer
+        # 取前size个元素再reshape，保证结果是C连续的，可直接交给onnxruntime
+        return buffer[:size].reshape(shape)
+
+    def resize_array(self, array: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
+        """
+        使用OpenCV缩放数组
+
+        Args:
+            array: 输入数组
+            target_size: 目标尺寸 (width, height)
+
+        Returns:
+            缩放后的数组
+        """
+        if (array.shape[1], array.shape[0]) == tuple(target_size):
+            return array
+
+        interpolation = self.interpolation
+        if interpolation == 'auto':
+            # OpenCV的lanczos缩小时不做抗锯齿，缩小时改用area
+            interpolation = 'area' if target_size[1] < array.shape[0] else 'lanczos'
+        return cv2.resize(array, tuple(target_size), interpolation=getattr(cv2, INTERPOLATIONS[interpolation]))
+
+    @staticmethod
+    def decode_grayscale(image: ImageInput,
+                         png_fix: bool = False) -> np.ndarray:
+        """
+        将输入直接解码为uint8灰度数组
+
+        字节输入由OpenCV直接解码为灰度（JPEG可在解码阶段完成灰度转换）；
+        numpy数组和多维memoryview按RGB(A)像素数据处理，已是uint8灰度图时不复制。
+
+        Args:
+            image: 输入图像
+            png_fix: 是否将透明背景合成为白色
+
+        Returns:
+            形状为 (H, W) 的uint8数组
+
+        Raises:
+            ImageProcessError: 当解码失败时
+        """
+        array = as_pixel_array(image)
+        if array is not None:
+            return OCRPreprocessor._array_to_grayscale(array, png_fix, 'RGB')
+
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return OCRPreprocessor._decode_bytes_grayscale(image, png_fix)
+
+        if isinstance(image, (str, pathlib.PurePath)):
+            if os.path.exists(image):
+                with open(image, 'rb') as fp:
+                    return OCRPreprocessor._decode_bytes_grayscale(fp.read(), png_fix)
+            try:
+                data = base64.b64decode(image)
+            except Exception as e:
+                raise ImageProcessError(f"base64图片解码失败: {str(e)}") from e
+            return OCRPreprocessor._decode_bytes_grayscale(data, png_fix)
+
+        if isinstance(image, Image.Image):
+            if png_fix and image.mode == 'RGBA':
+                image = png_rgba_black_preprocess(image)
+            if image.mode != 'L':
+                image = image.convert('L')
+            return np.asarray(image)
+
+        raise ImageProcessError(f"不支持的图片输入类型: {type(image)}")
+
+    @staticmethod
+    def _decode_bytes_grayscale(data: Union[bytes, bytearray, memoryview], png_fix: bool) -> np.ndarray:
+        """使用OpenCV从字节解码灰度图，OpenCV不支持的格式回退到PIL"""
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        # 忽略EXIF方向信息，与PIL的行为保持一致
+        flags = cv2.IMREAD_IGNORE_ORIENTATION
+        decoded = cv2.imdecode(buffer, flags | (cv2.IMREAD_UNCHANGED if png_fix else cv2.IMREAD_GRAYSCALE))
+        if decoded is None:
+            # 如GIF等格式OpenCV无法解码
+            try:
+                pil_image = Image.open(io.BytesIO(bytes(data)))
+            except Exception as e:
+                raise ImageProcessError(f"图片解码失败: {str(e)}") from e
+            return OCRPreprocessor.decode_grayscale(pil_image, png_fix)
+
+        return OCRPreprocessor._array_to_grayscale(decoded, png_fix, 'BGR')
+
+    @staticmethod
+    def _array_to_grayscale(array: np.ndarray, png_fix: bool, order: str) -> np.ndarray:
+        """
+        将数组转换为uint8灰度图
+
+        Args:
+            array: 输入数组，(H, W)、(H, W, 3) 或 (H, W, 4)
+            png_fix: 是否将透明背景合成为白色
+            order: 彩色通道顺序，'RGB' 或 'BGR'
+
+        Returns:
+            形状为 (H, W) 的uint8数组
+        """
+        if array.dtype == np.uint16:
+            # 16位PNG在IMREAD_UNCHANGED下保留原始位深
+            array = (array >> 8).astype(np.uint8)
+        else:
+            array = as_uint8_array(array)
+
+        if array.ndim == 2:
+            return array
+        if array.ndim != 3 or array.shape[2] not in (1, 3, 4):
+            raise ImageProcessError(f"不支持的数组形状: {array.shape}")
+
+        channels = array.shape[2]
+        if channels == 1:
+            return array[:, :, 0]
+
+        if channels == 3:
+            code = cv2.COLOR_RGB2GRAY if order == 'RGB' else cv2.COLOR_BGR2GRAY
+            return cv2.cvtColor(array, code)
+
+        code = cv2.COLOR_RGBA2GRAY if order == 'RGB' else cv2.COLOR_BGRA2GRAY
+        gray = cv2.cvtColor(array, code)
+        if not png_fix:
+            return gray
+
+        # 按alpha将灰度值合成到白色背景上：gray * a + 255 * (1 - a)
+        alpha = array[:, :, 3].astype(np.float32) * np.float32(1 / 255.0)
+        blended = gray.astype(np.float32)
+        blended -= 255.0
+        blended *= alpha
+        blended += 255.5
+        return blended.astype(np.uint8)
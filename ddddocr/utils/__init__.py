@@ -4,9 +4,22 @@
 提供图像处理、异常处理、输入验证等工具函数
 """
 
+import importlib
+
 from .exceptions import DDDDOCRError, ModelLoadError, ImageProcessError
-from .image_io import base64_to_image, get_img_base64, png_rgba_black_preprocess
-from .validators import validate_image_input, validate_model_config
+
+# 图像相关工具依赖numpy和PIL，按需导入（PEP 562）
+_LAZY_ATTRIBUTES = {
+    'base64_to_image': '.image_io',
+    'get_img_base64': '.image_io',
+    'png_rgba_black_preprocess': '.image_io',
+    'validate_image_input': '.validators',
+    'validate_model_config': '.validators',
+    'StageCollector': '.instrumentation',
+    'StageRecord': '.instrumentation',
+    'collect_stages': '.instrumentation',
+    'ResultCache': '.result_cache',
+}
 
 __all__ = [
     'base64_to_image',
@@ -16,5 +29,23 @@ __all__ = [
     'ModelLoadError',
     'ImageProcessError',
     'validate_image_input',
-    'validate_model_config'
+    'validate_model_config',
+    'StageCollector',
+    'StageRecord',
+    'collect_stages',
+    'ResultCache'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -8,13 +8,21 @@ import base64
 import io
 import os
 import pathlib
-from typing import Union
+from typing import Any, Optional, Union
 
 import numpy as np
 from PIL import Image
 
 from .exceptions import ImageProcessError
 
+# 兼容性处理：新版Pillow移除了ANTIALIAS，旧代码仍可能使用
+if not hasattr(Image, 'ANTIALIAS'):
+    setattr(Image, 'ANTIALIAS', Image.LANCZOS)
+
+# 支持的图片输入类型：编码后的字节、base64字符串、文件路径、PIL图像，
+# 或已解码的像素数据（numpy数组、多维memoryview）
+ImageInput = Union[bytes, str, pathlib.PurePath, Image.Image, np.ndarray, memoryview]
+
 
 def base64_to_image(img_base64: str) -> Image.Image:
     """
@@ -80,12 +88,15 @@ def png_rgba_black_preprocess(img: Image.Image) -> Image.Image:
         raise ImageProcessError(f"PNG透明背景处理失败: {str(e)}") from e
 
 
-def load_image_from_input(img_input: Union[bytes, str, pathlib.PurePath, Image.Image, np.ndarray]) -> Image.Image:
+def load_image_from_input(img_input: ImageInput) -> Image.Image:
     """
     从多种输入格式加载图片
 
+    PIL Image输入直接返回原对象（各处理步骤均不会原地修改图片），不再额外复制。
+
     Args:
-        img_input: 图片输入，支持bytes、base64字符串、文件路径、PIL Image对象或numpy数组
+        img_input: 图片输入，支持bytes、base64字符串、文件路径、PIL Image对象、numpy数组或memoryview
+            （一维memoryview视为编码后的图片数据，多维memoryview视为像素数组）
 
     Returns:
         PIL Image对象
@@ -94,10 +105,14 @@ def load_image_from_input(img_input: Union[bytes, str, pathlib.PurePath, Image.I
         ImageProcessError: 当图片加载失败时
     """
     try:
-        if isinstance(img_input, bytes):
+        if isinstance(img_input, memoryview):
+            if img_input.ndim >= 2:
+                return _numpy_to_pil_image(np.asarray(img_input))
+            return Image.open(io.BytesIO(img_input))
+        elif isinstance(img_input, bytes):
             return Image.open(io.BytesIO(img_input))
         elif isinstance(img_input, Image.Image):
-            return img_input.copy()
+            return img_input
         elif isinstance(img_input, np.ndarray):
             return _numpy_to_pil_image(img_input)
         elif isinstance(img_input, str):
@@ -109,7 +124,7 @@ def load_image_from_input(img_input: Union[bytes, str, pathlib.PurePath, Image.I
         elif isinstance(img_input, pathlib.PurePath):
             return Image.open(img_input)
         else:
-            supported_types = (bytes, str, pathlib.PurePath, Image.Image, np.ndarray)
+            supported_types = (bytes, str, pathlib.PurePath, Image.Image, np.ndarray, memoryview)
             raise ImageProcessError(
                 f"不支持的图片输入类型: {type(img_input)}。"
                 f"支持的类型: {supported_types}"
@@ -120,6 +135,100 @@ def load_image_from_input(img_input: Union[bytes, str, pathlib.PurePath, Image.I
         raise ImageProcessError(f"图片加载失败: {str(e)}") from e
 
 
+def as_pixel_array(img_input: Any) -> Optional[np.ndarray]:
+    """
+    若输入已是解码后的像素数据，返回对应的numpy数组（不复制），否则返回None
+
+    Args:
+        img_input: 图片输入
+
+    Returns:
+        numpy数组或None
+    """
+    if isinstance(img_input, np.ndarray):
+        return img_input
+    if isinstance(img_input, memoryview) and img_input.ndim >= 2:
+        return np.asarray(img_input)
+    return None
+
+
+def as_uint8_array(array: np.ndarray) -> np.ndarray:
+    """
+    将像素数组整理为C连续的uint8数组，已满足要求时直接返回原数组
+
+    浮点数组若最大值不超过1.0则视为[0,1]范围并放大到[0,255]。
+
+    Args:
+        array: 像素数组
+
+    Returns:
+        uint8数组
+    """
+    if array.dtype != np.uint8:
+        if array.dtype in [np.float32, np.float64] and array.max() <= 1.0:
+            array = (array * 255).astype(np.uint8)
+        else:
+            array = array.astype(np.uint8)
+    return np.ascontiguousarray(array)
+
+
+def load_array_from_input(img_input: ImageInput,
+                          mode: Optional[str] = 'RGB') -> np.ndarray:
+    """
+    从多种输入格式加载为uint8像素数组
+
+    numpy数组和多维memoryview输入不经过PIL，仅在数据类型、内存布局或通道数需要转换时才复制；
+    数组输入的彩色通道按RGB（RGBA）顺序解释。
+
+    Args:
+        img_input: 图片输入
+        mode: 目标模式，'RGB'（H, W, 3）、'L'（H, W）或None（保持原通道数）
+
+    Returns:
+        uint8像素数组
+
+    Raises:
+        ImageProcessError: 当加载或转换失败时
+    """
+    array = as_pixel_array(img_input)
+    if array is None:
+        pil_image = load_image_from_input(img_input)
+        return image_to_numpy(pil_image, mode) if mode else np.asarray(pil_image)
+
+    try:
+        array = as_uint8_array(array)
+        if array.ndim == 3 and array.shape[2] == 1:
+            array = array[:, :, 0]
+        if array.ndim not in (2, 3) or (array.ndim == 3 and array.shape[2] not in (3, 4)):
+            raise ImageProcessError(f"不支持的数组形状: {array.shape}，支持 (H, W)、(H, W, 1/3/4)")
+
+        if mode is None:
+            return array
+
+        if mode == 'RGB':
+            if array.ndim == 2:
+                return np.repeat(array[:, :, None], 3, axis=2)
+            if array.shape[2] == 4:
+                # 与PIL的RGBA->RGB转换一致：直接丢弃alpha通道
+                return np.ascontiguousarray(array[:, :, :3])
+            return array
+
+        if mode == 'L':
+            if array.ndim == 2:
+                return array
+            # 与PIL的ITU-R 601-2亮度转换公式保持一致
+            rgb = array[:, :, :3].astype(np.uint32)
+            gray = rgb[:, :, 0] * 19595 + rgb[:, :, 1] * 38470 + rgb[:, :, 2] * 7471 + 0x8000
+            return (gray >> 16).astype(np.uint8)
+
+        raise ImageProcessError(f"不支持的目标模式: {mode}，支持: RGB, L")
+
+    except ImageProcessError:
+        raise
+    except Exception as e:
+        raise ImageProcessError(f"numpy数组转换失败: {str(e)}") from e
+
+
 def _numpy_to_pil_image(array: np.ndarray) -> Image.Image:
     """
     将numpy数组转换为PIL Image对象
@@ -135,15 +244,7 @@ def _numpy_to_pil_image(array: np.ndarray) -> Image.Image:
     """
     try:
         # 确保数组是正确的数据类型
-        if array.dtype != np.uint8:
-            # 如果是浮点数，假设范围是0-1，转换为0-255
-            if array.dtype in [np.float32, np.float64]:
-                if array.max() <= 1.0:
-                    array = (array * 255).astype(np.uint8)
-                else:
-                    array = array.astype(np.uint8)
-            else:
-                array = array.astype(np.uint8)
+        array = as_uint8_array(array)
 
         # 处理不同的数组形状
         if len(array.shape) == 2:
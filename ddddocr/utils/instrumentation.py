@@ -0,0 +1,228 @@
+# coding=utf-8
+"""
+分阶段计时模块
+记录引擎内部各阶段（解码、预处理、推理、后处理等）的耗时和输入尺寸
+
+两种使用方式：
+    - 上下文收集器：with collect_stages() as stages: ...，只收集当前上下文（线程、asyncio任务）中的调用
+    - 监听器：engine.add_stage_listener(callback)，该引擎每完成一个阶段都会调用callback
+
+未启用任何收集器和监听器时，每个阶段只多一次上下文变量读取，几乎没有额外开销。
+"""
+
+import contextvars
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    """
+    单个阶段的计时记录
+
+    Attributes:
+        engine: 引擎类名，如 'OCREngine'
+        stage: 阶段名称，如 'decode'、'preprocess'、'inference'、'postprocess'
+        duration_ms: 耗时（毫秒）
+        size: 阶段产出数据的尺寸（如数组形状或字节数），未知时为None
+    """
+
+    engine: str
+    stage: str
+    duration_ms: float
+    size: Optional[Tuple[int, ...]] = None
+
+
+# 阶段监听器
+StageListener = Callable[[StageRecord], None]
+
+
+class StageCollector:
+    """
+    阶段计时收集器
+
+    可在多个线程中同时写入（例如 *_async 方法在线程池中执行时）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[StageRecord] = []
+
+    def add(self, record: StageRecord) -> None:
+        """
+        添加一条记录
+
+        Args:
+            record: 阶段计时记录
+        """
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        """清空记录"""
+        with self._lock:
+            self.records = []
+
+    def totals(self) -> Dict[str, float]:
+        """
+        按 "引擎.阶段" 汇总耗时
+
+        Returns:
+            {'OCREngine.inference': 1.23, ...}，单位为毫秒，按首次出现的顺序排列
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = f"{record.engine}.{record.stage}"
+            totals[key] = totals.get(key, 0.0) + record.duration_ms
+        return totals
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        按 "引擎.阶段" 统计调用次数、总耗时和平均耗时
+
+        Returns:
+            {'OCREngine.inference': {'count': 2, 'total_ms': 2.4, 'mean_ms': 1.2}, ...}
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            item = summary.setdefault(f"{record.engine}.{record.stage}", {'count': 0, 'total_ms': 0.0})
+            item['count'] += 1
+            item['total_ms'] += record.duration_ms
+        for item in summary.values():
+            item['mean_ms'] = item['total_ms'] / item['count']
+        return summary
+
+    def format(self) -> str:
+        """
+        格式化为单行文本，便于写入日志
+
+        Returns:
+            如 "OCREngine.decode=0.12ms OCREngine.inference=1.80ms"
+        """
+        return ' '.join(f"{key}={value:.2f}ms" for key, value in self.totals().items())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"StageCollector(records={len(self.records)})"
+
+
+_current_collector: contextvars.ContextVar = contextvars.ContextVar('ddddocr_stage_collector', default=None)
+
+
+class collect_stages:
+    """
+    在当前上下文中收集阶段计时
+
+    使用示例：
+        with collect_stages() as stages:
+            ocr.classification(image)
+        print(stages.format())
+    """
+
+    def __init__(self, collector: Optional[StageCollector] = None):
+        """
+        Args:
+            collector: 使用已有的收集器，为None时新建
+        """
+        self.collector = collector or StageCollector()
+        self._token = None
+
+    def __enter__(self) -> StageCollector:
+        self._token = _current_collector.set(self.collector)
+        return self.collector
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_collector.reset(self._token)
+
+
+def get_current_collector() -> Optional[StageCollector]:
+    """
+    获取当前上下文的收集器
+
+    Returns:
+        收集器，未启用时返回None
+    """
+    return _current_collector.get()
+
+
+class _NullStage:
+    """未启用计时时使用的空阶段"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullStage':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def set_size(self, size: Any) -> None:
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+class _TimedStage:
+    """计时中的阶段"""
+
+    __slots__ = ('engine', 'stage', 'collector', 'listeners', 'size', 'start')
+
+    def __init__(self, engine: str, stage: str, collector: Optional[StageCollector],
+                 listeners: Tuple[StageListener, ...]):
+        self.engine = engine
+        self.stage = stage
+        self.collector = collector
+        self.listeners = listeners
+        self.size = None
+
+    def __enter__(self) -> '_TimedStage':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        record = StageRecord(self.engine, self.stage, (time.perf_counter() - self.start) * 1000, self.size)
+        if self.collector is not None:
+            self.collector.add(record)
+        for listener in self.listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"阶段计时监听器异常: {str(e)}")
+
+    def set_size(self, size: Any) -> None:
+        """
+        记录阶段产出数据的尺寸
+
+        Args:
+            size: 数组形状、字节数或其他尺寸信息
+        """
+        if isinstance(size, int):
+            size = (size,)
+        self.size = tuple(size) if size is not None else None
+
+
+def stage_timer(engine: str, stage: str, listeners: Tuple[StageListener, ...] = ()):
+    """
+    创建阶段计时上下文
+
+    Args:
+        engine: 引擎名称
+        stage: 阶段名称
+        listeners: 引擎注册的监听器
+
+    Returns:
+        上下文管理器，支持 set_size；未启用计时时返回共享的空阶段
+    """
+    collector = _current_collector.get()
+    if collector is None and not listeners:
+        return NULL_STAGE
+    return _TimedStage(engine, stage, collector, listeners)
@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+延迟导入模块
+OpenCV和onnxruntime导入耗时较长，仅在首次访问其属性时才真正导入，
+使 import ddddocr 以及只使用部分功能（如滑块匹配）的场景不必承担全部导入开销
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Optional
+
+
+class LazyModule:
+    """
+    模块代理对象，首次访问属性时导入真实模块
+
+    访问过的属性会缓存到代理对象上，之后的访问与直接访问模块属性的开销相同。
+    """
+
+    def __init__(self, name: str, loader: Optional[Callable[[], Any]] = None):
+        """
+        初始化模块代理
+
+        Args:
+            name: 模块名称
+            loader: 自定义导入函数，为None时使用importlib.import_module
+        """
+        self._lazy_name = name
+        self._lazy_loader = loader
+        self._lazy_module = None
+        self._lazy_lock = threading.Lock()
+
+    def _load(self) -> Any:
+        """导入并返回真实模块"""
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    loader = self._lazy_loader or (lambda: importlib.import_module(self._lazy_name))
+                    self._lazy_module = loader()
+                module = self._lazy_module
+        return module
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith('_lazy_'):
+            raise AttributeError(item)
+        value = getattr(self._load(), item)
+        setattr(self, item, value)
+        return value
+
+    def is_loaded(self) -> bool:
+        """
+        真实模块是否已导入
+
+        Returns:
+            是否已导入
+        """
+        return self._lazy_module is not None
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded() else 'not loaded'
+        return f"<LazyModule '{self._lazy_name}' ({state})>"
+
+
+def _load_opencv() -> Any:
+    """导入OpenCV，失败时给出详细的安装提示"""
+    from .exceptions import safe_import_opencv
+    return safe_import_opencv()
+
+
+def _load_onnxruntime() -> Any:
+    """导入onnxruntime并降低其日志级别"""
+    import onnxruntime
+    onnxruntime.set_default_logger_severity(3)
+    return onnxruntime
+
+
+# 共享的模块代理
+cv2 = LazyModule('cv2', _load_opencv)
+onnxruntime = LazyModule('onnxruntime', _load_onnxruntime)
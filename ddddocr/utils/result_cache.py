@@ -0,0 +1,201 @@
+# coding=utf-8
+"""
+识别结果缓存模块
+以图片原始字节的哈希和全部识别参数作为键，缓存引擎的识别结果
+
+同一验证码被重复截图（输入错误后重试、页面重新渲染等）时，图片内容完全相同，
+命中缓存即可跳过解码和推理。缓存默认关闭，通过引擎的 enable_cache 或 DdddOcr 的 cache_size 参数开启。
+"""
+
+import hashlib
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .exceptions import DDDDOCRError
+from .image_io import ImageInput
+
+
+class ResultCache:
+    """
+    LRU + TTL 识别结果缓存
+
+    线程安全，可在多个引擎之间共享（键中包含模型标识）。
+    缓存的结果在写入和读取时都会复制，调用方修改返回的字典或列表不会影响缓存内容。
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最多缓存的结果数，超出时淘汰最久未使用的结果
+            ttl: 结果的有效期（秒），为None时不过期
+
+        Raises:
+            DDDDOCRError: 当参数无效时
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise DDDDOCRError("缓存大小必须为正整数")
+        if ttl is not None and ttl <= 0:
+            raise DDDDOCRError("缓存有效期必须大于0")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 键 -> (过期时间, 结果)
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存结果的副本，未命中或已过期时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_result(result)
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            result: 识别结果
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        result = _copy_result(result)
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存（统计计数保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            命中、未命中、淘汰、过期次数，当前大小和命中率
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ResultCache(size={len(self._entries)}, max_size={self.max_size}, ttl={self.ttl})"
+
+
+def _copy_result(result: Any) -> Any:
+    """复制识别结果中的字典和列表（结果均由字典、列表和标量组成，比deepcopy快）"""
+    if isinstance(result, dict):
+        return {key: _copy_result(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [_copy_result(value) for value in result]
+    return result
+
+
+def freeze_param(value: Any) -> Hashable:
+    """
+    将参数中的列表递归转换为元组，用作缓存键的一部分
+
+    Args:
+        value: 参数值
+
+    Returns:
+        可哈希的参数值
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_param(item) for item in value)
+    return value
+
+
+def image_digest(image: ImageInput) -> Tuple[Hashable, ImageInput]:
+    """
+    计算图片输入内容的哈希
+
+    编码后的图片按原始字节计算（不解码）；文件路径读取一次文件内容，并返回字节供后续识别使用，避免重复读取；
+    PIL图像按像素数据、尺寸、模式、调色板和透明色计算，numpy数组按像素数据、形状和数据类型计算。
+
+    Args:
+        image: 图片输入
+
+    Returns:
+        (内容哈希, 后续识别使用的图片输入)
+
+    Raises:
+        DDDDOCRError: 当输入类型不支持或文件读取失败时
+    """
+    try:
+        if isinstance(image, (bytes, bytearray)):
+            return ('bytes', hashlib.blake2b(image, digest_size=16).digest()), image
+        if isinstance(image, memoryview):
+            if image.ndim >= 2:
+                return image_digest(np.asarray(image))[0], image
+            return ('bytes', hashlib.blake2b(image, digest_size=16).digest()), image
+        if isinstance(image, np.ndarray):
+            array = np.ascontiguousarray(image)
+            digest = hashlib.blake2b(array.view(np.uint8).reshape(-1), digest_size=16).digest()
+            return ('array', array.shape, array.dtype.str, digest), image
+        if isinstance(image, Image.Image):
+            hasher = hashlib.blake2b(image.tobytes(), digest_size=16)
+            # P/PA模式的像素数据只是调色板索引，调色板和透明色不同时转换后的图像也不同
+            palette = image.getpalette() if image.mode in ('P', 'PA') else None
+            if palette is not None:
+                hasher.update(bytes(palette))
+            return ('pil', image.mode, image.size, hasher.digest(), image.info.get('transparency')), image
+        if isinstance(image, pathlib.PurePath) or (isinstance(image, str) and os.path.exists(image)):
+            with open(image, 'rb') as fp:
+                data = fp.read()
+            return ('bytes', hashlib.blake2b(data, digest_size=16).digest()), data
+        if isinstance(image, str):
+            # base64字符串直接对字符串计算哈希，不解码
+            return ('base64', hashlib.blake2b(image.encode(), digest_size=16).digest()), image
+    except Exception as e:
+        raise DDDDOCRError(f"计算图片哈希失败: {str(e)}") from e
+
+    raise DDDDOCRError(f"不支持的图片输入类型: {type(image)}")
@@ -26,7 +26,7 @@ def validate_image_input(img_input: Any) -> bool:
     Raises:
         DDDDOCRError: 当输入类型不支持时
     """
-    valid_types = (bytes, str, pathlib.PurePath, Image.Image, np.ndarray)
+    valid_types = (bytes, str, pathlib.PurePath, Image.Image, np.ndarray, memoryview)
     if not isinstance(img_input, valid_types):
         raise DDDDOCRError(f"不支持的图片输入类型: {type(img_input)}。支持的类型: {valid_types}")
     return True
@@ -26,6 +26,8 @@ a = Analysis(
         ('ddddocr/common.onnx', 'ddddocr/'),
         ('ddddocr/common_det.onnx', 'ddddocr/'),
         ('ddddocr/common_old.onnx', 'ddddocr/'),
+        # ddddocr内置字符集数据文件
+        ('ddddocr/models/charsets/*.charset', 'ddddocr/models/charsets/'),
         ('ddddocr/logo.png', 'ddddocr/'),
         ('ddddocr/README.md', 'ddddocr/'),
         ('ddddocr/requirements.txt', 'ddddocr/'),
@@ -1,29 +1,10 @@
 import re
 import time
-from io import BytesIO
-
-from PIL import Image
 
 import ddddocr
 
-
-def preprocess_captcha_image(image):
-    """
-    预处理验证码图片以提高OCR识别率
-    """
-    # 转换为灰度图
-    gray = image.convert('L')
-
-    # 增强对比度
-    from PIL import ImageEnhance
-    enhancer = ImageEnhance.Contrast(gray)
-    enhanced = enhancer.enhance(2.0)
-
-    # 二值化处理
-    threshold = 128
-    binary = enhanced.point(lambda x: 0 if x < threshold else 255, '1')
-
-    return binary
+# 优化后的模型图缓存到本地目录，打包后的程序每次冷启动时无需重新做图优化
+OCR_SESSION_CONFIG = ddddocr.SessionConfig(optimized_model_cache_dir=ddddocr.SessionConfig.default_cache_dir())
 
 
 def recognize_captcha(tab, captcha_img_selector='#img'):
@@ -42,30 +23,14 @@ def recognize_captcha(tab, captcha_img_selector='#img'):
 
         if img_data:
             # 创建ddddocr识别器
-            ocr = ddddocr.DdddOcr(show_ad=False)  # show_ad=False关闭广告
-
-            # 直接使用原始图片进行识别
-            captcha_text = ocr.classification(img_data)
-
-            # 如果直接识别效果不好，可以尝试预处理后再识别
-            if not captcha_text or len(captcha_text) < 3:
-                print("直接识别效果不佳，尝试预处理图片...")
-                # 将截图数据转换为PIL Image对象
-                image = Image.open(BytesIO(img_data))
-
-                # 预处理图片
-                processed_image = preprocess_captcha_image(image)
-
-                # 保存处理后的图片用于调试
-                processed_image.save('captcha_debug.png')
-
-                # 将处理后的图片转换为字节数据
-                img_buffer = BytesIO()
-                processed_image.save(img_buffer, format='PNG')
-                processed_img_data = img_buffer.getvalue()
+            ocr = ddddocr.DdddOcr(show_ad=False, session_config=OCR_SESSION_CONFIG)  # show_ad=False关闭广告
 
-                # 使用处理后的图片进行识别
-                captcha_text = ocr.classification(processed_img_data)
+            # 先用默认模型识别，置信度不足或长度不够时在同一次调用中尝试二值化图像和另一套模型，
+            # 取置信度最高的结果，避免刷新验证码重试
+            result = ocr.classification_cascade(img_data, min_length=3)
+            captcha_text = result['text']
+            if result['variant'] != 'default':
+                print(f"直接识别效果不佳，采用 {result['variant']} 的识别结果")
 
             # 清理识别结果，只保留数字和字母
             captcha_text = re.sub(r'[^0-9A-Za-z]', '', captcha_text)
@@ -97,7 +62,7 @@ def recognize_captcha_simple(tab, captcha_img_selector='#img'):
 
         if img_data:
             # 创建ddddocr识别器
-            ocr = ddddocr.DdddOcr(show_ad=False)
+            ocr = ddddocr.DdddOcr(show_ad=False, session_config=OCR_SESSION_CONFIG)
 
             # 直接识别
             captcha_text = ocr.classification(img_data)